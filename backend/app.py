@@ -1,15 +1,37 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
-import joblib
 import numpy as np
 import pandas as pd
-import random
 from datetime import datetime
 import os
+import json
+import threading
 import uvicorn
 
+from form import DEFAULT_FORM, FormState
+from feature_schema import FeatureSchemaError
+from inference_executor import ExecutorSaturated, executor_from_env
+from batching import batcher_from_env
+from model_registry import ModelRegistry
+from prediction_cache import PredictionCache, canonicalize_request, canonical_request_key, seed_from_key, normalize_name
+from prediction_logger import logger_from_env
+from season_simulator import iter_season_projection
+from simulator import (
+    model_position_distribution, simulate_race, SAFETY_CAR_MEAN_LAPS, PIT_TIME_RANGE
+)
+from inference import build_feature_matrix, scale_feature_matrix
+from rng import make_rng, choice, randint
+from reference_data import (
+    TEMPERATURE_RANGES, DRIVER_PROFILES, DEFAULT_DRIVER_PROFILE, TEAM_STRATEGIES, DEFAULT_TEAM_STRATEGY,
+    CIRCUIT_STRATEGY_FACTORS, DEFAULT_CIRCUIT_STRATEGY_FACTORS, WET_STRATEGIES, MIXED_STRATEGIES,
+    HIGH_DEG_STRATEGIES, NORMAL_STRATEGIES, FERRARI_MASTER_PLAN, WET_SPECIALISTS,
+    DRIVER_PERFORMANCE, DEFAULT_DRIVER_PERFORMANCE, CONSTRUCTOR_PERFORMANCE, DEFAULT_CONSTRUCTOR_PERFORMANCE,
+    BASE_WIN_PROBABILITY, DEFAULT_BASE_WIN_PROBABILITY, CIRCUIT_FEATURES, DEFAULT_CIRCUIT_FEATURES, POINTS_SYSTEM
+)
+
 app = FastAPI(
     title="F1 Race Predictor API",
     description="Enhanced F1 race prediction system with ML models",
@@ -37,6 +59,7 @@ class PredictionRequest(BaseModel):
     circuit: str
     weather: str
     entries: List[RaceEntry]
+    seed: Optional[int] = None
 
 class FantasyTeam(BaseModel):
     drivers: List[str]
@@ -70,22 +93,153 @@ class PredictionResult(BaseModel):
     predictions: List[PredictionResponse]
     race_info: RaceInfo
 
-# Load enhanced models
+class RaceResultEntry(BaseModel):
+    driver: str
+    constructor: str
+    position: int = Field(..., ge=1)
+
+class FormUpdateRequest(BaseModel):
+    season: int
+    round: int
+    race_name: str
+    results: List[RaceResultEntry]
+
+class ModelReloadRequest(BaseModel):
+    version: Optional[str] = None
+
+class SimulationRequest(PredictionRequest):
+    n_simulations: int = Field(10000, ge=1, le=1000000)
+
+class DriverSimulation(BaseModel):
+    driver: str
+    constructor: str
+    grid: int
+    expected_position: float
+    expected_points: float
+    win_probability: float
+    podium_probability: float
+    points_probability: float
+    position_histogram: List[int]
+
+class SimulationResult(BaseModel):
+    success: bool
+    n_simulations: int
+    seed: int
+    predictions: List[DriverSimulation]
+    race_info: RaceInfo
+
+class SeasonProjectionRequest(BaseModel):
+    entries: Optional[List[RaceEntry]] = None
+    driver_points: Dict[str, float] = {}
+    from_round: Optional[int] = None
+    weather: str = "Dry"
+    n_seasons: int = Field(100000, ge=1, le=1000000)
+    workers: Optional[int] = Field(None, ge=1)
+    seed: Optional[int] = None
+
+class DriverProjection(BaseModel):
+    driver: str
+    constructor: str
+    current_points: float
+    expected_points: float
+    title_probability: float
+    championship_position_histogram: List[int]
+
+class ConstructorProjection(BaseModel):
+    team: str
+    current_points: float
+    expected_points: float
+    title_probability: float
+
+class SeasonProjectionResult(BaseModel):
+    success: bool
+    n_seasons: int
+    seed: int
+    remaining_rounds: List[str]
+    drivers: List[DriverProjection]
+    constructors: List[ConstructorProjection]
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Serving models, encoders, scaler, feature schema and feature store; swapped as one object by /api/models/reload
+# MODEL_MMAP=none unpickles the forests into process memory instead of memory-mapping their arrays
+MODEL_MMAP = os.environ.get("MODEL_MMAP", "r")
+model_registry = ModelRegistry(
+    mmap_mode=None if MODEL_MMAP == "none" else MODEL_MMAP,
+    on_swap=lambda previous, current: models_swapped()
+)
+
+# Load the enhanced model bundle; forests stay on disk until first use or background warm-up
 try:
-    models = {
-        'position': joblib.load("models/position_enhanced_model.pkl"),
-        'podium': joblib.load("models/podium_enhanced_model.pkl"),
-        'winner': joblib.load("models/winner_enhanced_model.pkl") if os.path.exists("models/winner_enhanced_model.pkl") else None,
-        'points': joblib.load("models/points_enhanced_model.pkl")
-    }
-    label_encoders = joblib.load("models/enhanced_label_encoders.pkl")
-    scaler = joblib.load("models/feature_scaler.pkl")
-    feature_names = joblib.load("models/feature_names.pkl")
-    print("✅ Enhanced models loaded successfully")
+    # The feature schema lays out serving matrices exactly as in training; refuse to serve on any mismatch
+    startup_models = model_registry.open()
+    print(f"✅ Enhanced model bundle {startup_models.version} opened ({len(startup_models.schema)} features, schema {startup_models.schema.fingerprint})")
+    # Data-derived driver/constructor/circuit features materialized with the bundle (memory-mapped)
+    if startup_models.feature_store is not None:
+        print(f"✅ Feature store loaded: {startup_models.feature_store.stats()}")
 except FileNotFoundError as e:
     print(f"⚠️ Enhanced models not found: {e}")
     print("Please run train_enhanced_model.py first")
-    models = None
+except FeatureSchemaError as e:
+    print(f"❌ Models don't match the feature schema: {e}")
+    print("Please retrain with train_enhanced_model.py")
+
+FORM_STATE_FILE = os.path.join(BASE_DIR, "models", "form_state.json")
+
+# Race-day unknowns enter single predictions at their expected value (the simulator samples them)
+AVERAGE_PIT_TIME = sum(PIT_TIME_RANGE) / 2
+
+# Driver/constructor form as of the last race, written by training and updated through /api/form/update
+form_state = FormState.load(FORM_STATE_FILE) if os.path.exists(FORM_STATE_FILE) else None
+form_state_mtime = os.stat(FORM_STATE_FILE).st_mtime_ns if form_state else None
+
+# Set by serve.py in preforked workers: after an endpoint changes form or the serving models,
+# this asks the parent to make every worker pick the change up (see sync_shared_state)
+sync_workers = None
+
+def reload_form_state():
+    """Re-read form_state.json if another process rewrote it; returns True when the form changed"""
+    global form_state, form_state_mtime
+    if not os.path.exists(FORM_STATE_FILE):
+        return False
+    mtime = os.stat(FORM_STATE_FILE).st_mtime_ns
+    if mtime == form_state_mtime:
+        return False
+    form_state, form_state_mtime = FormState.load(FORM_STATE_FILE), mtime
+    # Cached predictions were made with the previous form
+    prediction_cache.invalidate()
+    return True
+
+def models_swapped():
+    """A reload or rollback swapped the serving models: pick up the form their training run wrote"""
+    reload_form_state()
+    # Cached predictions were made with the previous models
+    prediction_cache.invalidate()
+
+def sync_shared_state():
+    """Catch up with form and model changes made by other workers
+
+    Re-reads form_state.json and swaps in the CURRENT bundle, whose feature
+    store comes with it, so no worker keeps the parent's startup features.
+    """
+    reload_form_state()
+    model_registry.reload()
+
+def notify_workers():
+    if sync_workers is not None:
+        sync_workers()
+
+# Bounded pool for model inference so CPU-bound requests never block the event loop
+inference_executor = executor_from_env()
+
+# Coalesces the position predicts of concurrent /api/predict requests into one call
+prediction_batcher = batcher_from_env(inference_executor)
+
+# Memoized responses keyed on the canonical request and model version
+prediction_cache = PredictionCache(
+    max_size=int(os.environ.get("PREDICTION_CACHE_SIZE", 256)),
+    ttl=float(os.environ.get("PREDICTION_CACHE_TTL", 300))
+)
 
 # Updated F1 2025 data with correct driver lineups
 current_teams = {
@@ -228,133 +382,55 @@ circuits_2025 = [
     {"name": "Yas Marina Circuit", "country": "UAE", "round": 24, "date": "2025-12-07"}
 ]
 
-def get_weather_features(circuit_name, weather):
+constructor_standings_2025 = [
+    {'position': 1, 'team': 'McLaren', 'points': 666, 'wins': 6},
+    {'position': 2, 'team': 'Ferrari', 'points': 652, 'wins': 5},
+    {'position': 3, 'team': 'Red Bull Racing', 'points': 589, 'wins': 9},
+    {'position': 4, 'team': 'Mercedes', 'points': 382, 'wins': 3},
+    {'position': 5, 'team': 'Aston Martin', 'points': 94, 'wins': 0},
+    {'position': 6, 'team': 'Alpine', 'points': 65, 'wins': 0},
+    {'position': 7, 'team': 'Haas', 'points': 58, 'wins': 0},
+    {'position': 8, 'team': 'RB', 'points': 46, 'wins': 0},
+    {'position': 9, 'team': 'Williams', 'points': 17, 'wins': 0},
+    {'position': 10, 'team': 'Kick Sauber', 'points': 0, 'wins': 0}
+]
+
+def get_weather_features(circuit_name, weather, rng=None):
     """Generate realistic weather-related features based on circuit location and season"""
-    temp_map = {
-        'Bahrain International Circuit': random.randint(25, 35),
-        'Jeddah Corniche Circuit': random.randint(28, 38),
-        'Albert Park Circuit': random.randint(18, 28),
-        'Suzuka Circuit': random.randint(15, 25),
-        'Shanghai International Circuit': random.randint(12, 22),
-        'Miami International Autodrome': random.randint(26, 35),
-        'Imola': random.randint(16, 26),
-        'Monaco Circuit': random.randint(18, 28),
-        'Circuit de Barcelona-Catalunya': random.randint(16, 26),
-        'Circuit Gilles Villeneuve': random.randint(12, 22),
-        'Red Bull Ring': random.randint(14, 24),
-        'Silverstone Circuit': random.randint(12, 22),
-        'Hungaroring': random.randint(18, 30),
-        'Circuit de Spa-Francorchamps': random.randint(10, 20),
-        'Circuit Zandvoort': random.randint(12, 22),
-        'Monza Circuit': random.randint(16, 26),
-        'Marina Bay Street Circuit': random.randint(26, 32),
-        'Baku City Circuit': random.randint(20, 30),
-        'Circuit of the Americas': random.randint(18, 28),
-        'Autódromo Hermanos Rodríguez': random.randint(16, 24),
-        'Interlagos': random.randint(18, 28),
-        'Las Vegas Strip Circuit': random.randint(10, 25),
-        'Losail International Circuit': random.randint(22, 32),
-        'Yas Marina Circuit': random.randint(24, 32)
-    }
+    rng = make_rng(rng)
     
-    temperature = temp_map.get(circuit_name, 20)
+    temp_range = TEMPERATURE_RANGES.get(circuit_name)
+    temperature = randint(rng, *temp_range) if temp_range else 20
     
     if weather == "Wet":
-        humidity = random.uniform(80, 95)
-        wind_speed = random.uniform(10, 20)
+        humidity = float(rng.uniform(80, 95))
+        wind_speed = float(rng.uniform(10, 20))
     elif weather == "Mixed":
-        humidity = random.uniform(60, 85)
-        wind_speed = random.uniform(5, 15)
+        humidity = float(rng.uniform(60, 85))
+        wind_speed = float(rng.uniform(5, 15))
     else:
-        humidity = random.uniform(30, 70)
-        wind_speed = random.uniform(0, 10)
+        humidity = float(rng.uniform(30, 70))
+        wind_speed = float(rng.uniform(0, 10))
     
-    track_temp = temperature + random.uniform(5, 25)
+    track_temp = temperature + float(rng.uniform(5, 25))
     
     return temperature, humidity, wind_speed, track_temp
 
-def get_personalized_tire_strategy(driver, constructor, grid_position, weather, circuit_name):
+def get_personalized_tire_strategy(driver, constructor, grid_position, weather, circuit_name, rng=None):
     """
     Generate personalized tire strategy based on driver personality, 
     team strategy, grid position, weather, and circuit characteristics
     """
-    
-    # Driver personality profiles based on real F1 characteristics
-    driver_profiles = {
-        # Aggressive risk-takers
-        'Max Verstappen': {'aggression': 0.9, 'risk_tolerance': 0.85, 'adaptability': 0.9},
-        'Charles Leclerc': {'aggression': 0.85, 'risk_tolerance': 0.8, 'adaptability': 0.8},
-        'Lando Norris': {'aggression': 0.75, 'risk_tolerance': 0.7, 'adaptability': 0.85},
-        'Pierre Gasly': {'aggression': 0.8, 'risk_tolerance': 0.75, 'adaptability': 0.8},
-        
-        # Strategic and calculated
-        'Lewis Hamilton': {'aggression': 0.7, 'risk_tolerance': 0.6, 'adaptability': 0.95},
-        'Fernando Alonso': {'aggression': 0.75, 'risk_tolerance': 0.8, 'adaptability': 0.95},
-        'George Russell': {'aggression': 0.6, 'risk_tolerance': 0.5, 'adaptability': 0.8},
-        'Oscar Piastri': {'aggression': 0.65, 'risk_tolerance': 0.6, 'adaptability': 0.8},
-        
-        # Conservative but opportunistic
-        'Carlos Sainz': {'aggression': 0.7, 'risk_tolerance': 0.65, 'adaptability': 0.75},
-        'Alex Albon': {'aggression': 0.6, 'risk_tolerance': 0.55, 'adaptability': 0.7},
-        'Nico Hülkenberg': {'aggression': 0.65, 'risk_tolerance': 0.6, 'adaptability': 0.8},
-        'Esteban Ocon': {'aggression': 0.6, 'risk_tolerance': 0.55, 'adaptability': 0.7},
-        
-        # Inexperienced but eager
-        'Kimi Antonelli': {'aggression': 0.8, 'risk_tolerance': 0.9, 'adaptability': 0.6},
-        'Oliver Bearman': {'aggression': 0.75, 'risk_tolerance': 0.8, 'adaptability': 0.65},
-        'Franco Colapinto': {'aggression': 0.7, 'risk_tolerance': 0.75, 'adaptability': 0.6},
-        'Gabriel Bortoleto': {'aggression': 0.7, 'risk_tolerance': 0.8, 'adaptability': 0.6},
-        'Isack Hadjar': {'aggression': 0.75, 'risk_tolerance': 0.8, 'adaptability': 0.6},
-        'Liam Lawson': {'aggression': 0.8, 'risk_tolerance': 0.75, 'adaptability': 0.65},
-        
-        # Steady and consistent
-        'Lance Stroll': {'aggression': 0.5, 'risk_tolerance': 0.4, 'adaptability': 0.6},
-        'Yuki Tsunoda': {'aggression': 0.7, 'risk_tolerance': 0.7, 'adaptability': 0.65},
-    }
-    
-    # Team strategy philosophies based on real F1 team approaches
-    team_strategies = {
-        'Red Bull Racing': {'aggression': 0.85, 'risk_tolerance': 0.8, 'innovation': 0.9},
-        'Ferrari': {'aggression': 0.8, 'risk_tolerance': 0.75, 'innovation': 0.7}, 
-        'McLaren': {'aggression': 0.7, 'risk_tolerance': 0.65, 'innovation': 0.85},
-        'Mercedes': {'aggression': 0.6, 'risk_tolerance': 0.5, 'innovation': 0.8},  
-        'Aston Martin': {'aggression': 0.7, 'risk_tolerance': 0.6, 'innovation': 0.8},
-        'Alpine': {'aggression': 0.75, 'risk_tolerance': 0.7, 'innovation': 0.7},
-        'Williams': {'aggression': 0.6, 'risk_tolerance': 0.8, 'innovation': 0.6},  
-        'Haas': {'aggression': 0.65, 'risk_tolerance': 0.75, 'innovation': 0.5},
-        'RB': {'aggression': 0.75, 'risk_tolerance': 0.7, 'innovation': 0.75},  
-        'Kick Sauber': {'aggression': 0.7, 'risk_tolerance': 0.8, 'innovation': 0.6},
-    }
-    
-    # Circuit characteristics affecting strategy
-    circuit_strategy_factors = {
-        # Overtaking difficulty affects strategy aggression
-        'Monaco Circuit': {'overtaking_difficulty': 0.95, 'tire_wear': 0.3, 'strategy_importance': 0.9},
-        'Hungaroring': {'overtaking_difficulty': 0.85, 'tire_wear': 0.4, 'strategy_importance': 0.85},
-        'Marina Bay Street Circuit': {'overtaking_difficulty': 0.8, 'tire_wear': 0.5, 'strategy_importance': 0.8},
-        
-        # High tire wear circuits
-        'Circuit de Spa-Francorchamps': {'overtaking_difficulty': 0.3, 'tire_wear': 0.8, 'strategy_importance': 0.7},
-        'Silverstone Circuit': {'overtaking_difficulty': 0.4, 'tire_wear': 0.75, 'strategy_importance': 0.7},
-        'Circuit de Barcelona-Catalunya': {'overtaking_difficulty': 0.7, 'tire_wear': 0.6, 'strategy_importance': 0.8},
-        
-        # Power circuits with DRS effectiveness
-        'Monza Circuit': {'overtaking_difficulty': 0.2, 'tire_wear': 0.4, 'strategy_importance': 0.5},
-        'Baku City Circuit': {'overtaking_difficulty': 0.3, 'tire_wear': 0.5, 'strategy_importance': 0.6},
-        
-        # Balanced circuits
-        'Circuit Gilles Villeneuve': {'overtaking_difficulty': 0.5, 'tire_wear': 0.6, 'strategy_importance': 0.6},
-        'Circuit of the Americas': {'overtaking_difficulty': 0.4, 'tire_wear': 0.7, 'strategy_importance': 0.65},
-    }
+    rng = make_rng(rng)
     
     # Get driver and team characteristics
-    driver_profile = driver_profiles.get(driver, {'aggression': 0.6, 'risk_tolerance': 0.6, 'adaptability': 0.6})
-    team_strategy = team_strategies.get(constructor, {'aggression': 0.6, 'risk_tolerance': 0.6, 'innovation': 0.6})
-    circuit_factors = circuit_strategy_factors.get(circuit_name, {'overtaking_difficulty': 0.5, 'tire_wear': 0.6, 'strategy_importance': 0.6})
+    driver_profile = DRIVER_PROFILES.get(driver, DEFAULT_DRIVER_PROFILE)
+    team_strategy = TEAM_STRATEGIES.get(constructor, DEFAULT_TEAM_STRATEGY)
+    circuit_factors = CIRCUIT_STRATEGY_FACTORS.get(circuit_name, DEFAULT_CIRCUIT_STRATEGY_FACTORS)
     
     # Calculate combined strategy factors
-    combined_aggression = (driver_profile['aggression'] + team_strategy['aggression']) / 2
-    combined_risk = (driver_profile['risk_tolerance'] + team_strategy['risk_tolerance']) / 2
+    combined_aggression = (driver_profile.aggression + team_strategy.aggression) / 2
+    combined_risk = (driver_profile.risk_tolerance + team_strategy.risk_tolerance) / 2
     
     # Grid position influence on strategy
     if grid_position <= 3:
@@ -375,110 +451,38 @@ def get_personalized_tire_strategy(driver, constructor, grid_position, weather,
         alternative_strategy_chance = 0.5
     
     # Adjust for circuit characteristics
-    if circuit_factors['overtaking_difficulty'] > 0.8:
+    if circuit_factors.overtaking_difficulty > 0.8:
         # Hard to overtake - more aggressive strategy needed
         strategy_aggression *= 1.2
         alternative_strategy_chance += 0.15
     
     # Weather-based strategy selection
     if weather == "Wet":
-        wet_strategies = {
-            'conservative': [
-                "Full Wet → Intermediate → Medium",
-                "Intermediate → Medium",
-                "Full Wet → Intermediate"
-            ],
-            'aggressive': [
-                "Intermediate → Soft (risky dry gamble)",
-                "Full Wet → Medium (early switch)",
-                "Intermediate → Full Wet → Soft"
-            ],
-            'alternative': [
-                "Start on Intermediates (if others on Full Wet)",
-                "Full Wet → Hard (long stint strategy)",
-                "Intermediate → Hard → Soft"
-            ]
-        }
-        
         # Hamilton and Alonso are wet weather masters - more aggressive in wet
-        if driver in ['Lewis Hamilton', 'Fernando Alonso', 'Max Verstappen']:
+        if driver in WET_SPECIALISTS:
             strategy_aggression *= 1.2
         
-        if random.random() < alternative_strategy_chance:
-            return random.choice(wet_strategies['alternative'])
+        if rng.random() < alternative_strategy_chance:
+            return choice(rng, WET_STRATEGIES.alternative)
         elif strategy_aggression > 0.7:
-            return random.choice(wet_strategies['aggressive'])
+            return choice(rng, WET_STRATEGIES.aggressive)
         else:
-            return random.choice(wet_strategies['conservative'])
+            return choice(rng, WET_STRATEGIES.conservative)
     
     elif weather == "Mixed":
-        mixed_strategies = {
-            'conservative': [
-                "Intermediate → Medium → Hard",
-                "Intermediate → Hard",
-                "Medium → Hard (if track dries quickly)"
-            ],
-            'aggressive': [
-                "Intermediate → Soft → Medium",
-                "Soft → Intermediate → Soft (double switch)",
-                "Medium → Soft (aggressive dry switch)"
-            ],
-            'alternative': [
-                "Hard → Intermediate (reverse strategy)",
-                "Intermediate → Soft → Hard",
-                "Start on Mediums (dry gamble)"
-            ]
-        }
-        
-        if random.random() < alternative_strategy_chance:
-            return random.choice(mixed_strategies['alternative'])
+        if rng.random() < alternative_strategy_chance:
+            return choice(rng, MIXED_STRATEGIES.alternative)
         elif strategy_aggression > 0.7:
-            return random.choice(mixed_strategies['aggressive'])
+            return choice(rng, MIXED_STRATEGIES.aggressive)
         else:
-            return random.choice(mixed_strategies['conservative'])
+            return choice(rng, MIXED_STRATEGIES.conservative)
     
     else:  # Dry weather
         # High tire wear circuits favor different strategies
-        if circuit_factors['tire_wear'] > 0.7:
-            # High degradation circuits
-            high_deg_strategies = {
-                'conservative': [
-                    "Medium → Hard",
-                    "Hard → Medium",
-                    "Medium → Medium"
-                ],
-                'aggressive': [
-                    "Soft → Medium → Hard",
-                    "Soft → Hard",
-                    "Medium → Soft (undercut attempt)"
-                ],
-                'alternative': [
-                    "Hard → Soft (reverse strategy)",
-                    "Soft → Medium → Medium",
-                    "Medium → Hard → Soft"
-                ]
-            }
-            strategies = high_deg_strategies
+        if circuit_factors.tire_wear > 0.7:
+            strategies = HIGH_DEG_STRATEGIES
         else:
-            # Normal/low degradation circuits
-            normal_strategies = {
-                'conservative': [
-                    "Medium → Hard",
-                    "Soft → Medium",
-                    "Hard → Medium"
-                ],
-                'aggressive': [
-                    "Soft → Soft (double stint on softs)",
-                    "Soft → Hard (long second stint)",
-                    "Medium → Soft (late attack)"
-                ],
-                'alternative': [
-                    "Hard → Soft (opposite to field)",
-                    "Soft → Medium → Soft",
-                    "Medium → Medium"
-                ]
-            }
-            strategies = normal_strategies
+            strategies = NORMAL_STRATEGIES
         
         # Mercedes historically conservative, Red Bull more aggressive
         if constructor == 'Mercedes':
@@ -487,98 +491,50 @@ def get_personalized_tire_strategy(driver, constructor, grid_position, weather,
             strategy_aggression *= 1.1
         elif constructor == 'Ferrari':
             # Ferrari sometimes makes questionable strategy calls
-            if random.random() < 0.15:
-                return "Hard → Hard (Ferrari master plan 🤔)"
+            if rng.random() < 0.15:
+                return FERRARI_MASTER_PLAN
         
         # Special driver considerations
         if driver == 'Max Verstappen' and grid_position > 5:
             # Verstappen often goes aggressive when starting behind
             strategy_aggression *= 1.3
-        elif driver == 'Lewis Hamilton' and circuit_factors['strategy_importance'] > 0.8:
+        elif driver == 'Lewis Hamilton' and circuit_factors.strategy_importance > 0.8:
             # Hamilton excels at strategy-critical circuits
             strategy_aggression *= 1.1
         
-        if random.random() < alternative_strategy_chance:
-            return random.choice(strategies['alternative'])
+        if rng.random() < alternative_strategy_chance:
+            return choice(rng, strategies.alternative)
         elif strategy_aggression > 0.75:
-            return random.choice(strategies['aggressive'])
+            return choice(rng, strategies.aggressive)
         else:
-            return random.choice(strategies['conservative'])
+            return choice(rng, strategies.conservative)
 
-def get_realistic_driver_performance(driver_name):
+def get_realistic_driver_performance(driver_name, feature_store=None):
     """Enhanced driver performance with 2025 season realism"""
-    
-    # Updated driver performance data for 2025 season
-    driver_data = {
-        # Top Tier - Championship contenders
-        'Max Verstappen': {'experience': 10, 'form': 1.5, 'quali_gap': -0.4, 'win_factor': 1.4},
-        'Lewis Hamilton': {'experience': 18, 'form': 3.2, 'quali_gap': -0.1, 'win_factor': 1.3},
-        'Charles Leclerc': {'experience': 7, 'form': 2.8, 'quali_gap': -0.2, 'win_factor': 1.25},
-        'Lando Norris': {'experience': 6, 'form': 2.1, 'quali_gap': -0.25, 'win_factor': 1.2},
-        
-        # Second Tier - Regular podium contenders  
-        'George Russell': {'experience': 4, 'form': 4.1, 'quali_gap': 0.0, 'win_factor': 1.15},
-        'Fernando Alonso': {'experience': 23, 'form': 5.3, 'quali_gap': 0.1, 'win_factor': 1.2},
-        'Oscar Piastri': {'experience': 2, 'form': 3.4, 'quali_gap': -0.1, 'win_factor': 1.1},
-        'Carlos Sainz': {'experience': 10, 'form': 4.8, 'quali_gap': 0.2, 'win_factor': 1.1},
-        
-        # Midfield - Occasional points
-        'Pierre Gasly': {'experience': 7, 'form': 7.2, 'quali_gap': 0.3, 'win_factor': 1.0},
-        'Alex Albon': {'experience': 5, 'form': 8.5, 'quali_gap': 0.25, 'win_factor': 0.95},
-        'Nico Hülkenberg': {'experience': 15, 'form': 9.2, 'quali_gap': 0.15, 'win_factor': 0.95},
-        'Esteban Ocon': {'experience': 8, 'form': 8.7, 'quali_gap': 0.3, 'win_factor': 0.9},
-        
-        # Lower midfield
-        'Lance Stroll': {'experience': 8, 'form': 11.8, 'quali_gap': 0.4, 'win_factor': 0.85},
-        'Yuki Tsunoda': {'experience': 4, 'form': 10.1, 'quali_gap': 0.35, 'win_factor': 0.9},
-        
-        # Rookies and backmarkers
-        'Kimi Antonelli': {'experience': 1, 'form': 12.5, 'quali_gap': 0.6, 'win_factor': 0.8},
-        'Oliver Bearman': {'experience': 1, 'form': 14.2, 'quali_gap': 0.7, 'win_factor': 0.8},
-        'Franco Colapinto': {'experience': 1, 'form': 15.1, 'quali_gap': 0.8, 'win_factor': 0.75},
-        'Gabriel Bortoleto': {'experience': 1, 'form': 16.3, 'quali_gap': 0.9, 'win_factor': 0.7},
-        'Isack Hadjar': {'experience': 1, 'form': 15.8, 'quali_gap': 0.85, 'win_factor': 0.75},
-        'Liam Lawson': {'experience': 2, 'form': 13.9, 'quali_gap': 0.55, 'win_factor': 0.85}
-    }
-    
-    return driver_data.get(driver_name, {'experience': 3, 'form': 15.0, 'quali_gap': 0.8, 'win_factor': 0.7})
+    performance = DRIVER_PERFORMANCE.get(driver_name, DEFAULT_DRIVER_PERFORMANCE)
+    stored = feature_store.row('driver', driver_name) if feature_store else None
+    if stored:
+        performance = performance._replace(experience=stored['driver_experience'], form=stored['recent_form'])
+    return performance
 
-def get_realistic_constructor_performance(constructor_name):
+def get_realistic_constructor_performance(constructor_name, feature_store=None):
     """Updated constructor performance for 2025 season"""
-    
-    # 2025 season constructor competitiveness
-    constructor_standings = {
-        'McLaren': {'standing': 1, 'efficiency': 0.98, 'pace_factor': 1.0},
-        'Ferrari': {'standing': 2, 'efficiency': 0.95, 'pace_factor': 0.98},
-        'Red Bull Racing': {'standing': 3, 'efficiency': 0.93, 'pace_factor': 0.96},
-        'Mercedes': {'standing': 4, 'efficiency': 0.90, 'pace_factor': 0.94},
-        'Aston Martin': {'standing': 5, 'efficiency': 0.85, 'pace_factor': 0.88},
-        'Alpine': {'standing': 6, 'efficiency': 0.82, 'pace_factor': 0.85},
-        'Williams': {'standing': 9, 'efficiency': 0.78, 'pace_factor': 0.82},
-        'Haas': {'standing': 7, 'efficiency': 0.80, 'pace_factor': 0.83},
-        'RB': {'standing': 8, 'efficiency': 0.79, 'pace_factor': 0.84},
-        'Kick Sauber': {'standing': 10, 'efficiency': 0.75, 'pace_factor': 0.80}
-    }
-    
-    return constructor_standings.get(constructor_name, {'standing': 10, 'efficiency': 0.75, 'pace_factor': 0.80})
+    performance = CONSTRUCTOR_PERFORMANCE.get(constructor_name, DEFAULT_CONSTRUCTOR_PERFORMANCE)
+    stored = feature_store.row('constructor', constructor_name) if feature_store else None
+    if stored:
+        performance = performance._replace(standing=stored['constructor_standing'], efficiency=stored['budget_efficiency'])
+    return performance
 
 def calculate_realistic_win_probability(driver, constructor, grid_position, weather):
     """Calculate realistic win probability based on multiple factors"""
     
     driver_perf = get_realistic_driver_performance(driver)
-    constructor_perf = get_realistic_constructor_performance(constructor)
     
     # Base probability from constructor competitiveness
-    base_prob_map = {
-        'McLaren': 25, 'Ferrari': 22, 'Red Bull Racing': 20, 'Mercedes': 18,
-        'Aston Martin': 8, 'Alpine': 4, 'Williams': 2, 'Haas': 1,
-        'RB': 1.5, 'Kick Sauber': 0.5
-    }
-    
-    base_prob = base_prob_map.get(constructor, 1.0)
+    base_prob = BASE_WIN_PROBABILITY.get(constructor, DEFAULT_BASE_WIN_PROBABILITY)
     
     # Apply driver skill factor
-    driver_factor = driver_perf['win_factor']
+    driver_factor = driver_perf.win_factor
     
     # Grid position impact (exponential decay)
     if grid_position <= 5:
@@ -593,8 +549,7 @@ def calculate_realistic_win_probability(driver, constructor, grid_position, weat
     # Weather adjustments
     weather_factor = 1.0
     if weather == "Wet":
-        wet_specialists = ['Lewis Hamilton', 'Max Verstappen', 'Fernando Alonso']
-        weather_factor = 1.3 if driver in wet_specialists else 0.85
+        weather_factor = 1.3 if driver in WET_SPECIALISTS else 0.85
     elif weather == "Mixed":
         weather_factor = 0.95  # Slightly unpredictable
     
@@ -604,59 +559,245 @@ def calculate_realistic_win_probability(driver, constructor, grid_position, weat
     # Cap realistic maximum (even best driver from pole shouldn't exceed ~35%)
     return min(35.0, max(0.1, final_prob))
 
-def get_circuit_features(circuit_name):
+def get_constructor_form(constructor_name, feature_store=None):
+    """Constructor form from live race updates, then the feature store"""
+    stored = feature_store.row('constructor', constructor_name) if feature_store else None
+    form = stored['constructor_form'] if stored else DEFAULT_FORM
+    return form_state.constructor_form(constructor_name, form) if form_state else form
+
+def get_circuit_features(circuit_name, feature_store=None):
     """Get circuit-specific characteristics"""
-    circuit_data = {
-        'Monaco Circuit': {'type': 'Street', 'drs_zones': 1, 'lap_length': 3.337},
-        'Marina Bay Street Circuit': {'type': 'Street', 'drs_zones': 3, 'lap_length': 5.063},
-        'Baku City Circuit': {'type': 'Street', 'drs_zones': 2, 'lap_length': 6.003},
-        'Jeddah Corniche Circuit': {'type': 'Street', 'drs_zones': 3, 'lap_length': 6.174},
-        'Las Vegas Strip Circuit': {'type': 'Street', 'drs_zones': 2, 'lap_length': 6.201},
-        'Monza Circuit': {'type': 'Power', 'drs_zones': 2, 'lap_length': 5.793},
-        'Silverstone Circuit': {'type': 'Balanced', 'drs_zones': 2, 'lap_length': 5.891},
-        'Hungaroring': {'type': 'Twisty', 'drs_zones': 1, 'lap_length': 4.381},
-        'Circuit de Spa-Francorchamps': {'type': 'Power', 'drs_zones': 2, 'lap_length': 7.004}
-    }
-    
-    return circuit_data.get(circuit_name, {'type': 'Balanced', 'drs_zones': 2, 'lap_length': 5.0})
+    features = CIRCUIT_FEATURES.get(circuit_name, DEFAULT_CIRCUIT_FEATURES)
+    stored = feature_store.row('circuit', circuit_name) if feature_store else None
+    if stored:
+        features = features._replace(drs_zones=stored['drs_zones'], lap_length=stored['lap_length'])
+    return features
 
 def get_points_for_position(position):
     """Get F1 points for a given position"""
-    points_system = {
-        1: 25, 2: 18, 3: 15, 4: 12, 5: 10,
-        6: 8, 7: 6, 8: 4, 9: 2, 10: 1
-    }
-    return points_system.get(position, 0)
+    return POINTS_SYSTEM.get(position, 0)
+
+PREDICTION_LOG_FIELDS = [
+    'timestamp', 'circuit', 'weather', 'temperature', 'track_temp',
+    'num_entries', 'winner_prediction', 'winner_probability'
+]
+
+# Predictions are appended to the CSV by a background writer so requests never wait on disk I/O
+prediction_logger = logger_from_env(os.path.join(BASE_DIR, "logs", "prediction_log.csv"), PREDICTION_LOG_FIELDS)
 
 def log_prediction(request_data, predictions, temp, track_temp):
     """Log predictions for model improvement"""
-    try:
-        os.makedirs("logs", exist_ok=True)
+    log_entry = {
+        'timestamp': datetime.now().isoformat(),
+        'circuit': request_data.circuit,
+        'weather': request_data.weather,
+        'temperature': temp,
+        'track_temp': track_temp,
+        'num_entries': len(request_data.entries),
+        'winner_prediction': predictions[0]['driver'] if predictions else 'N/A',
+        'winner_probability': predictions[0]['win_probability'] if predictions else 0
+    }
+    
+    prediction_logger.log(log_entry)
+
+def build_race_rows(data, rng, feature_store=None):
+    """Race conditions plus one feature row per entry, ready for build_feature_matrix
+
+    Per-entity features come from feature_store, the serving models' own.
+    """
+    # Get race conditions
+    circuit = data.circuit
+    weather = data.weather
+    temp, humidity, wind, track_temp = get_weather_features(circuit, weather, rng)
+    circuit_features = get_circuit_features(circuit, feature_store)
+    
+    rows = []
+    for entry in data.entries:
+        driver_features = get_realistic_driver_performance(entry.driver, feature_store)
+        constructor_features = get_realistic_constructor_performance(entry.constructor, feature_store)
         
-        log_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'circuit': request_data.circuit,
-            'weather': request_data.weather,
+        rows.append({
+            'driver': entry.driver,
+            'constructor': entry.constructor,
+            'circuit': circuit,
+            'weather': weather,
+            'tire_strategy': get_personalized_tire_strategy(entry.driver, entry.constructor, entry.grid, weather, circuit, rng),
+            'circuit_type': circuit_features.type,
+            'grid': entry.grid,
             'temperature': temp,
+            'humidity': humidity,
+            'wind_speed': wind,
             'track_temp': track_temp,
-            'num_entries': len(request_data.entries),
-            'winner_prediction': predictions[0]['driver'] if predictions else 'N/A',
-            'winner_probability': predictions[0]['win_probability'] if predictions else 0
-        }
-        
-        log_df = pd.DataFrame([log_entry])
-        log_file = "logs/prediction_log.csv"
-        
-        if os.path.exists(log_file):
-            log_df.to_csv(log_file, mode='a', header=False, index=False)
-        else:
-            log_df.to_csv(log_file, index=False)
-            
-    except Exception as e:
-        print(f"Logging error: {e}")
+            'driver_experience': driver_features.experience,
+            'recent_form': form_state.driver_form(entry.driver, driver_features.form) if form_state else driver_features.form,
+            'quali_gap_to_teammate': driver_features.quali_gap,
+            'constructor_standing': constructor_features.standing,
+            'budget_efficiency': constructor_features.efficiency,
+            'drs_zones': circuit_features.drs_zones,
+            'lap_length': circuit_features.lap_length,
+            'safety_car_laps': SAFETY_CAR_MEAN_LAPS,
+            'avg_pit_time': AVERAGE_PIT_TIME,
+            'constructor_form': get_constructor_form(entry.constructor, feature_store)
+        })
+    
+    race_info = RaceInfo(
+        circuit=circuit,
+        weather=weather,
+        temperature=temp,
+        track_temp=track_temp,
+        humidity=humidity,
+        wind_speed=wind
+    )
+    
+    return rows, race_info
+
+def default_season_entries():
+    """Current line-up ordered by constructor standing, used when no grid is given"""
+    entries = []
+    for standing in constructor_standings_2025:
+        team = current_teams.get(standing['team'], {})
+        for driver in team.get('drivers', []):
+            entries.append(RaceEntry(driver=driver, constructor=standing['team'], grid=len(entries) + 1))
+    return entries
+
+def remaining_season_rounds(from_round=None):
+    """Rounds of the 2025 calendar still to be raced"""
+    if from_round is not None:
+        return [c for c in circuits_2025 if c['round'] >= from_round]
+    today = datetime.now().strftime("%Y-%m-%d")
+    return [c for c in circuits_2025 if c['date'] >= today]
+
+def require_remaining_rounds(from_round=None):
+    """422 when there is no round left to project, instead of a projection of the current standings alone"""
+    if not remaining_season_rounds(from_round):
+        start = f"round {from_round}" if from_round is not None else "today"
+        raise HTTPException(status_code=422, detail=f"No 2025 rounds left to project from {start}; pass an earlier from_round")
+
+def serving_models():
+    """The serving model version, read once per request so a reload never changes it mid-request"""
+    serving = model_registry.current
+    if serving is None:
+        raise HTTPException(status_code=500, detail="Models not loaded. Please run train_enhanced_model.py first")
+    return serving
+
+def service_unavailable(error):
+    return HTTPException(status_code=503, detail=str(error), headers={'Retry-After': str(error.retry_after)})
+
+async def run_inference(fn, *args):
+    """Await fn on the inference pool, answering 503 with Retry-After when the pool is saturated"""
+    try:
+        return await inference_executor.run(fn, *args)
+    except ExecutorSaturated as e:
+        raise service_unavailable(e)
+
+async def predict_batched(model, X):
+    """model.predict(X) batched with concurrent requests on the inference pool"""
+    try:
+        return await prediction_batcher.predict(model, X)
+    except ExecutorSaturated as e:
+        raise service_unavailable(e)
+
+def prepare_season_projection(data, serving):
+    """Build the per-round position distributions and standings for a season projection"""
+    entries = data.entries or default_season_entries()
+    seed = data.seed if data.seed is not None else seed_from_key(canonical_request_key(data, serving.version))
+    rng = make_rng(seed)
+    remaining = remaining_season_rounds(data.from_round)
+    
+    round_inputs = []
+    for race in remaining:
+        race_request = canonicalize_request(PredictionRequest(circuit=race['name'], weather=data.weather, entries=entries))
+        rows, _ = build_race_rows(race_request, rng, serving.feature_store)
+        feature_matrix = build_feature_matrix(rows, serving.schema, serving.encoding_index)
+        feature_matrix = scale_feature_matrix(feature_matrix, serving.schema, serving.scaler)
+        support, spread = model_position_distribution(serving.models['position'], feature_matrix, [row['grid'] for row in rows])
+        round_inputs.append((support, spread, data.weather))
+    
+    # Every round is built from the same canonical entry order
+    entries = canonicalize_request(PredictionRequest(circuit="", weather=data.weather, entries=entries)).entries
+    
+    teams = [standing['team'] for standing in constructor_standings_2025]
+    teams += sorted({entry.constructor for entry in entries} - set(teams))
+    team_points = {standing['team']: standing['points'] for standing in constructor_standings_2025}
+    
+    return {
+        'seed': seed,
+        'entries': entries,
+        'teams': teams,
+        'remaining': [race['name'] for race in remaining],
+        'args': dict(
+            round_inputs=round_inputs,
+            starting_points=np.array([data.driver_points.get(entry.driver, 0.0) for entry in entries]),
+            team_index=np.array([teams.index(entry.constructor) for entry in entries]),
+            n_teams=len(teams),
+            starting_team_points=np.array([team_points.get(team, 0.0) for team in teams]),
+            n_seasons=data.n_seasons,
+            seed=seed,
+            workers=data.workers,
+            wet_specialists=[entry.driver in WET_SPECIALISTS for entry in entries]
+        )
+    }
+
+def format_season_projection(data, projection, result):
+    """Convert merged shard histograms into the API response"""
+    n_seasons = result['n_seasons']
+    entries = projection['entries']
+    teams = projection['teams']
+    starting_team_points = projection['args']['starting_team_points']
+    
+    drivers = [
+        DriverProjection(
+            driver=entry.driver,
+            constructor=entry.constructor,
+            current_points=data.driver_points.get(entry.driver, 0.0),
+            expected_points=round(float(result['driver_points_sum'][i]) / n_seasons, 2),
+            title_probability=round(float(result['driver_titles'][i]) / n_seasons * 100, 2),
+            championship_position_histogram=result['driver_position_histogram'][i].tolist()
+        )
+        for i, entry in enumerate(entries)
+    ]
+    drivers.sort(key=lambda driver: (-driver.title_probability, -driver.expected_points))
+    
+    constructors = [
+        ConstructorProjection(
+            team=team,
+            current_points=float(starting_team_points[i]),
+            expected_points=round(float(result['team_points_sum'][i]) / n_seasons, 2),
+            title_probability=round(float(result['team_titles'][i]) / n_seasons * 100, 2)
+        )
+        for i, team in enumerate(teams)
+    ]
+    constructors.sort(key=lambda team: (-team.title_probability, -team.expected_points))
+    
+    return SeasonProjectionResult(
+        success=True,
+        n_seasons=n_seasons,
+        seed=projection['seed'],
+        remaining_rounds=projection['remaining'],
+        drivers=drivers,
+        constructors=constructors
+    )
 
 # API Endpoints
 
+@app.on_event("startup")
+def warm_up_models():
+    """Load the model forests in the background so lightweight endpoints serve immediately"""
+    serving = model_registry.current
+    if serving is not None and os.environ.get("MODEL_WARMUP", "1") != "0":
+        threading.Thread(target=serving.bundle.load_all, name="model-warmup", daemon=True).start()
+    
+    # Optionally pick up bundles written by train_enhanced_model.py without a restart
+    watch_interval = float(os.environ.get("MODEL_WATCH_INTERVAL", 0))
+    if watch_interval > 0:
+        model_registry.watch(watch_interval)
+
+@app.on_event("shutdown")
+def flush_prediction_log():
+    """Write any buffered prediction log rows before the server exits"""
+    model_registry.stop_watching()
+    prediction_logger.close()
+
 @app.get("/api/teams", response_model=Dict[str, Any])
 async def get_teams():
     """Get all F1 teams and their information"""
@@ -670,186 +811,298 @@ async def get_circuits():
 @app.post("/api/predict", response_model=PredictionResult)
 async def predict_race(data: PredictionRequest):
     """Predict race results based on grid, weather, and circuit conditions"""
-    if not models:
-        raise HTTPException(status_code=500, detail="Models not loaded. Please run train_enhanced_model.py first")
+    serving = serving_models()
     
     try:
-        predictions = []
-        
-        # Get race conditions
-        circuit = data.circuit
-        weather = data.weather
-        temp, humidity, wind, track_temp = get_weather_features(circuit, weather)
-        circuit_features = get_circuit_features(circuit)
-        
-        # Store win probabilities for normalization
-        all_win_probs = []
-        
-        for entry in data.entries:
-            driver = entry.driver
-            constructor = entry.constructor
-            grid = entry.grid
-            
-            try:
-                # Get enhanced features
-                driver_features = get_realistic_driver_performance(driver)
-                constructor_features = get_realistic_constructor_performance(constructor)
-                
-                # Encode categorical variables safely
-                try:
-                    driver_encoded = label_encoders['driver'].transform([driver])[0]
-                except (ValueError, KeyError):
-                    driver_encoded = 0
-                
-                try:
-                    constructor_encoded = label_encoders['constructor'].transform([constructor])[0]
-                except (ValueError, KeyError):
-                    constructor_encoded = 0
-                
-                try:
-                    circuit_encoded = label_encoders['circuit'].transform([circuit])[0]
-                except (ValueError, KeyError):
-                    circuit_encoded = 0
-                
-                try:
-                    weather_encoded = label_encoders['weather'].transform([weather])[0]
-                except (ValueError, KeyError):
-                    weather_encoded = 0
-                
-                # Generate personalized tire strategy
-                tire_strategy = get_personalized_tire_strategy(driver, constructor, grid, weather, circuit)
-                
-                try:
-                    tire_strategy_encoded = label_encoders['tire_strategy'].transform([tire_strategy])[0]
-                except (ValueError, KeyError):
-                    tire_strategy_encoded = 0
-                
-                try:
-                    circuit_type_encoded = label_encoders['circuit_type'].transform([circuit_features['type']])[0]
-                except (ValueError, KeyError):
-                    circuit_type_encoded = 0
-                
-                # Build feature vector matching the enhanced model
-                features = [
-                    grid,  # grid position
-                    constructor_encoded,  # constructor
-                    circuit_encoded,  # circuit
-                    driver_encoded,  # driver
-                    weather_encoded,  # weather
-                    tire_strategy_encoded,  # tire strategy
-                    temp,  # temperature
-                    humidity,  # humidity
-                    wind,  # wind speed
-                    track_temp,  # track temperature
-                    driver_features['experience'],  # driver experience
-                    driver_features['form'],  # recent form
-                    driver_features['quali_gap'],  # qualifying gap
-                    constructor_features['standing'],  # constructor standing
-                    constructor_features['efficiency'],  # budget efficiency
-                    circuit_type_encoded,  # circuit type
-                    circuit_features['drs_zones'],  # DRS zones
-                    circuit_features['lap_length']  # lap length
-                ]
-                
-                # Scale numerical features
-                feature_array = np.array(features).reshape(1, -1)
-                numerical_indices = [6, 7, 8, 9, 10, 11, 12, 15, 17, 19]  # indices of numerical features
-                feature_array_scaled = feature_array.copy()
-                
-                if scaler and len(numerical_indices) > 0:
-                    try:
-                        feature_array_scaled[:, numerical_indices] = scaler.transform(feature_array[:, numerical_indices])
-                    except:
-                        pass  # Use unscaled if scaling fails
-                
-                # Make predictions using enhanced models
-                try:
-                    position_pred = models['position'].predict(feature_array_scaled)[0]
-                except:
-                    # Fallback position prediction based on grid and performance
-                    position_pred = max(1, min(20, grid + random.randint(-3, 5)))
-                
-                # Calculate realistic win probability
-                win_prob = calculate_realistic_win_probability(driver, constructor, grid, weather)
-                all_win_probs.append(win_prob)
-                
-                predictions.append({
-                    'driver': driver,
-                    'constructor': constructor,
-                    'grid': grid,
-                    'predicted_position': max(1, min(20, round(position_pred))),
-                    'podium_chance': False,  # Will be set based on final position
-                    'points_chance': False,  # Will be set based on final position
-                    'points_earned': 0,  # Will be calculated based on final position
-                    'win_probability': round(win_prob, 2),
-                    'tire_strategy': tire_strategy
-                })
-                
-            except Exception as e:
-                print(f"Error processing {driver}: {e}")
-                # Fallback prediction with realistic values
-                fallback_win_prob = calculate_realistic_win_probability(driver, constructor, grid, weather)
-                all_win_probs.append(fallback_win_prob)
-                
-                # Generate fallback tire strategy
-                fallback_tire_strategy = get_personalized_tire_strategy(driver, constructor, grid, weather, circuit)
-                
-                predictions.append({
-                    'driver': driver,
-                    'constructor': constructor,
-                    'grid': grid,
-                    'predicted_position': min(max(1, grid + random.randint(-3, 5)), 20),
-                    'podium_chance': False,
-                    'points_chance': False,
-                    'points_earned': 0,
-                    'win_probability': round(fallback_win_prob, 2),
-                    'tire_strategy': fallback_tire_strategy
-                })
-        
-        # Normalize win probabilities to sum to ~100%
-        total_win_prob = sum(all_win_probs)
-        if total_win_prob > 0:
-            normalization_factor = 100.0 / total_win_prob
-            for i, pred in enumerate(predictions):
-                pred['win_probability'] = round(all_win_probs[i] * normalization_factor, 2)
-        
-        # Sort by win probability (descending) and assign positions realistically
-        predictions.sort(key=lambda x: x['win_probability'], reverse=True)
+        # Identical grids, circuits and weather share one cached answer per model version
+        data = canonicalize_request(data)
+        cache_key = canonical_request_key(data, serving.version)
+        cached_result = prediction_cache.get(cache_key)
+        if cached_result is not None:
+            predictions = [pred.model_dump() for pred in cached_result.predictions]
+            log_prediction(data, predictions, cached_result.race_info.temperature, cached_result.race_info.track_temp)
+            return cached_result
+    except Exception as e:
+        print(f"Prediction error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    # Cache misses run on the bounded inference pool, off the event loop; the position
+    # model call is batched with the grids of concurrent requests
+    try:
+        rows, race_info, feature_matrix = await run_inference(build_race_matrix, data, serving, cache_key)
+        position_preds = await predict_batched(serving.models['position'], feature_matrix)
+        return await run_inference(finish_race_prediction, data, rows, race_info, position_preds, cache_key)
+    except HTTPException:
+        raise
+    except FeatureSchemaError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        print(f"Prediction error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+def build_race_matrix(data, serving, cache_key):
+    """Rows and the scaled feature matrix for a canonicalized request"""
+    # Seed all randomness from the request (or the key) so fresh and cached answers agree
+    rng = make_rng(data.seed if data.seed is not None else seed_from_key(cache_key))
+    
+    # Collect per-entry features so the whole grid is encoded and predicted at once
+    rows, race_info = build_race_rows(data, rng, serving.feature_store)
+    
+    # Build and scale the whole grid in a single pass
+    feature_matrix = build_feature_matrix(rows, serving.schema, serving.encoding_index)
+    feature_matrix = scale_feature_matrix(feature_matrix, serving.schema, serving.scaler)
+    return rows, race_info, feature_matrix
+
+def finish_race_prediction(data, rows, race_info, position_preds, cache_key):
+    """Turn model positions into the ranked, logged and cached prediction result"""
+    predictions = []
+    weather = data.weather
+    
+    # Store win probabilities for normalization
+    all_win_probs = []
+    
+    for row, position_pred in zip(rows, position_preds):
+        # Calculate realistic win probability
+        win_prob = calculate_realistic_win_probability(row['driver'], row['constructor'], row['grid'], weather)
+        all_win_probs.append(win_prob)
         
-        # Assign positions 1-20 based on win probability ranking
+        predictions.append({
+            'driver': row['driver'],
+            'constructor': row['constructor'],
+            'grid': row['grid'],
+            'predicted_position': max(1, min(20, round(position_pred))),
+            'podium_chance': False,  # Will be set based on final position
+            'points_chance': False,  # Will be set based on final position
+            'points_earned': 0,  # Will be calculated based on final position
+            'win_probability': round(win_prob, 2),
+            'tire_strategy': row['tire_strategy']
+        })
+    
+    # Normalize win probabilities to sum to ~100%
+    total_win_prob = sum(all_win_probs)
+    if total_win_prob > 0:
+        normalization_factor = 100.0 / total_win_prob
         for i, pred in enumerate(predictions):
-            position = i + 1
-            pred['predicted_position'] = position
-            
-            # Update podium and points based on final position
-            pred['podium_chance'] = position <= 3
-            pred['points_chance'] = position <= 10
-            pred['points_earned'] = get_points_for_position(position)
+            pred['win_probability'] = round(all_win_probs[i] * normalization_factor, 2)
+    
+    # Sort by win probability (descending) and assign positions realistically
+    predictions.sort(key=lambda x: x['win_probability'], reverse=True)
+    
+    # Assign positions 1-20 based on win probability ranking
+    for i, pred in enumerate(predictions):
+        position = i + 1
+        pred['predicted_position'] = position
+        
+        # Update podium and points based on final position
+        pred['podium_chance'] = position <= 3
+        pred['points_chance'] = position <= 10
+        pred['points_earned'] = get_points_for_position(position)
+    
+    # Log prediction for analysis
+    log_prediction(data, predictions, race_info.temperature, race_info.track_temp)
+    
+    # Convert to Pydantic models
+    prediction_responses = [PredictionResponse(**pred) for pred in predictions]
+    
+    result = PredictionResult(
+        success=True,
+        predictions=prediction_responses,
+        race_info=race_info
+    )
+    prediction_cache.put(cache_key, result)
+    
+    return result
+
+@app.post("/api/simulate", response_model=SimulationResult)
+async def simulate_race_outcomes(data: SimulationRequest):
+    """Monte Carlo simulation of finishing positions, podium/points chances and expected points"""
+    serving = serving_models()
+    return await run_inference(compute_race_simulation, data, serving)
+
+def compute_race_simulation(data, serving):
+    """Simulate a race request (CPU-bound; runs on the inference pool)"""
+    try:
+        data = canonicalize_request(data)
+        seed = data.seed if data.seed is not None else seed_from_key(canonical_request_key(data, serving.version))
+        rng = make_rng(seed)
         
-        # Log prediction for analysis
-        log_prediction(data, predictions, temp, track_temp)
+        rows, race_info = build_race_rows(data, rng, serving.feature_store)
+        feature_matrix = build_feature_matrix(rows, serving.schema, serving.encoding_index)
+        feature_matrix = scale_feature_matrix(feature_matrix, serving.schema, serving.scaler)
         
-        # Convert to Pydantic models
-        prediction_responses = [PredictionResponse(**pred) for pred in predictions]
-        race_info = RaceInfo(
-            circuit=circuit,
-            weather=weather,
-            temperature=temp,
-            track_temp=track_temp,
-            humidity=humidity,
-            wind_speed=wind
+        # Every simulated race draws from the model's position distribution plus race noise
+        support, spread = model_position_distribution(serving.models['position'], feature_matrix, [row['grid'] for row in rows])
+        summary = simulate_race(
+            support,
+            spread=spread,
+            weather=data.weather,
+            n_simulations=data.n_simulations,
+            rng=rng,
+            wet_specialists=[row['driver'] in WET_SPECIALISTS for row in rows]
         )
         
-        return PredictionResult(
+        predictions = [
+            DriverSimulation(
+                driver=row['driver'],
+                constructor=row['constructor'],
+                grid=row['grid'],
+                expected_position=round(float(summary['expected_position'][i]), 2),
+                expected_points=round(float(summary['expected_points'][i]), 2),
+                win_probability=round(float(summary['win_probability'][i]) * 100, 2),
+                podium_probability=round(float(summary['podium_probability'][i]) * 100, 2),
+                points_probability=round(float(summary['points_probability'][i]) * 100, 2),
+                position_histogram=summary['histogram'][i].tolist()
+            )
+            for i, row in enumerate(rows)
+        ]
+        predictions.sort(key=lambda pred: pred.expected_position)
+        
+        return SimulationResult(
             success=True,
-            predictions=prediction_responses,
+            n_simulations=data.n_simulations,
+            seed=seed,
+            predictions=predictions,
             race_info=race_info
         )
         
+    except FeatureSchemaError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
-        print(f"Prediction error: {e}")
+        print(f"Simulation error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/season-projection", response_model=SeasonProjectionResult)
+async def project_championship(data: SeasonProjectionRequest):
+    """Monte Carlo championship projection over the remaining 2025 rounds"""
+    serving = serving_models()
+    require_remaining_rounds(data.from_round)
+    return await run_inference(compute_season_projection, data, serving)
+
+def compute_season_projection(data, serving):
+    """Project the championship (CPU-bound; runs on the inference pool)"""
+    try:
+        projection = prepare_season_projection(data, serving)
+        for event in iter_season_projection(**projection['args']):
+            if event['type'] == 'result':
+                return format_season_projection(data, projection, event['result'])
+    except FeatureSchemaError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        print(f"Season projection error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/season-projection/stream")
+async def stream_championship_projection(data: SeasonProjectionRequest):
+    """Same as /api/season-projection, streamed as NDJSON progress events followed by the result"""
+    serving = serving_models()
+    require_remaining_rounds(data.from_round)
+    
+    # Errors building the rounds are answered like the non-streamed endpoint, before any event is sent
+    try:
+        projection = await run_inference(prepare_season_projection, data, serving)
+    except HTTPException:
+        raise
+    except FeatureSchemaError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        print(f"Season projection error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    def events():
+        try:
+            for event in iter_season_projection(**projection['args']):
+                if event['type'] == 'result':
+                    result = format_season_projection(data, projection, event['result'])
+                    event = {'type': 'result', 'result': result.model_dump()}
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            print(f"Season projection error: {e}")
+            yield json.dumps({'type': 'error', 'detail': str(e)}) + "\n"
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+@app.get("/api/form", response_model=Dict[str, Any])
+async def get_form():
+    """Get current form (average finishing position over recent races) for the 2025 grid"""
+    drivers = [driver for team in current_teams.values() for driver in team['drivers']]
+    serving = model_registry.current
+    feature_store = serving.feature_store if serving else None
+    
+    def driver_form(driver):
+        fallback = get_realistic_driver_performance(driver, feature_store).form
+        return form_state.driver_form(driver, fallback) if form_state else fallback
+    
+    return {
+        'last_race': list(form_state.last_race) if form_state and form_state.last_race else None,
+        'drivers': {driver: round(driver_form(driver), 2) for driver in drivers},
+        'constructors': {
+            team: round(form_state.constructor_form(team), 2) if form_state else None
+            for team in current_teams
+        }
+    }
+
+@app.post("/api/form/update", response_model=Dict[str, Any])
+def update_form(data: FormUpdateRequest):
+    """Apply a finished race's results to driver and constructor form"""
+    global form_state, form_state_mtime
+    if form_state is None:
+        form_state = FormState()
+    
+    results = [
+        (normalize_name(result.driver), normalize_name(result.constructor), result.position)
+        for result in data.results
+    ]
+    updated = form_state.update(data.season, data.round, normalize_name(data.race_name), results)
+    
+    if updated:
+        form_state.save(FORM_STATE_FILE)
+        form_state_mtime = os.stat(FORM_STATE_FILE).st_mtime_ns
+        # Cached predictions were made with the previous form
+        prediction_cache.invalidate()
+        notify_workers()
+    
+    return {'updated': updated, 'last_race': list(form_state.last_race)}
+
+@app.get("/api/models", response_model=Dict[str, Any])
+async def get_models():
+    """Get the serving model bundle, the version a rollback would restore and the available versions"""
+    return model_registry.info()
+
+@app.post("/api/models/reload", response_model=Dict[str, Any])
+def reload_models(data: ModelReloadRequest):
+    """Load a model bundle (CURRENT by default), validate it and swap it in without dropping requests"""
+    try:
+        reloaded = model_registry.reload(data.version)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except FeatureSchemaError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    # CURRENT now names this version, which the other workers reload
+    notify_workers()
+    return {'reloaded': reloaded, **model_registry.info()}
+
+@app.post("/api/models/rollback", response_model=Dict[str, Any])
+def rollback_models():
+    """Swap the previously served model bundle back in"""
+    try:
+        model_registry.rollback()
+    except LookupError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    notify_workers()
+    return model_registry.info()
+
+@app.get("/api/cache-stats", response_model=Dict[str, Any])
+async def get_cache_stats():
+    """Get prediction cache hit/miss counters"""
+    return prediction_cache.stats()
+
+@app.get("/api/inference-stats", response_model=Dict[str, Any])
+async def get_inference_stats():
+    """Get inference pool concurrency, queue depth and rejection counters, and achieved batch sizes"""
+    return {**inference_executor.stats(), 'batching': prediction_batcher.stats()}
+
 @app.get("/api/driver-stats", response_model=Dict[str, Any])
 async def get_driver_stats():
     """Get comprehensive driver statistics"""
@@ -943,20 +1196,7 @@ async def get_driver_stats():
 async def get_constructor_standings():
     """Get current constructor championship standings"""
     
-    standings = [
-        {'position': 1, 'team': 'McLaren', 'points': 666, 'wins': 6},
-        {'position': 2, 'team': 'Ferrari', 'points': 652, 'wins': 5},
-        {'position': 3, 'team': 'Red Bull Racing', 'points': 589, 'wins': 9},
-        {'position': 4, 'team': 'Mercedes', 'points': 382, 'wins': 3},
-        {'position': 5, 'team': 'Aston Martin', 'points': 94, 'wins': 0},
-        {'position': 6, 'team': 'Alpine', 'points': 65, 'wins': 0},
-        {'position': 7, 'team': 'Haas', 'points': 58, 'wins': 0},
-        {'position': 8, 'team': 'RB', 'points': 46, 'wins': 0},
-        {'position': 9, 'team': 'Williams', 'points': 17, 'wins': 0},
-        {'position': 10, 'team': 'Kick Sauber', 'points': 0, 'wins': 0}
-    ]
-    
-    return standings
+    return constructor_standings_2025
 
 
 
@@ -974,19 +1214,25 @@ async def root():
             "teams": "/api/teams",
             "circuits": "/api/circuits", 
             "predict": "/api/predict",
+            "simulate": "/api/simulate",
+            "season_projection": "/api/season-projection",
             "driver_stats": "/api/driver-stats",
             "constructor_standings": "/api/constructor-standings",
+            "form": "/api/form",
+            "models": "/api/models",
+            "cache_stats": "/api/cache-stats",
+            "inference_stats": "/api/inference-stats",
         }
     }
 
 if __name__ == "__main__":
     print("🏎️  Starting Enhanced F1 Race Predictor FastAPI...")
     print(f"🌐 API will be available at http://localhost:8000")
-    print("📊 Enhanced Models status:", "✅ Loaded" if models else "❌ Not loaded")
+    print("📊 Enhanced Models status:", "✅ Loaded" if model_registry.current else "❌ Not loaded")
     print("📋 API Documentation available at: http://localhost:8000/docs")
     print("📖 Alternative docs at: http://localhost:8000/redoc")
     
-    if models:
+    if model_registry.current:
         print("🔥 Enhanced Features:")
         print("   • Personalized tire strategy based on driver/team characteristics")
         print("   • Realistic win probability calculation")
@@ -997,4 +1243,6 @@ if __name__ == "__main__":
         print("   • Driver personality and team philosophy factors")
         print("   • Grid position influence on strategy aggression")
     
-    uvicorn.run("app:app", host="localhost", port=8000, reload=True)
\ No newline at end of file
+    print("🚀 For production, serve with multiple workers: python serve.py --workers 4")
+    
+    uvicorn.run("app:app", host="localhost", port=8000, reload=os.environ.get("API_RELOAD", "1") == "1")
\ No newline at end of file
@@ -0,0 +1,199 @@
+import argparse
+import math
+import os
+import shutil
+import tempfile
+import time
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
+
+from form import race_codes
+from model_backends import backend_jobs
+from rng import make_rng
+from simulator import points_by_position
+from training_jobs import shared_array
+from tuning import load_tuned_params
+
+# What the backtest's feature matrix knows that a model predicting that race wouldn't have
+LEAKAGE_NOTE = ("Label encoders and the scaler are fit on every season; constructor standing and budget "
+                "efficiency are fixed 2025 reference values applied to all seasons")
+
+class Fold(NamedTuple):
+    """Races [first_race, end_race) predicted by a model trained on every race before first_race"""
+    first_race: int
+    end_race: int
+
+def backtest_folds(n_races, every=5, min_train_races=40, first_race=None):
+    """Expanding-window folds that retrain every `every` races"""
+    start = max(min_train_races, first_race or 0)
+    return [Fold(first, min(first + every, n_races)) for first in range(start, n_races, every)]
+
+def score_race(predicted, positions, grid=None):
+    """Spearman correlation, top-3 hit rate and points MAE of one race's predicted order
+
+    Ties in the prediction are broken by grid slot, like the API does.
+    """
+    n = len(positions)
+    tiebreak = np.arange(n) if grid is None else np.asarray(grid)
+    predicted_rank = np.empty(n, dtype=np.int64)
+    predicted_rank[np.lexsort((tiebreak, predicted))] = np.arange(1, n + 1)
+    actual_rank = np.empty(n, dtype=np.int64)
+    actual_rank[np.argsort(positions, kind='stable')] = np.arange(1, n + 1)
+
+    spearman = float(np.corrcoef(predicted_rank, actual_rank)[0, 1]) if n > 2 else np.nan
+    podium = min(3, n)
+    top3 = len(set(np.flatnonzero(predicted_rank <= podium)) & set(np.flatnonzero(actual_rank <= podium))) / podium
+    points = points_by_position(n)
+    points_mae = float(np.mean(np.abs(points[predicted_rank - 1] - points[actual_rank - 1])))
+    return {'spearman': spearman, 'top3_hit_rate': top3, 'points_mae': points_mae}
+
+def supports_warm_start(model):
+    """Bagged forests can grow extra trees on a grown window; boosting would keep stacking stages and overfit"""
+    params = model.get_params()
+    return 'warm_start' in params and 'bootstrap' in params
+
+def run_chain(estimator, folds, X, y, races, n_jobs=1, warm_trees=None):
+    """Fit and predict a run of consecutive folds; runs in a worker process
+
+    With warm_trees each retrain after the first keeps the model's trees and
+    adds warm_trees more fitted on the grown window, instead of refitting
+    from scratch. Returns [(fold, predictions for its rows, fit seconds)].
+    """
+    model = clone(estimator)
+    if 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=n_jobs)
+    warm_start = bool(warm_trees) and supports_warm_start(model)
+
+    results = []
+    for i, fold in enumerate(folds):
+        started = time.perf_counter()
+        train = races < fold.first_race
+        if warm_start and i > 0:
+            model.set_params(warm_start=True, n_estimators=model.n_estimators + warm_trees)
+        model.fit(X[train], y[train])
+        rows = (races >= fold.first_race) & (races < fold.end_race)
+        results.append((fold, model.predict(X[rows]), time.perf_counter() - started))
+    return results
+
+def run_backtest(X, y, races, grid, estimator, folds, workers=None, n_cpus=None, warm_trees=None):
+    """Replay history fold by fold and score every predicted race
+
+    The feature matrix is built once and every fold slices the same rows: form
+    and driver experience only count earlier races and seasons. It is not
+    fully point-in-time though (see LEAKAGE_NOTE): encoders and the scaler
+    see every row, which splits barely notice as codes follow names and
+    scaling is monotonic, and the constructor tables are today's values.
+    Folds run in parallel worker processes on a shared memory-mapped copy.
+    Warm-started folds depend on the previous one, so they are split into
+    one contiguous chain per worker instead. Returns (per-race DataFrame, fit seconds).
+    """
+    n_cpus = n_cpus or os.cpu_count() or 1
+    workers = max(1, min(len(folds), workers or n_cpus))
+    n_jobs = max(1, n_cpus // workers)
+
+    if warm_trees and supports_warm_start(estimator):
+        size = math.ceil(len(folds) / workers)
+        chains = [folds[i:i + size] for i in range(0, len(folds), size)]
+    else:
+        # Largest training windows first, so the last tasks to finish are short
+        chains = [[fold] for fold in sorted(folds, key=lambda fold: -fold.first_race)]
+        warm_trees = None
+
+    folder = tempfile.mkdtemp(prefix="f1-backtest-")
+    try:
+        X_shared, y_shared, races_shared = (shared_array(values, folder, name)
+                                            for name, values in (('X', X), ('y', y), ('races', races)))
+        outputs = Parallel(n_jobs=workers, backend='loky', max_nbytes=None)(
+            delayed(run_chain)(estimator, chain, X_shared, y_shared, races_shared, n_jobs, warm_trees)
+            for chain in chains
+        )
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    records, fit_time = [], 0.0
+    for fold, predictions, seconds in (result for output in outputs for result in output):
+        fit_time += seconds
+        fold_rows = np.flatnonzero((races >= fold.first_race) & (races < fold.end_race))
+        fold_races = races[fold_rows]
+        for race in range(fold.first_race, fold.end_race):
+            in_race = fold_races == race
+            rows = fold_rows[in_race]
+            record = {'race': race, 'fold_start': fold.first_race, 'drivers': len(rows)}
+            record.update(score_race(predictions[in_race], y[rows], grid[rows]))
+            record.update({f"grid_{name}": value for name, value in score_race(grid[rows], y[rows]).items()})
+            records.append(record)
+    return pd.DataFrame(records).sort_values('race').reset_index(drop=True), fit_time
+
+def summarize(scores, by=None):
+    """Mean metrics (model and grid-order baseline) overall or per group"""
+    columns = ['spearman', 'top3_hit_rate', 'points_mae', 'grid_spearman', 'grid_top3_hit_rate', 'grid_points_mae']
+    if by is None:
+        return scores[columns].mean().to_frame('all').T.assign(races=len(scores))
+    return scores.groupby(by)[columns].mean().assign(races=scores.groupby(by).size())
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the position model race by race with an expanding window")
+    parser.add_argument("--backend", default=None, help="model backend (default: $MODEL_BACKEND or forest)")
+    parser.add_argument("--model", default=None, help="position job of the backend to backtest (default: its first)")
+    parser.add_argument("--every", type=int, default=5, help="retrain every K races")
+    parser.add_argument("--min-train-races", type=int, default=40)
+    parser.add_argument("--from-season", type=int, default=None, help="first season to predict")
+    parser.add_argument("--warm-start", type=int, default=None, metavar="TREES",
+                        help="add TREES trees per retrain instead of refitting (random forests only)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="write per-race scores to this CSV")
+    args = parser.parse_args()
+
+    from train_enhanced_model import prepare_training_data
+
+    data = prepare_training_data(make_rng(args.seed))
+    if data is None:
+        return
+    df = data.df
+    races = race_codes(df)
+    y = data.targets['position'].astype(np.float64)
+    grid = df['grid'].to_numpy(dtype=np.float64)
+
+    backend, jobs = backend_jobs(args.backend, tuned=load_tuned_params())
+    position_jobs = [job for job in jobs if job.target == 'position']
+    job = next((job for job in position_jobs if job.name == args.model), None) if args.model else position_jobs[0]
+    if job is None:
+        raise SystemExit(f"No position model {args.model!r} in the {backend} backend: {[job.name for job in position_jobs]}")
+
+    if args.warm_start and not supports_warm_start(job.estimator):
+        print(f"⚠️ {type(job.estimator).__name__} can't be warm-started, refitting every fold")
+        args.warm_start = None
+
+    first_race = int(races[(df['season'] >= args.from_season).to_numpy()].min()) if args.from_season else None
+    folds = backtest_folds(int(races.max()) + 1, args.every, args.min_train_races, first_race)
+    print(f"\n🔁 Backtesting {job.name} ({backend} backend) on {folds[-1].end_race - folds[0].first_race} races, "
+          f"retraining every {args.every}" + (f" (warm start +{args.warm_start} trees)" if args.warm_start else "")
+          + f", {len(folds)} folds")
+
+    started = time.perf_counter()
+    scores, fit_time = run_backtest(data.X, y, races, grid, job.estimator, folds, args.workers, warm_trees=args.warm_start)
+    wall_time = time.perf_counter() - started
+
+    race_seasons = df.groupby(races)['season'].first()
+    scores['season'] = scores['race'].map(race_seasons)
+    scores['decade'] = scores['season'] // 10 * 10
+
+    pd.set_option('display.width', 140)
+    print("\n📊 Per decade (model vs grid order):")
+    print(summarize(scores, 'decade').round(3).to_string())
+    print("\n📊 Overall:")
+    print(summarize(scores).round(3).to_string())
+    print(f"\n⏱️ {wall_time:.1f}s wall for {fit_time:.1f}s of fits")
+    print(f"ℹ️ {LEAKAGE_NOTE}")
+
+    if args.output:
+        scores.to_csv(args.output, index=False)
+        print(f"   ✅ Saved {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import asyncio
+import os
+from collections import Counter, deque
+
+import numpy as np
+
+# Upper bounds of the requests-per-batch histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+class _Batch:
+    def __init__(self, model):
+        self.model = model
+        self.items = []
+        self.rows = 0
+        self.timer = None
+        self.ready = False
+
+class MicroBatcher:
+    """Coalesce concurrent predict calls on the same model into one call
+
+    A forest predict on a 20-row grid is mostly per-call overhead, so rows
+    from requests arriving within `max_wait` seconds of the first one (or
+    until `max_batch_rows` are queued) are stacked, predicted in a single
+    call on the inference executor and sliced back to each waiting request.
+    While every executor worker is busy with earlier batches, a due batch
+    keeps collecting rows, so batches grow with load instead of queueing.
+    Must be awaited from the event loop; a max_wait of 0 turns batching off.
+    """
+
+    def __init__(self, executor, max_wait=0.003, max_batch_rows=512):
+        self.executor = executor
+        self.max_wait = max_wait
+        self.max_batch_rows = max(1, max_batch_rows)
+
+        self.batches = 0
+        self.requests = 0
+        self.rows = 0
+        self.max_batch_requests = 0
+        self.max_batch_rows_seen = 0
+        self.batch_size_histogram = Counter()
+
+        self._queues = {}
+        self._in_flight = Counter()
+        self._tasks = set()
+
+    async def predict(self, model, X):
+        """model.predict(X), run together with any concurrent calls on the same model"""
+        if len(X) == 0:
+            return np.zeros(0)
+        if self.max_wait <= 0:
+            predictions = await self.executor.run(_predict_stacked, model, [X])
+            self._record(1, len(X))
+            return predictions
+
+        loop = asyncio.get_running_loop()
+        key = (id(loop), id(model))
+        queue = self._queues.setdefault(key, deque())
+        if not queue or queue[-1].rows >= self.max_batch_rows:
+            batch = _Batch(model)
+            batch.timer = loop.call_later(self.max_wait, self._ready, key, batch)
+            queue.append(batch)
+        batch = queue[-1]
+
+        future = loop.create_future()
+        batch.items.append((X, future))
+        batch.rows += len(X)
+        if batch.rows >= self.max_batch_rows:
+            self._ready(key, batch)
+
+        return await future
+
+    def _ready(self, key, batch):
+        batch.timer.cancel()
+        batch.ready = True
+        self._dispatch(key)
+
+    def _dispatch(self, key):
+        """Start due batches, oldest first, while an executor worker is free for them"""
+        queue = self._queues.get(key)
+        while queue and queue[0].ready and self._in_flight[key] < self.executor.max_workers:
+            batch = queue.popleft()
+            self._in_flight[key] += 1
+            task = asyncio.get_running_loop().create_task(self._run(key, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        if not queue and not self._in_flight[key]:
+            self._queues.pop(key, None)
+            del self._in_flight[key]
+
+    async def _run(self, key, batch):
+        try:
+            predictions = await self.executor.run(_predict_stacked, batch.model, [X for X, _ in batch.items])
+        except Exception as e:
+            for _, future in batch.items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._in_flight[key] -= 1
+            self._dispatch(key)
+
+        self._record(len(batch.items), batch.rows)
+        offset = 0
+        for X, future in batch.items:
+            # A cancelled request (client gone) just drops its slice
+            if not future.done():
+                future.set_result(predictions[offset:offset + len(X)])
+            offset += len(X)
+
+    def _record(self, n_requests, n_rows):
+        self.batches += 1
+        self.requests += n_requests
+        self.rows += n_rows
+        self.max_batch_requests = max(self.max_batch_requests, n_requests)
+        self.max_batch_rows_seen = max(self.max_batch_rows_seen, n_rows)
+        bucket = next((size for size in BATCH_SIZE_BUCKETS if n_requests <= size), None)
+        self.batch_size_histogram[f"<={bucket}" if bucket else f">{BATCH_SIZE_BUCKETS[-1]}"] += 1
+
+    def stats(self):
+        """Achieved batch sizes"""
+        return {
+            'max_wait_ms': round(self.max_wait * 1000, 3),
+            'max_batch_rows': self.max_batch_rows,
+            'batches': self.batches,
+            'requests': self.requests,
+            'mean_requests_per_batch': round(self.requests / self.batches, 2) if self.batches else 0.0,
+            'mean_rows_per_batch': round(self.rows / self.batches, 2) if self.batches else 0.0,
+            'max_requests_per_batch': self.max_batch_requests,
+            'max_rows_per_batch': self.max_batch_rows_seen,
+            'requests_per_batch_histogram': dict(self.batch_size_histogram)
+        }
+
+def _predict_stacked(model, matrices):
+    X = matrices[0] if len(matrices) == 1 else np.vstack(matrices)
+    return np.asarray(model.predict(X), dtype=np.float64)
+
+def batcher_from_env(executor, prefix='PREDICT_BATCH'):
+    """Create a MicroBatcher configured from environment variables"""
+    return MicroBatcher(
+        executor,
+        max_wait=float(os.environ.get(f"{prefix}_WAIT_MS", 3)) / 1000,
+        max_batch_rows=int(os.environ.get(f"{prefix}_MAX_ROWS", 512)),
+    )
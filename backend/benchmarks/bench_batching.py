@@ -0,0 +1,109 @@
+"""Benchmark /api/predict throughput with and without micro-batching across concurrent requests
+
+Run from the backend directory (needs trained models):
+    python benchmarks/bench_batching.py --concurrency 1,8,32,64 --duration 10
+
+Starts one uvicorn worker per setting and drives it with `concurrency`
+keep-alive connections posting uncached 20-driver grids. A wait of 0 ms
+disables batching, so that row is the one-predict-per-request baseline.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_serving import BACKEND_DIR, wait_until_ready
+
+GRID = [
+    ("Oscar Piastri", "McLaren"), ("Lando Norris", "McLaren"),
+    ("Max Verstappen", "Red Bull Racing"), ("Yuki Tsunoda", "Red Bull Racing"),
+    ("George Russell", "Mercedes"), ("Andrea Kimi Antonelli", "Mercedes"),
+    ("Charles Leclerc", "Ferrari"), ("Lewis Hamilton", "Ferrari"),
+    ("Alexander Albon", "Williams"), ("Carlos Sainz", "Williams"),
+    ("Isack Hadjar", "Racing Bulls"), ("Liam Lawson", "Racing Bulls"),
+    ("Fernando Alonso", "Aston Martin"), ("Lance Stroll", "Aston Martin"),
+    ("Nico Hulkenberg", "Kick Sauber"), ("Gabriel Bortoleto", "Kick Sauber"),
+    ("Esteban Ocon", "Haas"), ("Oliver Bearman", "Haas"),
+    ("Pierre Gasly", "Alpine"), ("Franco Colapinto", "Alpine"),
+]
+
+async def client(port, client_id, deadline, latencies, statuses):
+    """Post predictions over one keep-alive connection until the deadline"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    entries = [{"driver": driver, "constructor": team, "grid": i + 1} for i, (driver, team) in enumerate(GRID)]
+    i = 0
+    while time.monotonic() < deadline:
+        i += 1
+        body = json.dumps({"circuit": "Monaco Circuit", "weather": "Dry", "entries": entries,
+                           "seed": client_id * 1_000_000 + i}).encode()
+        started = time.perf_counter()
+        writer.write(b"POST /api/predict HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+                     + f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        status_line = await reader.readline()
+        length = 0
+        while (line := await reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        await reader.readexactly(length)
+        status = int(status_line.split()[1])
+        statuses[status] = statuses.get(status, 0) + 1
+        if status == 200:
+            latencies.append(time.perf_counter() - started)
+    writer.close()
+
+async def drive(port, concurrency, duration):
+    latencies, statuses = [], {}
+    deadline = time.monotonic() + duration
+    await asyncio.gather(*(client(port, k, deadline, latencies, statuses) for k in range(concurrency)))
+    return latencies, statuses
+
+def run(port, concurrency, duration, wait_ms, max_rows):
+    env = dict(os.environ, PREDICT_BATCH_WAIT_MS=str(wait_ms), PREDICT_BATCH_MAX_ROWS=str(max_rows),
+               INFERENCE_QUEUE_SIZE=str(max(32, concurrency * 2)))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_until_ready(port)
+        time.sleep(3)
+        latencies, statuses = asyncio.run(drive(port, concurrency, duration))
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/inference-stats", timeout=5) as response:
+            batching = json.loads(response.read())['batching']
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return latencies, statuses, batching
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", default="1,8,32,64")
+    parser.add_argument("--wait-ms", default="0,3", help="batch windows to compare; 0 disables batching")
+    parser.add_argument("--max-rows", type=int, default=512)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8792)
+    args = parser.parse_args()
+
+    print(f"🖥️  {os.cpu_count()} CPUs, {len(GRID)}-driver grids, {args.duration:.0f}s per run, max {args.max_rows} rows per batch")
+    print(f"   {'clients':>7s} {'wait':>6s} {'req/s':>8s} {'p50 ms':>8s} {'p99 ms':>8s} {'req/batch':>10s} {'rows/batch':>11s}")
+
+    for concurrency in [int(n) for n in args.concurrency.split(",")]:
+        for wait_ms in [float(ms) for ms in args.wait_ms.split(",")]:
+            latencies, statuses, batching = run(args.port, concurrency, args.duration, wait_ms, args.max_rows)
+            ordered = sorted(latencies)
+            errors = {status: count for status, count in statuses.items() if status != 200}
+            print(f"   {concurrency:7d} {wait_ms:4.1f}ms {len(latencies) / args.duration:8.1f} "
+                  f"{statistics.median(ordered) * 1e3:8.1f} {ordered[int(0.99 * (len(ordered) - 1))] * 1e3:8.1f} "
+                  f"{batching['mean_requests_per_batch']:10.2f} {batching['mean_rows_per_batch']:11.1f}"
+                  + (f"  errors {errors}" if errors else ""))
+
+if __name__ == "__main__":
+    main()
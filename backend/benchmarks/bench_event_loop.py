@@ -0,0 +1,127 @@
+"""Benchmark light-endpoint latency while heavy predictions keep the server busy
+
+Run from the backend directory (needs trained models):
+    python benchmarks/bench_event_loop.py --heavy-clients 8 --duration 10
+
+Starts one uvicorn worker, keeps `--heavy-clients` connections posting
+uncached /api/simulate requests and probes GET /api/teams on its own
+connection. With inference on the event loop every probe waits for the
+running simulation; with the inference pool it should stay flat. 503s are
+the pool shedding load once its queue is full.
+"""
+import argparse
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRIES = [
+    ("Max Verstappen", "Red Bull Racing"), ("Yuki Tsunoda", "Red Bull Racing"),
+    ("Lando Norris", "McLaren"), ("Oscar Piastri", "McLaren"),
+    ("Charles Leclerc", "Ferrari"), ("Lewis Hamilton", "Ferrari"),
+    ("George Russell", "Mercedes"), ("Andrea Kimi Antonelli", "Mercedes"),
+]
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def wait_until_ready(port, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/api/teams", timeout=1)
+            return
+        except OSError:
+            time.sleep(0.5)
+    raise RuntimeError(f"server on port {port} did not start")
+
+def heavy_client(port, client_id, n_simulations, stop, counts):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+    entries = [{"driver": driver, "constructor": team, "grid": i + 1} for i, (driver, team) in enumerate(ENTRIES)]
+    i = 0
+    while not stop.is_set():
+        i += 1
+        body = json.dumps({"circuit": "Monaco Circuit", "weather": "Dry", "entries": entries,
+                           "n_simulations": n_simulations, "seed": client_id * 1_000_000 + i})
+        connection.request("POST", "/api/simulate", body, {"Content-Type": "application/json"})
+        response = connection.getresponse()
+        response.read()
+        counts[response.status] = counts.get(response.status, 0) + 1
+        if response.status == 503:
+            # Honour Retry-After loosely so rejected clients don't spin
+            time.sleep(min(1.0, float(response.getheader("Retry-After", 1))))
+    connection.close()
+
+def probe(port, stop, interval, latencies):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+    while not stop.is_set():
+        started = time.perf_counter()
+        connection.request("GET", "/api/teams")
+        connection.getresponse().read()
+        latencies.append(time.perf_counter() - started)
+        time.sleep(interval)
+    connection.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--heavy-clients", type=int, default=8)
+    parser.add_argument("--n-simulations", type=int, default=20000)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--probe-interval", type=float, default=0.02)
+    parser.add_argument("--port", type=int, default=8791)
+    args = parser.parse_args()
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--port", str(args.port), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_until_ready(args.port)
+        time.sleep(3)
+
+        idle = []
+        stop = threading.Event()
+        prober = threading.Thread(target=probe, args=(args.port, stop, args.probe_interval, idle))
+        prober.start()
+        time.sleep(2)
+        stop.set()
+        prober.join()
+
+        stop = threading.Event()
+        loaded, counts = [], {}
+        threads = [threading.Thread(target=heavy_client, args=(args.port, k, args.n_simulations, stop, counts))
+                   for k in range(args.heavy_clients)]
+        threads.append(threading.Thread(target=probe, args=(args.port, stop, args.probe_interval, loaded)))
+        for thread in threads:
+            thread.start()
+        time.sleep(args.duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{args.port}/api/inference-stats", timeout=5) as response:
+                inference_stats = json.loads(response.read())
+        except OSError as e:
+            inference_stats = f"unavailable ({e})"
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    print(f"🖥️  {os.cpu_count()} CPUs, {args.heavy_clients} heavy clients x {args.n_simulations} simulations, {args.duration:.0f}s")
+    for name, latencies in (("idle", idle), ("under load", loaded)):
+        print(f"   /api/teams {name:10s} p50 {statistics.median(latencies) * 1e3:7.1f}ms  "
+              f"p99 {percentile(latencies, 0.99) * 1e3:7.1f}ms  max {max(latencies) * 1e3:7.1f}ms  ({len(latencies)} probes)")
+    print(f"   /api/simulate responses: {dict(sorted(counts.items()))}")
+    print(f"   inference pool: {inference_stats}")
+
+if __name__ == "__main__":
+    main()
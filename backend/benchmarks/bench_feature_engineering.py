@@ -0,0 +1,132 @@
+"""Benchmark the vectorized feature engineering against the original row-wise code
+
+Run from the backend directory:
+    python benchmarks/bench_feature_engineering.py --scale 10
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reference_data import TEMPERATURE_RANGES, DRIVER_EXPERIENCE
+from rng import make_rng, choice, randint
+from train_enhanced_model import (
+    STREET_CIRCUITS, TIRE_STRATEGY_OPTIONS,
+    enhance_weather_features, enhance_tire_strategy, add_driver_performance_features
+)
+
+# Original row-wise implementations, kept here as the baseline
+
+def legacy_weather_features(df, rng):
+    def get_temperature(circuit):
+        temp_range = TEMPERATURE_RANGES.get(circuit)
+        return randint(rng, *temp_range) if temp_range else randint(rng, 15, 25)
+
+    df['temperature'] = df['circuit'].apply(get_temperature)
+    return df
+
+def legacy_tire_strategy(df, rng):
+    def get_strategy(weather, circuit):
+        if weather == "Wet":
+            return choice(rng, TIRE_STRATEGY_OPTIONS[0])
+        elif weather == "Mixed":
+            return choice(rng, TIRE_STRATEGY_OPTIONS[1])
+        elif circuit in STREET_CIRCUITS:
+            return choice(rng, TIRE_STRATEGY_OPTIONS[2])
+        return choice(rng, TIRE_STRATEGY_OPTIONS[3])
+
+    df['tire_strategy'] = df.apply(lambda row: get_strategy(row['weather'], row['circuit']), axis=1)
+    return df
+
+def legacy_driver_features(df, rng):
+    driver_experience = dict(DRIVER_EXPERIENCE)
+    for driver in df['driver'].unique():
+        if driver not in driver_experience:
+            driver_seasons = df[df['driver'] == driver]['season'].unique()
+            driver_experience[driver] = max(1, len(driver_seasons))
+    df['driver_experience'] = df['driver'].map(driver_experience)
+
+    def calculate_recent_form(group):
+        return group.sort_values('date').tail(5)['position'].mean()
+
+    recent_form = df.groupby('driver').apply(calculate_recent_form)
+    df['recent_form'] = df['driver'].map(recent_form).fillna(15.0)
+    return df
+
+def load_csv(path):
+    df = pd.read_csv(path)
+    df['season'] = pd.to_numeric(df['season'], errors='coerce')
+    df['position'] = pd.to_numeric(df['position'], errors='coerce')
+    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    df = df.dropna(subset=['season', 'position', 'date', 'driver', 'circuit'])
+    return df.sort_values(['date', 'round', 'position']).reset_index(drop=True)
+
+def expand(df, scale):
+    """Replicate the dataset scale times; each copy gets its own drivers so the driver count grows too"""
+    copies = []
+    for k in range(scale):
+        copy = df.copy()
+        if k:
+            copy['driver'] = copy['driver'] + f" #{k}"
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+def timed(fn, df, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        frame = df.copy()
+        start = time.perf_counter()
+        result = fn(frame, make_rng(0))
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default="data/f1_multi_year_results.csv")
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = expand(load_csv(args.data), args.scale)
+    print(f"📊 {len(df)} rows, {df['driver'].nunique()} drivers ({args.scale}x)")
+
+    no_strategy = df.drop(columns=['tire_strategy'])
+    stages = [
+        ('weather features', legacy_weather_features, enhance_weather_features, df),
+        ('tire strategy', legacy_tire_strategy, enhance_tire_strategy, no_strategy),
+        ('driver performance', legacy_driver_features, add_driver_performance_features, df),
+    ]
+
+    for name, legacy, vectorized, frame in stages:
+        legacy_time, legacy_df = timed(legacy, frame, args.repeat)
+        new_time, new_df = timed(vectorized, frame, args.repeat)
+        print(f"   • {name:20s} row-wise {legacy_time:8.3f}s  vectorized {new_time:8.4f}s  ({legacy_time / new_time:6.1f}x)")
+
+        if name == 'driver performance':
+            # Experience must match exactly; recent form is now point-in-time rather than the
+            # whole-history value the row-wise code broadcast, so it is not compared
+            assert np.array_equal(legacy_df['driver_experience'].to_numpy(), new_df['driver_experience'].to_numpy())
+        elif name == 'weather features':
+            # Random draws differ, but every temperature must lie in its circuit's range
+            bounds = new_df['circuit'].map(lambda c: TEMPERATURE_RANGES.get(c, (15, 25)))
+            low, high = np.array(bounds.tolist()).T
+            assert ((new_df['temperature'] >= low) & (new_df['temperature'] <= high)).all()
+        else:
+            # Every strategy must come from its row's condition
+            condition = np.select(
+                [new_df['weather'] == 'Wet', new_df['weather'] == 'Mixed', new_df['circuit'].isin(STREET_CIRCUITS)],
+                [0, 1, 2],
+                default=3
+            )
+            assert all(s in TIRE_STRATEGY_OPTIONS[c] for s, c in zip(new_df['tire_strategy'], condition))
+
+    print("✅ Vectorized features agree with the row-wise baseline")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark the model backends: accuracy, fit time, predict latency and model size
+
+Run from the backend directory:
+    python benchmarks/bench_model_backends.py --backends forest,hist,ordinal --scale 1,10
+
+Every backend is trained one fit at a time on the training matrix and split
+(--scale 10 repeats the rows with jittered numerical features). Latency is
+the median of --repeats calls on a 20-driver grid: "position" is the one
+call /api/predict makes, "all" answers position, podium, points and winner.
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+from model_backends import OUTCOME_POSITIONS, backend_jobs, select_models
+from train_enhanced_model import prepare_training_data
+from training_jobs import run_training_jobs, split_indices
+
+def synthetic(data, scale, rng):
+    """Rows resampled `scale` times over, numerical features jittered by 0.1 standard deviations"""
+    if scale == 1:
+        return data.X, data.targets
+    rows = rng.integers(len(data.X), size=len(data.X) * scale)
+    X = data.X[rows]
+    scaled = [data.schema.positions[name] for name in data.schema.scaled]
+    X[:, scaled] += rng.normal(0, 0.1, size=(len(X), len(scaled)))
+    return X, {name: values[rows] for name, values in data.targets.items()}
+
+def median_latency(fn, repeats):
+    fn()
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+def predict_all(models, X):
+    """What answering every target costs: one call for a distribution model, one per model otherwise"""
+    position = models['position']
+    if hasattr(position, 'predict_targets'):
+        return position.predict_targets(X)
+    return position.predict(X), {slot: models[slot].predict_proba(X)[:, 1] for slot in OUTCOME_POSITIONS if models[slot] is not None}
+
+def outcome_accuracy(models, X, positions):
+    position = models['position']
+    if hasattr(position, 'outcome_scores'):
+        return position.outcome_scores(X, positions)
+    return {
+        f"{slot}_accuracy": float(np.mean(models[slot].predict(X) == (positions <= last)))
+        for slot, last in OUTCOME_POSITIONS.items() if models[slot] is not None
+    }
+
+def model_size(models):
+    with tempfile.TemporaryDirectory() as folder:
+        size = 0
+        for name, model in models.items():
+            if model is not None:
+                path = os.path.join(folder, f"{name}.joblib")
+                joblib.dump(model, path)
+                size += os.path.getsize(path)
+    return size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", default="forest,hist,ordinal")
+    parser.add_argument("--scale", default="1,10", help="dataset sizes to compare, as multiples of the real data")
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        data = prepare_training_data(np.random.default_rng(args.seed))
+    features = list(data.schema.features)
+    grid = data.X[-20:]
+
+    print(f"🖥️  {os.cpu_count()} CPUs, {len(data.X)} rows x {len(features)} features, latency on a {len(grid)}-driver grid")
+    print(f"   {'backend':8s} {'rows':>7s} {'fit s':>7s} {'RMSE':>6s} {'MAE':>6s} {'podium':>7s} {'points':>7s} "
+          f"{'winner':>7s} {'pos ms':>7s} {'all ms':>7s} {'size MB':>8s}")
+
+    for scale in [int(n) for n in args.scale.split(",")]:
+        X, targets = synthetic(data, scale, np.random.default_rng(args.seed))
+        _, test_idx = split_indices(len(X))
+        for name in args.backends.split(","):
+            backend, jobs = backend_jobs(name)
+            results, fit_time = run_training_jobs(jobs, X, targets, features, workers=1)
+            models = select_models(jobs, results)
+            position = next(results[job.name] for job in jobs if results[job.name].model is models['position'])
+            accuracy = outcome_accuracy(models, X[test_idx], targets['position'][test_idx])
+            position_latency = median_latency(lambda: models['position'].predict(grid), args.repeats)
+            all_latency = median_latency(lambda: predict_all(models, grid), args.repeats)
+
+            print(f"   {backend:8s} {len(X):7d} {fit_time:7.1f} {position.metrics['rmse']:6.3f} {position.metrics['mae']:6.3f} "
+                  + " ".join(f"{accuracy.get(f'{slot}_accuracy', float('nan')):7.3f}" for slot in ('podium', 'points', 'winner'))
+                  + f" {position_latency * 1e3:7.1f} {all_latency * 1e3:7.1f} {model_size(models) / 1e6:8.1f}")
+
+if __name__ == "__main__":
+    main()
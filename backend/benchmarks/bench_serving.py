@@ -0,0 +1,147 @@
+"""Benchmark memory per worker and throughput of the preforked server against independent workers
+
+Run from the backend directory (Linux, needs trained models):
+    python benchmarks/bench_serving.py --workers 1,2,4 --duration 10
+
+"prefork" is serve.py (models loaded once, then forked); "independent" is
+`uvicorn app:app --workers N`, where every worker imports the app and loads
+its own models. Memory is read from /proc/<pid>/smaps_rollup: RSS counts
+shared pages in every process, private is what each worker adds on its own,
+and the total PSS of the process tree is the memory the server really uses.
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRIES = [
+    ("Max Verstappen", "Red Bull Racing"), ("Yuki Tsunoda", "Red Bull Racing"),
+    ("Lando Norris", "McLaren"), ("Oscar Piastri", "McLaren"),
+    ("Charles Leclerc", "Ferrari"), ("Lewis Hamilton", "Ferrari"),
+    ("George Russell", "Mercedes"), ("Andrea Kimi Antonelli", "Mercedes"),
+    ("Fernando Alonso", "Aston Martin"), ("Lance Stroll", "Aston Martin"),
+]
+
+def server_command(mode, workers, port):
+    if mode == "prefork":
+        return [sys.executable, "serve.py", "--workers", str(workers), "--port", str(port),
+                "--host", "127.0.0.1", "--log-level", "warning", "--no-access-log"]
+    return [sys.executable, "-m", "uvicorn", "app:app", "--workers", str(workers), "--port", str(port),
+            "--host", "127.0.0.1", "--log-level", "warning", "--no-access-log"]
+
+def descendants(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            children = [int(child) for child in f.read().split()]
+    except FileNotFoundError:
+        return []
+    return children + [grandchild for child in children for grandchild in descendants(child)]
+
+def memory(pid):
+    """RSS, PSS and private (unshared) memory of a process in MB"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("Rss", "Pss", "Private_Clean", "Private_Dirty"):
+                values[key] = int(value.split()[0]) / 1024
+    return {'rss': values['Rss'], 'pss': values['Pss'], 'private': values['Private_Clean'] + values['Private_Dirty']}
+
+def wait_until_ready(port, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/api/teams", timeout=1)
+            return
+        except OSError:
+            time.sleep(0.5)
+    raise RuntimeError(f"server on port {port} did not start")
+
+def client(args):
+    """Post uncached predictions over one keep-alive connection until the deadline"""
+    port, client_id, deadline = args
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    entries = [{"driver": driver, "constructor": team, "grid": i + 1} for i, (driver, team) in enumerate(ENTRIES)]
+    latencies, errors, i = [], 0, 0
+
+    while time.time() < deadline:
+        i += 1
+        body = json.dumps({"circuit": "Monaco Circuit", "weather": "Dry", "entries": entries,
+                           "seed": client_id * 1_000_000 + i})
+        started = time.perf_counter()
+        connection.request("POST", "/api/predict", body, {"Content-Type": "application/json"})
+        response = connection.getresponse()
+        response.read()
+        if response.status == 200:
+            latencies.append(time.perf_counter() - started)
+        else:
+            errors += 1
+
+    connection.close()
+    return latencies, errors
+
+def run(mode, workers, port, duration, clients_per_worker):
+    server = subprocess.Popen(server_command(mode, workers, port), cwd=BACKEND_DIR,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_ready(port)
+        # Let background warm-up finish so every worker holds all four models
+        time.sleep(3)
+
+        n_clients = workers * clients_per_worker
+        deadline = time.time() + duration
+        with multiprocessing.Pool(n_clients) as pool:
+            results = pool.map(client, [(port, k, deadline) for k in range(n_clients)])
+
+        usage = {pid: memory(pid) for pid in [server.pid] + descendants(server.pid)}
+        # The root process only supervises (unless uvicorn runs a single worker in-process); of its
+        # children, which include multiprocessing helpers under uvicorn, the workers are the largest
+        children = [m for pid, m in usage.items() if pid != server.pid] or list(usage.values())
+        worker_usage = sorted(children, key=lambda m: m['rss'], reverse=True)[:workers]
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    latencies = [latency for worker_latencies, _ in results for latency in worker_latencies]
+    return {
+        'requests_per_second': len(latencies) / duration,
+        'p50_ms': statistics.median(latencies) * 1e3 if latencies else float('nan'),
+        'errors': sum(errors for _, errors in results),
+        'rss_per_worker': statistics.mean(m['rss'] for m in worker_usage),
+        'private_per_worker': statistics.mean(m['private'] for m in worker_usage),
+        'total_pss': sum(m['pss'] for m in usage.values()),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", default=",".join(str(n) for n in (1, 2, 4, 8) if n <= (os.cpu_count() or 1)) or "1")
+    parser.add_argument("--modes", default="prefork,independent")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--clients-per-worker", type=int, default=2)
+    parser.add_argument("--port", type=int, default=8790)
+    args = parser.parse_args()
+
+    print(f"🖥️  {os.cpu_count()} CPUs, {args.duration:.0f}s per run, {args.clients_per_worker} clients per worker")
+    print(f"   {'mode':12s} {'workers':>7s} {'req/s':>8s} {'speedup':>8s} {'p50 ms':>7s} "
+          f"{'RSS/worker':>11s} {'private/worker':>15s} {'total PSS':>10s}")
+
+    for mode in args.modes.split(","):
+        baseline = None
+        for workers in [int(n) for n in args.workers.split(",")]:
+            result = run(mode, workers, args.port, args.duration, args.clients_per_worker)
+            baseline = baseline or result['requests_per_second']
+            print(f"   {mode:12s} {workers:7d} {result['requests_per_second']:8.1f} "
+                  f"{result['requests_per_second'] / baseline:7.2f}x {result['p50_ms']:7.1f} "
+                  f"{result['rss_per_worker']:9.0f}MB {result['private_per_worker']:13.0f}MB {result['total_pss']:8.0f}MB"
+                  + (f"  ({result['errors']} errors)" if result['errors'] else ""))
+
+if __name__ == "__main__":
+    main()
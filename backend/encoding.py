@@ -0,0 +1,70 @@
+import numpy as np
+
+UNKNOWN_POLICIES = ('default', 'error')
+
+class CategoryIndex:
+    """Precomputed value -> code lookup built once from a fitted LabelEncoder's classes_
+
+    A code is a value's position in classes. New values are only ever appended
+    (see extend), so the codes saved models were trained on keep their meaning;
+    unlike a LabelEncoder's classes_, classes is not necessarily sorted.
+    """
+
+    def __init__(self, classes, unknown='default', default_code=0):
+        if unknown not in UNKNOWN_POLICIES:
+            raise ValueError(f"Unknown category policy '{unknown}', expected one of {UNKNOWN_POLICIES}")
+
+        self.classes = tuple(str(value) for value in classes)
+        self.codes = {value: code for code, value in enumerate(self.classes)}
+        self.unknown = unknown
+        self.default_code = default_code
+
+    def __len__(self):
+        return len(self.classes)
+
+    def __contains__(self, value):
+        return value in self.codes
+
+    def extend(self, values):
+        """Append unseen values after the existing classes (sorted among themselves); returns how many were added"""
+        new = sorted({str(value) for value in values} - set(self.codes))
+        self.codes.update((value, code) for code, value in enumerate(new, start=len(self.classes)))
+        self.classes += tuple(new)
+        return len(new)
+
+    def encode(self, value):
+        """Encode a single value in O(1)"""
+        code = self.codes.get(value)
+        if code is None:
+            if self.unknown == 'error':
+                raise KeyError(f"Unknown category: {value!r}")
+            return self.default_code
+        return code
+
+    def encode_column(self, values):
+        """Encode a whole column of values into an int64 array"""
+        if self.unknown == 'error':
+            return np.fromiter((self.encode(value) for value in values), dtype=np.int64)
+
+        get = self.codes.get
+        default = self.default_code
+        return np.fromiter((get(value, default) for value in values), dtype=np.int64)
+
+def build_encoding_index(label_encoders, unknown='default', default_code=0, categories=None):
+    """Build a CategoryIndex for every fitted label encoder
+
+    categories maps columns to the classes a bundle saved after extending
+    them; those take the place of the encoder's classes_.
+    """
+    if not label_encoders:
+        return {}
+
+    categories = categories or {}
+    return {
+        col: CategoryIndex(categories.get(col, encoder.classes_), unknown=unknown, default_code=default_code)
+        for col, encoder in label_encoders.items()
+    }
+
+def index_categories(encoding_index):
+    """The classes of every CategoryIndex, in code order, as saved in a bundle"""
+    return {col: list(index.classes) for col, index in encoding_index.items()}
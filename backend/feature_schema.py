@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+FEATURE_SCHEMA_FILE = "models/feature_schema.json"
+FEATURE_SCHEMA_VERSION = 1
+
+ENCODED_SUFFIX = '_encoded'
+
+# Model inputs in column order; '<column>_encoded' features are label-encoded from <column>
+ENHANCED_FEATURES = [
+    'grid', 'constructor_encoded', 'circuit_encoded', 'driver_encoded',
+    'weather_encoded', 'tire_strategy_encoded', 'temperature', 'humidity',
+    'wind_speed', 'track_temp', 'driver_experience', 'recent_form',
+    'quali_gap_to_teammate', 'constructor_standing', 'budget_efficiency',
+    'circuit_type_encoded', 'drs_zones', 'lap_length', 'safety_car_laps',
+    'avg_pit_time', 'constructor_form'
+]
+
+# Numerical features passed through the StandardScaler, in the scaler's column order
+SCALED_FEATURES = [
+    'temperature', 'humidity', 'wind_speed', 'track_temp',
+    'driver_experience', 'recent_form', 'quali_gap_to_teammate',
+    'budget_efficiency', 'lap_length', 'avg_pit_time', 'constructor_form'
+]
+
+# Categorical inputs whose unknown values are rejected instead of encoded as the default code
+STRICT_CATEGORIES = ['weather']
+
+class FeatureSchemaError(ValueError):
+    """Models, encoders or input rows don't match the feature schema"""
+
+class FeatureSchema:
+    """Ordered model inputs, compiled once into the column positions used to assemble matrices
+
+    The same schema is saved next to the models at train time and loaded by the
+    API, so training and serving build identical feature vectors.
+    """
+
+    def __init__(self, features=ENHANCED_FEATURES, scaled=SCALED_FEATURES, strict=STRICT_CATEGORIES):
+        self.features = tuple(features)
+        self.scaled = tuple(scaled)
+        self.strict = tuple(strict)
+
+        self.positions = {name: i for i, name in enumerate(self.features)}
+        if len(self.positions) != len(self.features):
+            raise FeatureSchemaError("Duplicate features in schema")
+        unknown_scaled = [name for name in self.scaled if name not in self.positions]
+        if unknown_scaled:
+            raise FeatureSchemaError(f"Scaled features not in schema: {unknown_scaled}")
+
+        # (position, source column) for encoded features and (position, column) for raw ones
+        self.categorical = tuple(
+            (i, name[:-len(ENCODED_SUFFIX)]) for i, name in enumerate(self.features) if name.endswith(ENCODED_SUFFIX)
+        )
+        self.numerical = tuple(
+            (i, name) for i, name in enumerate(self.features) if not name.endswith(ENCODED_SUFFIX)
+        )
+        self.scaled_positions = np.array([self.positions[name] for name in self.scaled], dtype=np.intp)
+
+        self.categorical_columns = tuple(source for _, source in self.categorical)
+        self.inputs = self.categorical_columns + tuple(name for _, name in self.numerical)
+        self.fingerprint = hashlib.sha1(
+            json.dumps(self.to_dict(), sort_keys=True).encode('utf-8')
+        ).hexdigest()[:12]
+
+    def __len__(self):
+        return len(self.features)
+
+    def to_dict(self):
+        return {
+            'version': FEATURE_SCHEMA_VERSION,
+            'features': list(self.features),
+            'scaled': list(self.scaled),
+            'strict': list(self.strict),
+        }
+
+    def save(self, path=FEATURE_SCHEMA_FILE):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('version') != FEATURE_SCHEMA_VERSION:
+            raise FeatureSchemaError(f"Unsupported feature schema version: {data.get('version')}")
+        return cls(data['features'], data['scaled'], data.get('strict', []))
+
+    @classmethod
+    def load(cls, path=FEATURE_SCHEMA_FILE):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def frame(self, df):
+        """Training matrix: the schema's columns of an encoded DataFrame, in order"""
+        missing = [name for name in self.features if name not in df.columns]
+        if missing:
+            raise FeatureSchemaError(f"Training data is missing schema features: {missing}")
+        return df[list(self.features)]
+
+    def check_rows(self, rows, encoding_index):
+        """Reject serving rows that lack schema inputs or carry unknown strict categories"""
+        if not rows:
+            return
+        missing = [name for name in self.inputs if name not in rows[0]]
+        if missing:
+            raise FeatureSchemaError(f"Rows are missing schema features: {missing}")
+
+        for column in self.strict:
+            category_index = encoding_index.get(column)
+            if category_index is None:
+                continue
+            unknown = sorted({row[column] for row in rows if row[column] not in category_index})
+            if unknown:
+                raise FeatureSchemaError(
+                    f"Unknown {column} {unknown}, expected one of {list(category_index.classes)}"
+                )
+
+    @classmethod
+    def from_feature_names(cls, feature_names):
+        """Schema for models saved before feature_schema.json existed"""
+        return cls(feature_names, [name for name in SCALED_FEATURES if name in feature_names])
+
+    def validate(self, models, scaler=None, label_encoders=None, feature_names=None):
+        """Check that loaded models, scaler and encoders were trained with this schema"""
+        errors = []
+
+        for name, model in (models or {}).items():
+            n_features = getattr(model, 'n_features_in_', None)
+            if model is not None and n_features is not None and n_features != len(self):
+                errors.append(f"{name} model expects {n_features} features, schema has {len(self)}")
+            model_names = getattr(model, 'feature_names_in_', None)
+            if model_names is not None and len(model_names) == len(self) and tuple(model_names) != self.features:
+                errors.append(f"{name} model was trained with a different feature order")
+
+        if scaler is not None:
+            n_scaled = getattr(scaler, 'n_features_in_', None)
+            if n_scaled is not None and n_scaled != len(self.scaled):
+                errors.append(f"scaler expects {n_scaled} features, schema scales {len(self.scaled)}")
+            scaler_names = getattr(scaler, 'feature_names_in_', None)
+            if scaler_names is not None and tuple(scaler_names) != self.scaled:
+                errors.append(f"scaler was fit on {list(scaler_names)}, schema scales {list(self.scaled)}")
+
+        if label_encoders is not None:
+            missing = [column for column in self.categorical_columns if column not in label_encoders]
+            if missing:
+                errors.append(f"no label encoder for {missing}")
+
+        if feature_names is not None and tuple(feature_names) != self.features:
+            errors.append("feature_names.pkl doesn't match the schema feature order")
+
+        if errors:
+            raise FeatureSchemaError("; ".join(errors))
@@ -0,0 +1,131 @@
+import json
+import os
+
+import numpy as np
+
+FEATURE_STORE_DIR = "models/feature_store"
+FEATURE_STORE_VERSION = 1
+
+# Per-entity features materialized at train time, by entity kind
+ENTITY_FEATURES = {
+    'driver': ['driver_experience', 'recent_form'],
+    'constructor': ['constructor_standing', 'budget_efficiency', 'constructor_form'],
+    'circuit': ['drs_zones', 'lap_length'],
+}
+
+# Form column of each entity kind that tracks FormState
+FORM_FEATURES = {'driver': 'recent_form', 'constructor': 'constructor_form'}
+
+# Columns simulated per row for unknown entities are averaged rather than taken from the last race
+MEAN_FEATURES = {'budget_efficiency', 'lap_length'}
+
+class FeatureStore:
+    """Read-only per-entity feature tables with an integer row index per name
+
+    Each entity kind is a (n_entities x n_features) float64 array, memory-mapped
+    when loaded from disk, plus a name -> row dictionary built once.
+    """
+
+    def __init__(self, tables, columns, names):
+        self._tables = tables
+        self.columns = {kind: tuple(cols) for kind, cols in columns.items()}
+        self.names = {kind: tuple(kind_names) for kind, kind_names in names.items()}
+        self._index = {kind: {name: i for i, name in enumerate(kind_names)} for kind, kind_names in names.items()}
+
+    def index(self, kind, name):
+        """Row of an entity, or -1 if it is not in the store"""
+        return self._index.get(kind, {}).get(name, -1)
+
+    def row(self, kind, name):
+        """Feature values of one entity as a dict, or None if it is not in the store"""
+        i = self.index(kind, name)
+        if i < 0:
+            return None
+        return dict(zip(self.columns[kind], self._tables[kind][i].tolist()))
+
+    def rows(self, kind, names, default=np.nan):
+        """(len(names) x n_features) block for several entities; unknown names get default"""
+        indices = np.fromiter((self.index(kind, name) for name in names), dtype=np.int64, count=len(names))
+        block = np.full((len(names), len(self.columns[kind])), default, dtype=np.float64)
+        known = indices >= 0
+        block[known] = self._tables[kind][indices[known]]
+        return block
+
+    def stats(self):
+        return {
+            kind: {'entities': len(self.names[kind]), 'features': list(self.columns[kind])}
+            for kind in self._tables
+        }
+
+    def save(self, path=FEATURE_STORE_DIR):
+        """Write one .npy table per entity kind plus a JSON index
+
+        Every file is written next to its final name and swapped in with
+        os.replace, so a process that has the old tables memory-mapped keeps
+        reading the old files instead of seeing them rewritten under it.
+        """
+        os.makedirs(path, exist_ok=True)
+        for kind, table in self._tables.items():
+            tmp_path = os.path.join(path, f"{kind}.npy.tmp")
+            with open(tmp_path, "wb") as f:
+                np.save(f, np.ascontiguousarray(table, dtype=np.float64))
+            os.replace(tmp_path, os.path.join(path, f"{kind}.npy"))
+
+        index = {
+            'version': FEATURE_STORE_VERSION,
+            'kinds': {
+                kind: {'columns': list(self.columns[kind]), 'names': list(self.names[kind])}
+                for kind in self._tables
+            }
+        }
+        tmp_path = os.path.join(path, "index.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp_path, os.path.join(path, "index.json"))
+
+    @classmethod
+    def load(cls, path=FEATURE_STORE_DIR, mmap_mode='r'):
+        with open(os.path.join(path, "index.json"), encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get('version') != FEATURE_STORE_VERSION:
+            raise ValueError(f"Unsupported feature store version: {index.get('version')}")
+
+        tables, columns, names = {}, {}, {}
+        for kind, meta in index['kinds'].items():
+            tables[kind] = np.load(os.path.join(path, f"{kind}.npy"), mmap_mode=mmap_mode)
+            columns[kind] = meta['columns']
+            names[kind] = meta['names']
+        return cls(tables, columns, names)
+
+def materialize_features(df, form_state=None, entity_features=ENTITY_FEATURES):
+    """Build a FeatureStore of each entity's latest feature values from an enhanced training frame
+
+    Form columns in the frame only cover races before each row, so when a
+    FormState is given its post-last-race form is used instead.
+    """
+    ordered = df.sort_values('date', kind='stable')
+    tables, columns, names = {}, {}, {}
+
+    for kind, features in entity_features.items():
+        features = [feature for feature in features if feature in ordered.columns]
+        grouped = ordered.groupby(kind, sort=True, observed=True)[features]
+        latest = grouped.last()
+        averaged = [feature for feature in features if feature in MEAN_FEATURES]
+        if averaged:
+            latest[averaged] = grouped.mean()[averaged]
+
+        form_column = FORM_FEATURES.get(kind)
+        if form_state is not None and form_column in latest.columns:
+            latest[form_column] = [form_state.form(kind, name, value) for name, value in latest[form_column].items()]
+
+        tables[kind] = latest.to_numpy(dtype=np.float64)
+        columns[kind] = features
+        names[kind] = [str(name) for name in latest.index]
+
+    return FeatureStore(tables, columns, names)
+
+def materialize_feature_store(df, path=FEATURE_STORE_DIR, form_state=None):
+    """Materialize per-entity features and write them to disk"""
+    store = materialize_features(df, form_state)
+    store.save(path)
+    return store
@@ -1,7 +1,15 @@
 import pandas as pd
 import requests
 import os
-import random
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from rng import make_rng, choice, randint
+from storage import RESULTS_DATASET, append_results, columnar_available, write_results
 
 def simulate_weather(circuit_name):
     if any(word in circuit_name.lower() for word in ["spa", "suzuka", "interlagos", "silverstone"]):
@@ -11,45 +19,185 @@ def simulate_weather(circuit_name):
     else:
         return "Dry"
 
-def simulate_tire_strategy(weather):
+def simulate_tire_strategy(weather, rng=None):
+    rng = make_rng(rng)
     if weather == "Wet":
         return "Intermediate → Wet"
     elif weather == "Mixed":
-        return random.choice(["Soft → Medium", "Medium → Hard"])
+        return choice(rng, ["Soft → Medium", "Medium → Hard"])
     else:
-        return random.choice(["Soft → Medium", "Medium → Hard", "Soft → Hard"])
+        return choice(rng, ["Soft → Medium", "Medium → Hard", "Soft → Hard"])
 
-def simulate_fastest_lap():
+def simulate_fastest_lap(rng=None):
+    rng = make_rng(rng)
     minutes = 1
-    seconds = random.randint(25, 40)
-    milliseconds = random.randint(0, 999)
+    seconds = randint(rng, 25, 40)
+    milliseconds = randint(rng, 0, 999)
     return f"{minutes}:{seconds:02d}.{milliseconds:03d}"
 
-def simulate_gap(position):
+def simulate_gap(position, rng=None):
+    rng = make_rng(rng)
     if position == 1:
         return "+0.000s"
     elif position <= 10:
-        return f"+{round(position * random.uniform(1.0, 3.0), 3)}s"
+        return f"+{round(position * rng.uniform(1.0, 3.0), 3)}s"
     else:
-        return "DNF" if random.random() < 0.1 else f"+{round(position * random.uniform(2.5, 6.5), 3)}s"
+        return "DNF" if rng.random() < 0.1 else f"+{round(position * rng.uniform(2.5, 6.5), 3)}s"
+
+ERGAST_BASE_URL = os.environ.get("ERGAST_BASE_URL", "http://ergast.com/api/f1")
+ERGAST_CACHE_DIR = "data/cache/ergast"
+ERGAST_PAGE_SIZE = 1000
+
+def make_session(pool_size=8, retries=3, backoff=0.5):
+    """Pooled HTTP session with retries on connection errors and 429/5xx responses"""
+    session = requests.Session()
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"]
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def season_cache_path(cache_dir, year):
+    return os.path.join(cache_dir, f"{year}.json")
+
+def load_season_cache(cache_dir, year):
+    """Cached races and validators for a season, or None"""
+    path = season_cache_path(cache_dir, year)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_season_cache(cache_dir, year, entry):
+    """Write a season's cache entry atomically"""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = season_cache_path(cache_dir, year)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, path)
+
+def merge_race_pages(pages):
+    """Join result pages; a race split across two pages has its Results concatenated"""
+    races = {}
+    for page in pages:
+        for race in page:
+            key = (race['season'], race['round'])
+            if key in races:
+                races[key]['Results'].extend(race.get('Results', []))
+            else:
+                races[key] = dict(race, Results=list(race.get('Results', [])))
+    return sorted(races.values(), key=lambda race: int(race['round']))
+
+def fetch_season(session, year, cache_dir=ERGAST_CACHE_DIR, timeout=30, page_size=ERGAST_PAGE_SIZE,
+                 base_url=None):
+    """Fetch one season, revalidating the on-disk copy with ETag/Last-Modified
+
+    Returns (races, changed) where changed is False when the cache was still valid.
+    """
+    base_url = base_url or ERGAST_BASE_URL
+    url = f"{base_url}/{year}/results.json"
+    cached = load_season_cache(cache_dir, year)
+
+    headers = {}
+    if cached and cached.get('complete'):
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+
+    response = session.get(url, params={'limit': page_size, 'offset': 0}, headers=headers, timeout=timeout)
+    if response.status_code == 304 and cached:
+        return cached['races'], False
+    response.raise_for_status()
+
+    first = response.json()['MRData']
+    pages = [first['RaceTable']['Races']]
+    total = int(first.get('total', 0))
+
+    # Ergast paginates over result rows, not races
+    for offset in range(page_size, total, page_size):
+        page = session.get(url, params={'limit': page_size, 'offset': offset}, timeout=timeout)
+        page.raise_for_status()
+        pages.append(page.json()['MRData']['RaceTable']['Races'])
+
+    races = merge_race_pages(pages)
+    save_season_cache(cache_dir, year, {
+        'season': year,
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'total': total,
+        'complete': True,
+        'fetched_at': datetime.now().isoformat(),
+        'races': races
+    })
+    return races, True
+
+def get_multiple_seasons_results(start=1950, end=2024, cache_dir=ERGAST_CACHE_DIR, max_workers=8,
+                                 refresh=False, timeout=30, base_url=None):
+    """Fetch several seasons concurrently, resuming from the per-season cache
+
+    Completed past seasons are read straight from the cache unless refresh is set,
+    in which case every season is revalidated and only changed ones are downloaded.
+    Seasons that fail are reported after the others have been saved, so a rerun
+    only retries what is missing.
+    """
+    current_year = datetime.now().year
+    results = {}
+    to_fetch = []
 
-def get_multiple_seasons_results(start=1950, end=2024):
-    all_races = []
     for year in range(start, end + 1):
-        print(f"📥 Fetching {year}...")
-        url = f"http://ergast.com/api/f1/{year}/results.json?limit=1000"
-        response = requests.get(url)
-        races = response.json()['MRData']['RaceTable']['Races']
-        all_races.extend(races)
+        cached = load_season_cache(cache_dir, year)
+        if cached and cached.get('complete') and not refresh and year < current_year:
+            results[year] = cached['races']
+        else:
+            to_fetch.append(year)
+
+    if results:
+        print(f"♻️ Resuming: {len(results)} seasons loaded from cache")
+
+    failures = {}
+    if to_fetch:
+        session = make_session(pool_size=max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(fetch_season, session, year, cache_dir, timeout, ERGAST_PAGE_SIZE, base_url): year
+                for year in to_fetch
+            }
+            for future in as_completed(futures):
+                year = futures[future]
+                try:
+                    races, changed = future.result()
+                    results[year] = races
+                    print(f"📥 {year}: {'fetched' if changed else 'unchanged'} ({len(races)} races)")
+                except Exception as e:
+                    failures[year] = e
+                    print(f"❌ {year}: {e}")
+
+    if failures:
+        raise RuntimeError(f"Failed to fetch seasons {sorted(failures)}; rerun to resume")
+
+    all_races = []
+    for year in sorted(results):
+        all_races.extend(results[year])
     return all_races
 
-def races_to_dataframe(races):
+def races_to_dataframe(races, rng=None):
+    rng = make_rng(rng)
     data = []
 
     for race in races:
         weather = simulate_weather(race['Circuit']['circuitName'])
-        tire_strategy = simulate_tire_strategy(weather)
-        fastest_lap_time = simulate_fastest_lap()
+        tire_strategy = simulate_tire_strategy(weather, rng)
+        fastest_lap_time = simulate_fastest_lap(rng)
 
         for result in race['Results']:
             position = int(result['position'])
@@ -67,14 +215,15 @@ def races_to_dataframe(races):
                 'status': result['status'],
                 'weather': weather,
                 'tire_strategy': tire_strategy,
-                'gap_to_leader': simulate_gap(position),
+                'gap_to_leader': simulate_gap(position, rng),
                 'fastest_lap_time': fastest_lap_time
             }
             data.append(row)
 
     return pd.DataFrame(data)
 
-def add_rookie_driver(df):
+def add_rookie_driver(df, rng=None):
+    rng = make_rng(rng)
     rookies = [
         
         ("Kimi Antonelli", "Mercedes", 5, 6, 8.0, "Dry", "2025-03-02", 1),   
@@ -132,19 +281,174 @@ def add_rookie_driver(df):
             'points': pts,
             'status': 'Finished',
             'weather': weather,
-            'tire_strategy': simulate_tire_strategy(weather),
-            'gap_to_leader': simulate_gap(pos),
-            'fastest_lap_time': simulate_fastest_lap()
+            'tire_strategy': simulate_tire_strategy(weather, rng),
+            'gap_to_leader': simulate_gap(pos, rng),
+            'fastest_lap_time': simulate_fastest_lap(rng)
         })
 
     return pd.concat([df, pd.DataFrame(rookie_rows)], ignore_index=True)
 
+RESULTS_FILE = "data/f1_multi_year_results.csv"
+INGEST_MANIFEST = "data/ingest_manifest.json"
+
+def load_manifest(path=INGEST_MANIFEST):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def write_manifest(manifest, path=INGEST_MANIFEST):
+    """Replace the ingest manifest atomically"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+def latest_ingested_round(data_file=RESULTS_FILE, manifest_path=INGEST_MANIFEST):
+    """(season, round) of the newest real race already stored
+
+    Read from the manifest when available; otherwise only the season/round
+    columns of the CSV are parsed, ignoring the simulated rookie races.
+    """
+    manifest = load_manifest(manifest_path)
+    if manifest and manifest.get('data_file') == data_file and os.path.exists(data_file):
+        return manifest['latest_season'], manifest['latest_round']
+
+    if not os.path.exists(data_file):
+        return None
+
+    stored = pd.read_csv(data_file, usecols=['season', 'round', 'race_name'])
+    stored = stored[~stored['race_name'].astype(str).str.startswith('Simulated')]
+    stored = stored.assign(
+        season=pd.to_numeric(stored['season'], errors='coerce'),
+        round=pd.to_numeric(stored['round'], errors='coerce')
+    ).dropna(subset=['season', 'round'])
+    if stored.empty:
+        return None
+    latest = stored.sort_values(['season', 'round']).iloc[-1]
+    return int(latest['season']), int(latest['round'])
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+def append_rows_atomically(df, data_file):
+    """Append rows in the existing column order, truncating back on failure"""
+    with open(data_file, encoding="utf-8") as f:
+        columns = f.readline().strip().split(',')
+
+    payload = df.reindex(columns=columns).to_csv(header=False, index=False)
+    original_size = os.path.getsize(data_file)
+
+    with open(data_file, "r+", encoding="utf-8", newline="") as f:
+        f.seek(original_size)
+        try:
+            if original_size and not _ends_with_newline(data_file):
+                f.write("\n")
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        except Exception:
+            f.truncate(original_size)
+            raise
+
+def update_columnar_dataset(df, dataset_path=RESULTS_DATASET, rebuild=False):
+    """Keep the Parquet dataset, if there is one, in step with the CSV
+
+    A failure only warns: the CSV is then newer than the dataset, so training
+    falls back to reading the CSV until the dataset is converted again.
+    """
+    if not columnar_available(dataset_path):
+        return
+    try:
+        rows = write_results(df, dataset_path) if rebuild else append_results(df, dataset_path)
+        print(f"✅ {'Rewrote' if rebuild else 'Added'} {rows} results in {dataset_path}")
+    except Exception as e:
+        print(f"⚠️ Could not update {dataset_path}: {e}; training will read {RESULTS_FILE} until it is converted again")
+
+def ingest_new_rounds(data_file=RESULTS_FILE, manifest_path=INGEST_MANIFEST, cache_dir=ERGAST_CACHE_DIR,
+                      through_season=None, base_url=None, dataset_path=RESULTS_DATASET):
+    """Fetch only rounds newer than the latest stored one and append them
+
+    Derived columns (weather, tyres, gaps, lap times) are computed only for the
+    new rows. When a Parquet dataset exists (see storage.py) the seasons the new
+    rows fall in are rewritten there too. Returns the number of rows appended.
+    """
+    latest = latest_ingested_round(data_file, manifest_path)
+    if latest is None:
+        raise FileNotFoundError(f"{data_file} has no ingested races; run a full fetch first")
+
+    latest_season, latest_round = latest
+    through_season = through_season or datetime.now().year
+    session = make_session(pool_size=2)
+
+    new_races = []
+    for year in range(latest_season, through_season + 1):
+        races, _ = fetch_season(session, year, cache_dir, base_url=base_url)
+        new_races.extend(
+            race for race in races
+            if (int(race['season']), int(race['round'])) > (latest_season, latest_round)
+        )
+
+    if not new_races:
+        print(f"✅ Up to date: latest stored race is {latest_season} round {latest_round}")
+        return 0
+
+    # Seeded from the ingest point so re-running the same ingest gives the same derived columns
+    rng = make_rng([42, latest_season, latest_round])
+    new_df = races_to_dataframe(new_races, rng)
+    append_rows_atomically(new_df, data_file)
+    update_columnar_dataset(new_df, dataset_path)
+
+    newest = max((int(race['season']), int(race['round'])) for race in new_races)
+    manifest = load_manifest(manifest_path) or {'ingests': []}
+    stored_rows = manifest.get('rows')
+    manifest.update({
+        'data_file': data_file,
+        'latest_season': newest[0],
+        'latest_round': newest[1],
+        'rows': stored_rows + len(new_df) if stored_rows is not None else None
+    })
+    manifest.setdefault('ingests', []).append({
+        'timestamp': datetime.now().isoformat(),
+        'rounds': sorted({(int(race['season']), int(race['round'])) for race in new_races}),
+        'rows': len(new_df)
+    })
+    write_manifest(manifest, manifest_path)
+
+    print(f"✅ Appended {len(new_df)} results from {len(new_races)} new races to {data_file}")
+    return len(new_df)
+
 if __name__ == "__main__":
-    races = get_multiple_seasons_results(1950, 2024)
-    df = races_to_dataframe(races)
-    df = add_rookie_driver(df)
-
-    print(df[df['season'] == 2025])
-    os.makedirs("data", exist_ok=True)
-    df.to_csv("data/f1_multi_year_results.csv", index=False)
-    print("\n✅ Data saved to data/f1_multi_year_results.csv")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Fetch F1 results from the Ergast API")
+    parser.add_argument("--start", type=int, default=1950)
+    parser.add_argument("--end", type=int, default=2024)
+    parser.add_argument("--workers", type=int, default=8, help="concurrent season downloads")
+    parser.add_argument("--refresh", action="store_true", help="revalidate cached seasons and refetch changed ones")
+    parser.add_argument("--incremental", action="store_true", help="append only races newer than the latest stored round")
+    args = parser.parse_args()
+    
+    if args.incremental:
+        ingest_new_rounds()
+    else:
+        rng = make_rng(42)
+        races = get_multiple_seasons_results(args.start, args.end, max_workers=args.workers, refresh=args.refresh)
+        df = races_to_dataframe(races, rng)
+        df = add_rookie_driver(df, rng)
+
+        print(df[df['season'] == 2025])
+        os.makedirs("data", exist_ok=True)
+        df.to_csv(RESULTS_FILE, index=False)
+        update_columnar_dataset(df, rebuild=True)
+
+        latest = max((int(race['season']), int(race['round'])) for race in races)
+        write_manifest({
+            'data_file': RESULTS_FILE,
+            'latest_season': latest[0],
+            'latest_round': latest[1],
+            'rows': len(df),
+            'ingests': [{'timestamp': datetime.now().isoformat(), 'full_rebuild': [args.start, args.end], 'rows': len(df)}]
+        })
+        print(f"\n✅ Data saved to {RESULTS_FILE}")
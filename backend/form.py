@@ -0,0 +1,142 @@
+import json
+import os
+import threading
+from collections import deque
+
+import pandas as pd
+
+FORM_WINDOW = 5       # races averaged into a driver's or constructor's form
+DEFAULT_FORM = 15.0   # form for a driver or constructor with no previous race
+
+# Sprints and the simulated rookie races share a round number with the grand prix,
+# so the race name is part of what identifies a race
+RACE_KEYS = ['season', 'round', 'race_name']
+FORM_KINDS = ('driver', 'constructor')
+
+def race_codes(df, race_keys=RACE_KEYS):
+    """0-based race number per row, in the (chronological) order races appear in df"""
+    codes, _ = pd.MultiIndex.from_frame(df[race_keys]).factorize()
+    return codes
+
+def race_positions(df, key, race_keys=RACE_KEYS):
+    """One row per (key, race) with the mean finishing position, in race order
+
+    Constructors usually run two cars, so their result for a race is the mean
+    of both before any rolling window is applied.
+    """
+    per_race = (
+        df.groupby([key, *race_keys], sort=False, observed=True)
+        .agg(position=('position', 'mean'), date=('date', 'min'))
+        .reset_index()
+    )
+    return per_race.sort_values(['date', *race_keys], kind='stable').reset_index(drop=True)
+
+def rolling_form(df, key, window=FORM_WINDOW, race_keys=RACE_KEYS):
+    """Point-in-time form: mean position over the key's previous `window` races
+
+    Only races strictly before each row's race are used, so the feature never
+    sees the result it is used to predict. Rows without a previous race get NaN.
+    """
+    per_race = race_positions(df, key, race_keys)
+
+    rolled = per_race.groupby(key, sort=False, observed=True)['position'].rolling(window, min_periods=1).mean()
+    per_race['form'] = rolled.reset_index(level=0, drop=True)
+    per_race['form'] = per_race.groupby(key, sort=False, observed=True)['form'].shift()
+
+    merged = df[[key, *race_keys]].merge(per_race[[key, *race_keys, 'form']], how='left', on=[key, *race_keys])
+    return pd.Series(merged['form'].to_numpy(), index=df.index, name=f"{key}_form")
+
+class FormState:
+    """Latest form of every driver and constructor, updated one race at a time
+
+    Holds each name's last `window` race positions, so applying a new race costs
+    O(entries) and gives the same value rolling_form would for the next race.
+    """
+
+    def __init__(self, window=FORM_WINDOW, history=None, last_race=None):
+        self.window = window
+        self.last_race = tuple(last_race) if last_race else None
+        self._history = {kind: {} for kind in FORM_KINDS}
+        self._lock = threading.Lock()
+
+        for kind, positions in (history or {}).items():
+            for name, values in positions.items():
+                self._history[kind][name] = deque(values, maxlen=window)
+
+    @classmethod
+    def from_results(cls, df, window=FORM_WINDOW, race_keys=RACE_KEYS):
+        """Build the state after the last race in a results frame"""
+        history = {}
+        for kind in FORM_KINDS:
+            recent = race_positions(df, kind, race_keys).groupby(kind, sort=False, observed=True).tail(window)
+            history[kind] = recent.groupby(kind, sort=False, observed=True)['position'].agg(list).to_dict()
+
+        last_race = None
+        if len(df):
+            last = df.sort_values(['date', *race_keys], kind='stable').iloc[-1]
+            last_race = (int(last['season']), int(last['round']), str(last['race_name']))
+
+        return cls(window, history, last_race)
+
+    def form(self, kind, name, default=DEFAULT_FORM):
+        """Mean position over the name's last races, or default if it has none"""
+        with self._lock:
+            positions = self._history[kind].get(name)
+            if not positions:
+                return default
+            return sum(positions) / len(positions)
+
+    def driver_form(self, driver, default=DEFAULT_FORM):
+        return self.form('driver', driver, default)
+
+    def constructor_form(self, constructor, default=DEFAULT_FORM):
+        return self.form('constructor', constructor, default)
+
+    def update(self, season, round, race_name, results):
+        """Apply one race's results, given as (driver, constructor, position) tuples
+
+        Races before the last applied race, or the same race again, are ignored
+        so replaying a race is harmless. Returns True if the state changed.
+        """
+        race = (int(season), int(round), str(race_name))
+        team_positions = {}
+
+        with self._lock:
+            if self.last_race is not None and (race[:2] < self.last_race[:2] or race == self.last_race):
+                return False
+
+            for driver, constructor, position in results:
+                self._history['driver'].setdefault(driver, deque(maxlen=self.window)).append(float(position))
+                team_positions.setdefault(constructor, []).append(float(position))
+
+            for constructor, positions in team_positions.items():
+                history = self._history['constructor'].setdefault(constructor, deque(maxlen=self.window))
+                history.append(sum(positions) / len(positions))
+
+            self.last_race = race
+            return True
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'window': self.window,
+                'last_race': list(self.last_race) if self.last_race else None,
+                'history': {
+                    kind: {name: list(values) for name, values in positions.items()}
+                    for kind, positions in self._history.items()
+                }
+            }
+
+    def save(self, path):
+        """Write the state as JSON atomically"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data.get('window', FORM_WINDOW), data.get('history'), data.get('last_race'))
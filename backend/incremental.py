@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+
+# Trees (forests) and boosting stages added per new race by an incremental update
+TREES_PER_RACE = 10
+STAGES_PER_RACE = 2
+
+# Earlier races the added trees also learn from, so they aren't fit on ~20 rows
+WINDOW_RACES = 50
+
+# Target column each bundle model is trained on
+MODEL_TARGETS = {'position': 'position', 'podium': 'podium', 'points': 'points_scored', 'winner': 'winner'}
+
+def races_after(race_keys, last_race):
+    """Boolean mask of rows from races after last_race, given per-row (season, round, race_name) keys in race order
+
+    Raises LookupError when last_race isn't in the data, since then there is no
+    telling which rows the saved models have already seen.
+    """
+    keys = list(zip(race_keys['season'].astype(int), race_keys['round'].astype(int), race_keys['race_name'].astype(str)))
+    last_race = (int(last_race[0]), int(last_race[1]), str(last_race[2]))
+    if last_race not in set(keys):
+        raise LookupError(f"Last trained race {last_race} is not in the dataset")
+    last_row = len(keys) - 1 - keys[::-1].index(last_race)
+    return np.arange(len(keys)) > last_row
+
+def grow_model(model, X, y, feature_names, n_new_races, trees_per_race=TREES_PER_RACE, stages_per_race=STAGES_PER_RACE):
+    """Warm-start a fitted forest or boosting model with extra trees fit on X, y
+
+    Returns a description of what was added, or None when the model can't be
+    grown this way (no warm_start, or y lacks one of its classes or has one it
+    never saw, either of which makes the new trees disagree with the old) and
+    has to be refit instead.
+    """
+    params = model.get_params()
+    if 'warm_start' not in params:
+        return None
+    if hasattr(model, 'classes_') and not np.array_equal(np.sort(model.classes_), np.unique(y)):
+        return None
+
+    if 'bootstrap' in params:
+        parameter, added, unit = 'n_estimators', trees_per_race * n_new_races, 'trees'
+    else:
+        parameter = 'max_iter' if 'max_iter' in params else 'n_estimators'
+        added, unit = stages_per_race * n_new_races, 'stages'
+
+    model.set_params(warm_start=True, **{parameter: params[parameter] + added})
+    model.fit(pd.DataFrame(X, columns=feature_names), y)
+    model.set_params(warm_start=False)
+    return f"+{added} {unit} ({params[parameter]} → {params[parameter] + added})"
+
+def refit_model(model, X, y, feature_names):
+    """Fit a fresh copy of model on all rows"""
+    return clone(model).fit(pd.DataFrame(X, columns=feature_names), y)
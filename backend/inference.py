@@ -0,0 +1,30 @@
+import numpy as np
+
+def build_feature_matrix(rows, schema, encoding_index):
+    """Build the (n_entries x n_features) matrix for a whole grid in one pass, laid out by the feature schema"""
+    n_rows = len(rows)
+    X = np.zeros((n_rows, len(schema)), dtype=np.float64)
+
+    if n_rows == 0:
+        return X
+
+    schema.check_rows(rows, encoding_index)
+
+    # Categorical columns are encoded column by column through the precomputed index
+    for index, col in schema.categorical:
+        X[:, index] = encoding_index[col].encode_column([row[col] for row in rows])
+
+    # Numerical columns are copied straight from the per-entry rows
+    for index, col in schema.numerical:
+        X[:, index] = [row[col] for row in rows]
+
+    return X
+
+def scale_feature_matrix(X, schema, scaler):
+    """Scale the schema's numerical columns of the whole matrix with one scaler call"""
+    if scaler is None or len(schema.scaled_positions) == 0 or len(X) == 0:
+        return X
+
+    X_scaled = X.copy()
+    X_scaled[:, schema.scaled_positions] = scaler.transform(X[:, schema.scaled_positions])
+    return X_scaled
@@ -0,0 +1,120 @@
+import asyncio
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+class ExecutorSaturated(Exception):
+    """Every worker is busy and the wait queue is full"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Inference queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+class InferenceExecutor:
+    """Bounded thread pool that async handlers await for CPU-bound prediction work
+
+    At most `max_workers` calls run at once and `max_queue` more wait for a
+    worker; anything beyond that is rejected immediately with ExecutorSaturated
+    so the event loop keeps answering light requests instead of piling up work.
+    sklearn's tree traversal and numpy release the GIL, so threads overlap.
+    """
+
+    def __init__(self, max_workers=4, max_queue=32):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+
+        self.active = 0
+        self.queued = 0
+        self.completed = 0   # calls finished, including the failed ones
+        self.failed = 0
+        self.rejected = 0
+        self.max_queue_depth = 0
+        self._wait_time = 0.0
+        self._run_time = 0.0
+
+        self._lock = threading.Lock()
+        self._pool = None
+        self._start()
+
+        # Worker threads don't survive fork, so a preforked worker starts its own pool
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._start)
+
+    def _start(self):
+        self._lock = threading.Lock()
+        self.active = self.queued = 0
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+
+    def submit(self, fn, *args, **kwargs):
+        """Queue fn(*args, **kwargs) on the pool; raises ExecutorSaturated when the queue is full"""
+        with self._lock:
+            if self.active + self.queued >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorSaturated(self._retry_after())
+            self.queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queued)
+
+        submitted = time.perf_counter()
+
+        def call():
+            started = time.perf_counter()
+            with self._lock:
+                self.queued -= 1
+                self.active += 1
+                self._wait_time += started - submitted
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                with self._lock:
+                    self.failed += 1
+                raise
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self.completed += 1
+                    self._run_time += time.perf_counter() - started
+
+        return self._pool.submit(call)
+
+    async def run(self, fn, *args, **kwargs):
+        """Run fn in the pool and await its result without blocking the event loop
+
+        If the awaiting request is cancelled the call still finishes in its
+        thread, and keeps its slot until it does.
+        """
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def _retry_after(self):
+        """Seconds until a slot should free up, from the mean run time so far (at least 1)"""
+        mean_run_time = self._run_time / self.completed if self.completed else 1.0
+        backlog = (self.active + self.queued) / self.max_workers
+        return max(1, math.ceil(mean_run_time * backlog))
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
+
+    def stats(self):
+        """Counters for monitoring the executor"""
+        with self._lock:
+            started = self.completed + self.active
+            return {
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'active': self.active,
+                'queue_depth': self.queued,
+                'max_queue_depth': self.max_queue_depth,
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'mean_wait_ms': round(self._wait_time / started * 1000, 2) if started else 0.0,
+                'mean_run_ms': round(self._run_time / self.completed * 1000, 2) if self.completed else 0.0
+            }
+
+def executor_from_env(prefix='INFERENCE'):
+    """Create an InferenceExecutor configured from environment variables"""
+    return InferenceExecutor(
+        max_workers=int(os.environ.get(f"{prefix}_WORKERS", min(4, os.cpu_count() or 1))),
+        max_queue=int(os.environ.get(f"{prefix}_QUEUE_SIZE", 32)),
+    )
@@ -0,0 +1,138 @@
+import os
+
+import numpy as np
+from sklearn.base import BaseEstimator, RegressorMixin, clone
+from sklearn.ensemble import (
+    GradientBoostingRegressor, HistGradientBoostingClassifier, HistGradientBoostingRegressor,
+    RandomForestClassifier, RandomForestRegressor,
+)
+
+from model_bundle import MODEL_NAMES
+from training_jobs import TrainingJob
+
+DEFAULT_MODEL_BACKEND = 'forest'
+
+# Finishing positions that count as each outcome
+OUTCOME_POSITIONS = {'winner': 1, 'podium': 3, 'points': 10}
+
+class PositionDistributionModel(BaseEstimator, RegressorMixin):
+    """One classifier over finishing positions standing in for the position, podium, points and winner models
+
+    Finishing position is treated as an ordered class, so a single fit gives
+    P(position = k) for every driver. The expected position is the regression
+    answer (predict), and win, podium and points probabilities are sums over
+    the same row of probabilities, so one model call answers all four targets.
+    """
+
+    def __init__(self, estimator=None):
+        self.estimator = estimator
+
+    def fit(self, X, y):
+        self.estimator_ = clone(self.estimator).fit(X, np.asarray(y).astype(np.int64))
+        self.classes_ = self.estimator_.classes_
+        self.n_features_in_ = self.estimator_.n_features_in_
+        if hasattr(self.estimator_, 'feature_names_in_'):
+            self.feature_names_in_ = self.estimator_.feature_names_in_
+        return self
+
+    def predict_proba(self, X):
+        """P(position = classes_[k]) per row"""
+        return self.estimator_.predict_proba(X)
+
+    def predict(self, X):
+        """Expected finishing position"""
+        return self.predict_proba(X) @ self.classes_.astype(np.float64)
+
+    def predict_targets(self, X):
+        """Expected position plus win, podium and points probabilities from one predict_proba call"""
+        probabilities = self.predict_proba(X)
+        targets = {'position': probabilities @ self.classes_.astype(np.float64)}
+        for outcome, last in OUTCOME_POSITIONS.items():
+            targets[outcome] = probabilities[:, self.classes_ <= last].sum(axis=1)
+        return targets
+
+    def outcome_scores(self, X, positions):
+        """Accuracy of each outcome at a 0.5 threshold, comparable with the separate classifiers"""
+        positions = np.asarray(positions)
+        return {
+            f"{outcome}_accuracy": float(np.mean((probability >= 0.5) == (positions <= OUTCOME_POSITIONS[outcome])))
+            for outcome, probability in self.predict_targets(X).items() if outcome in OUTCOME_POSITIONS
+        }
+
+    def position_samples(self, X, n_samples=32):
+        """Positions at n_samples evenly spaced quantiles of each row's distribution"""
+        cumulative = np.cumsum(self.predict_proba(X), axis=1)
+        quantiles = (np.arange(n_samples) + 0.5) / n_samples
+        index = (cumulative[:, None, :] < quantiles[None, :, None]).sum(axis=2)
+        return self.classes_[np.minimum(index, len(self.classes_) - 1)].astype(np.float64)
+
+def forest_jobs(winner=True, random_state=42):
+    """The original models: RandomForest (and GradientBoosting for position), one per target"""
+    jobs = [
+        TrainingJob('position_rf', 'position', RandomForestRegressor(n_estimators=200, max_depth=15, random_state=random_state, n_jobs=-1), 'regression', slot='position'),
+        TrainingJob('position_gb', 'position', GradientBoostingRegressor(n_estimators=200, max_depth=8, random_state=random_state), 'regression', multicore=False, slot='position'),
+        TrainingJob('podium', 'podium', RandomForestClassifier(n_estimators=200, max_depth=15, random_state=random_state, n_jobs=-1), 'classification'),
+        TrainingJob('points', 'points_scored', RandomForestClassifier(n_estimators=200, max_depth=15, random_state=random_state, n_jobs=-1), 'classification'),
+    ]
+    if winner:
+        jobs.append(TrainingJob('winner', 'winner', RandomForestClassifier(n_estimators=200, max_depth=15, random_state=random_state,
+                                                                           class_weight='balanced', n_jobs=-1), 'classification'))
+    return jobs
+
+def hist_jobs(winner=True, random_state=42):
+    """HistGradientBoosting per target: features are binned once, so fits are much faster than the forests"""
+    params = dict(max_iter=200, learning_rate=0.05, max_leaf_nodes=15, early_stopping=False, random_state=random_state)
+
+    def hist_classifier(**extra):
+        return HistGradientBoostingClassifier(**params, **extra)
+
+    jobs = [
+        TrainingJob('position_hist', 'position', HistGradientBoostingRegressor(**params), 'regression', slot='position'),
+        TrainingJob('podium_hist', 'podium', hist_classifier(), 'classification', slot='podium'),
+        TrainingJob('points_hist', 'points_scored', hist_classifier(), 'classification', slot='points'),
+    ]
+    if winner:
+        jobs.append(TrainingJob('winner_hist', 'winner', hist_classifier(class_weight='balanced'), 'classification', slot='winner'))
+    return jobs
+
+def ordinal_jobs(winner=True, random_state=42):
+    """A single PositionDistributionModel serving as the position model; podium, points and winner come from it"""
+    # Every boosting iteration grows one tree per position class, so the trees are kept small
+    classifier = HistGradientBoostingClassifier(max_iter=50, learning_rate=0.1, max_leaf_nodes=7, early_stopping=False,
+                                                random_state=random_state)
+    return [TrainingJob('position_ordinal', 'position', PositionDistributionModel(classifier), 'regression', slot='position')]
+
+MODEL_BACKENDS = {
+    'forest': forest_jobs,
+    'hist': hist_jobs,
+    'ordinal': ordinal_jobs,
+}
+
+def backend_jobs(backend=None, winner=True, random_state=42, tuned=None):
+    """Training jobs for a model backend (default: $MODEL_BACKEND or 'forest')
+
+    tuned maps estimator class names to parameters (see tuning.py); they are
+    applied to the backend's position estimators of that class.
+    """
+    backend = backend or os.environ.get("MODEL_BACKEND") or DEFAULT_MODEL_BACKEND
+    if backend not in MODEL_BACKENDS:
+        raise ValueError(f"Unknown model backend {backend!r}, expected one of {sorted(MODEL_BACKENDS)}")
+    jobs = MODEL_BACKENDS[backend](winner=winner, random_state=random_state)
+    for job in jobs:
+        params = (tuned or {}).get(type(job.estimator).__name__)
+        if params and job.target == 'position':
+            job.estimator.set_params(**params)
+    return backend, jobs
+
+def select_models(jobs, results):
+    """Best model per bundle slot (lowest RMSE or highest accuracy); slots no job fills are None"""
+    models = {name: None for name in MODEL_NAMES}
+    best = {}
+    for job in jobs:
+        result = results[job.name]
+        slot = job.slot or job.name
+        score = -result.metrics['rmse'] if job.task == 'regression' else result.metrics['accuracy']
+        if slot not in best or score > best[slot]:
+            best[slot] = score
+            models[slot] = result.model
+    return models
@@ -0,0 +1,382 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections.abc import Mapping
+from datetime import datetime
+from typing import List, NamedTuple, Optional
+
+import joblib
+
+from feature_schema import FeatureSchema, FeatureSchemaError
+from feature_store import FeatureStore
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(BASE_DIR, "models")
+BUNDLES_DIR = os.path.join(MODELS_DIR, "bundles")
+
+BUNDLE_FORMAT = 1
+MANIFEST_FILE = "manifest.json"
+PREPROCESSING_FILE = "preprocessing.joblib"
+TRAINING_FRAME_FILE = "training_frame.joblib"
+FEATURE_STORE_SUBDIR = "feature_store"
+CURRENT_FILE = "CURRENT"
+
+MODEL_NAMES = ['position', 'podium', 'winner', 'points']
+
+# Separate pickles written by train_enhanced_model.py before bundles existed
+LEGACY_MODEL_FILES = {name: f"{name}_enhanced_model.pkl" for name in MODEL_NAMES}
+LEGACY_LABEL_ENCODERS_FILE = "enhanced_label_encoders.pkl"
+LEGACY_SCALER_FILE = "feature_scaler.pkl"
+LEGACY_FEATURE_NAMES_FILE = "feature_names.pkl"
+LEGACY_SCHEMA_FILE = "feature_schema.json"
+
+class ModelSpec(NamedTuple):
+    """Manifest entry for one model, enough to validate it against the schema without loading it"""
+    file: str
+    estimator: str
+    size: int
+    n_features_in_: Optional[int] = None
+    feature_names_in_: Optional[List[str]] = None
+
+def model_spec(model, file, size):
+    names = getattr(model, 'feature_names_in_', None)
+    return ModelSpec(
+        file=file,
+        estimator=type(model).__name__,
+        size=size,
+        n_features_in_=getattr(model, 'n_features_in_', None),
+        feature_names_in_=[str(name) for name in names] if names is not None else None
+    )
+
+class LazyModels(Mapping):
+    """Read-only name -> model mapping that loads each model on first access"""
+
+    def __init__(self, bundle):
+        self._bundle = bundle
+
+    def __getitem__(self, name):
+        if name not in self._bundle.specs:
+            raise KeyError(name)
+        return self._bundle.model(name)
+
+    def __iter__(self):
+        return iter(self._bundle.specs)
+
+    def __len__(self):
+        return len(self._bundle.specs)
+
+class ModelBundle:
+    """A versioned set of models plus the encoders, scaler and feature schema they were trained with
+
+    Preprocessing objects are loaded eagerly (they are small and needed to
+    validate the bundle); each model is loaded on first use, memory-mapped so
+    its large arrays are shared through the page cache between workers.
+    """
+
+    def __init__(self, path, manifest, label_encoders, scaler, schema, mmap_mode='r', models=None, categories=None):
+        self.path = path
+        self.manifest = manifest
+        self.version = manifest['version']
+        self.label_encoders = label_encoders
+        # Encoder classes extended by incremental updates, in code order (None: the encoders' own classes_)
+        self.categories = categories
+        self.scaler = scaler
+        self.schema = schema
+        self.mmap_mode = mmap_mode
+        self.specs = {name: ModelSpec(**spec) for name, spec in manifest['models'].items()}
+
+        self._models = dict(models or {})
+        self._lock = threading.Lock()
+        self.models = LazyModels(self)
+
+    def model(self, name):
+        """The named model, loading it on first access"""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            if name not in self._models:
+                started = time.perf_counter()
+                path = os.path.join(self.path, self.specs[name].file)
+                self._models[name] = joblib.load(path, mmap_mode=self.mmap_mode)
+                print(f"📦 Loaded {name} model from bundle {self.version} in {time.perf_counter() - started:.2f}s")
+            return self._models[name]
+
+    def load_all(self):
+        """Load every model now (e.g. from a background warm-up thread)"""
+        for name in self.specs:
+            self.model(name)
+        return self
+
+    def training_frame(self):
+        """The enhanced results the models were trained on, or None if the bundle wasn't saved with them"""
+        file = self.manifest.get('training_frame')
+        if file is None:
+            return None
+        return joblib.load(os.path.join(self.path, file))
+
+    def feature_store(self, mmap_mode='r'):
+        """The per-entity features materialized with these models, or None if the bundle wasn't saved with them
+
+        The store's tables are never rewritten once the bundle is written, so
+        they can stay memory-mapped while newer bundles are trained.
+        """
+        directory = self.manifest.get('feature_store')
+        if directory is None:
+            return None
+        return FeatureStore.load(os.path.join(self.path, directory), mmap_mode)
+
+    def loaded(self):
+        return sorted(self._models)
+
+    def validate(self):
+        """Check the models, scaler and encoders against the bundle's feature schema"""
+        specs = {name: self._models.get(name, spec) for name, spec in self.specs.items()}
+        self.schema.validate(specs, self.scaler, self.label_encoders)
+
+    def info(self):
+        return {
+            'version': self.version,
+            'path': self.path,
+            'created_at': self.manifest.get('created_at'),
+            'features': len(self.schema),
+            'schema': self.schema.fingerprint,
+            'models': {name: spec.estimator for name, spec in self.specs.items()},
+            'loaded': self.loaded(),
+        }
+
+def _file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _bundle_files(path):
+    """Paths of every file under a bundle directory, relative to it and sorted"""
+    return sorted(
+        os.path.relpath(os.path.join(directory, file), path).replace(os.sep, "/")
+        for directory, _, files in os.walk(path) for file in files
+    )
+
+def save_bundle(models, label_encoders, scaler, schema, root=BUNDLES_DIR, metadata=None, make_current=True,
+                categories=None, training_frame=None, feature_store=None):
+    """Write a new bundle version under root and (by default) point CURRENT at it
+
+    Models are dumped uncompressed so they can be memory-mapped on load. The
+    version is a timestamp plus a hash of the bundle contents. categories are
+    the append-only category classes of an incrementally updated bundle, and
+    training_frame the enhanced results the models were fit on. feature_store
+    is written to the bundle's own directory, so serving reads per-entity
+    features from the same training run as the models.
+    """
+    os.makedirs(root, exist_ok=True)
+    staging = os.path.join(root, f".staging-{os.getpid()}-{time.time_ns()}")
+    os.makedirs(staging)
+
+    try:
+        preprocessing = {'label_encoders': label_encoders, 'scaler': scaler}
+        if categories is not None:
+            preprocessing['categories'] = categories
+        joblib.dump(preprocessing, os.path.join(staging, PREPROCESSING_FILE))
+        if training_frame is not None:
+            joblib.dump(training_frame, os.path.join(staging, TRAINING_FRAME_FILE))
+        if feature_store is not None:
+            feature_store.save(os.path.join(staging, FEATURE_STORE_SUBDIR))
+
+        specs = {}
+        for name, model in models.items():
+            if model is None:
+                continue
+            file = f"{name}.joblib"
+            joblib.dump(model, os.path.join(staging, file))
+            specs[name] = model_spec(model, file, os.path.getsize(os.path.join(staging, file)))._asdict()
+
+        files = {file: _file_digest(os.path.join(staging, file)) for file in _bundle_files(staging)}
+        content_hash = hashlib.sha1(json.dumps([files, schema.to_dict()], sort_keys=True).encode()).hexdigest()
+        created_at = datetime.now()
+        version = f"{created_at:%Y%m%d-%H%M%S}-{content_hash[:8]}"
+
+        manifest = {
+            'format': BUNDLE_FORMAT,
+            'version': version,
+            'created_at': created_at.isoformat(),
+            'schema': schema.to_dict(),
+            'preprocessing': PREPROCESSING_FILE,
+            'models': specs,
+            'training_frame': TRAINING_FRAME_FILE if training_frame is not None else None,
+            'feature_store': FEATURE_STORE_SUBDIR if feature_store is not None else None,
+            'files': files,
+            'libraries': _library_versions(),
+            'metadata': metadata or {},
+        }
+        with open(os.path.join(staging, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        path = os.path.join(root, version)
+        os.replace(staging, path)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    if make_current:
+        set_current_version(version, root)
+    return path
+
+def _library_versions():
+    import numpy
+    import sklearn
+    return {'scikit-learn': sklearn.__version__, 'numpy': numpy.__version__, 'joblib': joblib.__version__}
+
+def set_current_version(version, root=BUNDLES_DIR):
+    """Atomically point CURRENT at a bundle version"""
+    if not os.path.exists(os.path.join(root, version, MANIFEST_FILE)):
+        raise FileNotFoundError(f"No bundle {version} in {root}")
+    tmp_path = os.path.join(root, f"{CURRENT_FILE}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(version + "\n")
+    os.replace(tmp_path, os.path.join(root, CURRENT_FILE))
+
+def current_version(root=BUNDLES_DIR):
+    """Version named by CURRENT, or None if no bundle has been written"""
+    try:
+        with open(os.path.join(root, CURRENT_FILE), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def list_versions(root=BUNDLES_DIR):
+    """Bundle versions under root, oldest first"""
+    if not os.path.isdir(root):
+        return []
+    return sorted(
+        entry for entry in os.listdir(root)
+        if os.path.exists(os.path.join(root, entry, MANIFEST_FILE))
+    )
+
+def read_manifest(path):
+    with open(os.path.join(path, MANIFEST_FILE), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get('format') != BUNDLE_FORMAT:
+        raise FeatureSchemaError(f"Unsupported bundle format: {manifest.get('format')}")
+    return manifest
+
+def load_bundle(root=BUNDLES_DIR, version=None, mmap_mode='r'):
+    """Open a bundle (CURRENT by default); models stay on disk until first used"""
+    version = version or current_version(root)
+    if version is None:
+        raise FileNotFoundError(f"No model bundle in {root}")
+
+    path = os.path.join(root, version)
+    manifest = read_manifest(path)
+    preprocessing = joblib.load(os.path.join(path, manifest['preprocessing']))
+    schema = FeatureSchema.from_dict(manifest['schema'])
+
+    return ModelBundle(path, manifest, preprocessing['label_encoders'], preprocessing['scaler'], schema, mmap_mode,
+                       categories=preprocessing.get('categories'))
+
+def load_legacy_bundle(models_dir=MODELS_DIR, mmap_mode='r'):
+    """Wrap the separate pickles of older training runs as an (eagerly loaded) bundle"""
+    models = {}
+    for name, file in LEGACY_MODEL_FILES.items():
+        path = os.path.join(models_dir, file)
+        if os.path.exists(path):
+            models[name] = joblib.load(path, mmap_mode=mmap_mode)
+        elif name != 'winner':
+            raise FileNotFoundError(path)
+
+    label_encoders = joblib.load(os.path.join(models_dir, LEGACY_LABEL_ENCODERS_FILE))
+    scaler = joblib.load(os.path.join(models_dir, LEGACY_SCALER_FILE))
+    feature_names = joblib.load(os.path.join(models_dir, LEGACY_FEATURE_NAMES_FILE))
+
+    schema_path = os.path.join(models_dir, LEGACY_SCHEMA_FILE)
+    schema = FeatureSchema.load(schema_path) if os.path.exists(schema_path) else FeatureSchema.from_feature_names(feature_names)
+    schema.validate(models, scaler, label_encoders, feature_names)
+
+    # Fingerprint the files so cached predictions are tied to what is on disk
+    digest = hashlib.sha1()
+    files = [LEGACY_LABEL_ENCODERS_FILE, LEGACY_SCALER_FILE, LEGACY_FEATURE_NAMES_FILE, LEGACY_SCHEMA_FILE]
+    for file in list(LEGACY_MODEL_FILES.values()) + files:
+        path = os.path.join(models_dir, file)
+        if os.path.exists(path):
+            stat = os.stat(path)
+            digest.update(f"{file}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+
+    manifest = {
+        'format': BUNDLE_FORMAT,
+        'version': f"legacy-{digest.hexdigest()[:12]}",
+        'schema': schema.to_dict(),
+        'models': {
+            name: model_spec(model, LEGACY_MODEL_FILES[name], os.path.getsize(os.path.join(models_dir, LEGACY_MODEL_FILES[name])))._asdict()
+            for name, model in models.items()
+        },
+    }
+    return ModelBundle(models_dir, manifest, label_encoders, scaler, schema, mmap_mode, models=models)
+
+def open_model_bundle(root=BUNDLES_DIR, models_dir=MODELS_DIR, version=None, mmap_mode='r'):
+    """The requested or CURRENT bundle, falling back to legacy pickles; validated against its schema"""
+    if version or current_version(root):
+        bundle = load_bundle(root, version, mmap_mode)
+    else:
+        bundle = load_legacy_bundle(models_dir, mmap_mode)
+    bundle.validate()
+    return bundle
+
+def _print_bundle(path, current=False):
+    manifest = read_manifest(path)
+    schema = manifest['schema']
+    print(f"📦 {manifest['version']}{'  (current)' if current else ''}")
+    print(f"   Created: {manifest.get('created_at')}")
+    print(f"   Features: {len(schema['features'])} ({len(schema['scaled'])} scaled)")
+    for name, spec in manifest['models'].items():
+        print(f"   • {name}: {spec['estimator']}, {spec['n_features_in_']} features, {spec['size'] / 1e6:.1f} MB")
+    for key, value in manifest.get('libraries', {}).items():
+        print(f"   {key} {value}")
+    for key, value in manifest.get('metadata', {}).items():
+        print(f"   {key}: {value}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect and manage model bundles")
+    parser.add_argument("--root", default=BUNDLES_DIR)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    inspect = subparsers.add_parser("inspect", help="show a bundle's manifest (CURRENT by default)")
+    inspect.add_argument("version", nargs="?")
+    inspect.add_argument("--json", action="store_true", help="print the raw manifest")
+
+    subparsers.add_parser("list", help="list bundle versions")
+
+    use = subparsers.add_parser("use", help="point CURRENT at a bundle version")
+    use.add_argument("version")
+
+    pack = subparsers.add_parser("pack", help="pack the legacy model pickles into a new bundle")
+    pack.add_argument("--models-dir", default=MODELS_DIR)
+
+    args = parser.parse_args()
+
+    if args.command == "inspect":
+        version = args.version or current_version(args.root)
+        if version is None:
+            parser.error(f"no model bundle in {args.root}")
+        path = os.path.join(args.root, version)
+        if args.json:
+            print(json.dumps(read_manifest(path), indent=2))
+        else:
+            _print_bundle(path, version == current_version(args.root))
+    elif args.command == "list":
+        current = current_version(args.root)
+        for version in list_versions(args.root):
+            print(f"{'*' if version == current else ' '} {version}")
+    elif args.command == "use":
+        set_current_version(args.version, args.root)
+        print(f"✅ CURRENT -> {args.version}")
+    else:
+        legacy = load_legacy_bundle(args.models_dir, mmap_mode=None)
+        path = save_bundle(legacy.models, legacy.label_encoders, legacy.scaler, legacy.schema, args.root,
+                           metadata={'packed_from': os.path.abspath(args.models_dir)})
+        print(f"✅ Packed legacy models into {path}")
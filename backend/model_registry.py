@@ -0,0 +1,162 @@
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, NamedTuple, Optional
+
+from encoding import build_encoding_index
+from feature_store import FeatureStore
+from model_bundle import (
+    BUNDLES_DIR, FEATURE_STORE_SUBDIR, MODELS_DIR, current_version, list_versions, open_model_bundle, set_current_version
+)
+
+class ServingModels(NamedTuple):
+    """Everything one request needs to build, scale and predict a feature matrix
+
+    Requests read the registry's state once and use it throughout, so a reload
+    never mixes one version's encoders, models or per-entity features with
+    another version's.
+    """
+    bundle: Any
+    models: Any
+    label_encoders: Any
+    scaler: Any
+    schema: Any
+    encoding_index: Any
+    feature_store: Any
+    version: str
+
+def bundle_feature_store(bundle, models_dir=MODELS_DIR):
+    """The bundle's feature store (None if there is none); older bundles use the shared models/feature_store"""
+    try:
+        store = bundle.feature_store()
+        if store is None:
+            store = FeatureStore.load(os.path.join(models_dir, FEATURE_STORE_SUBDIR))
+        return store
+    except (FileNotFoundError, ValueError) as e:
+        print(f"⚠️ No feature store for model bundle {bundle.version}, using reference tables: {e}")
+        return None
+
+def serving_models(bundle, models_dir=MODELS_DIR):
+    return ServingModels(
+        bundle=bundle,
+        models=bundle.models,
+        label_encoders=bundle.label_encoders,
+        scaler=bundle.scaler,
+        schema=bundle.schema,
+        # Encoding lookups are built once per version instead of calling LabelEncoder.transform per request
+        encoding_index=build_encoding_index(bundle.label_encoders, categories=bundle.categories),
+        feature_store=bundle_feature_store(bundle, models_dir),
+        version=bundle.version
+    )
+
+class ModelRegistry:
+    """The serving model version, replaced atomically by reload() and rollback()
+
+    A new bundle is opened, validated and fully loaded on the calling thread
+    while the current one keeps serving, then published with a single
+    reference assignment. The replaced version is kept for rollback().
+    """
+
+    def __init__(self, root=BUNDLES_DIR, models_dir=MODELS_DIR, mmap_mode='r', on_swap=None):
+        self.root = root
+        self.models_dir = models_dir
+        self.mmap_mode = mmap_mode
+        self.on_swap = on_swap
+        self.current: Optional[ServingModels] = None
+        self.previous: Optional[ServingModels] = None
+        self.reloaded_at = None
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        self._stop_watching = threading.Event()
+        self._failed_version = None
+
+    def open(self, version=None):
+        """Open the requested or CURRENT bundle as the serving version; models load lazily"""
+        self.current = serving_models(open_model_bundle(self.root, self.models_dir, version, self.mmap_mode), self.models_dir)
+        return self.current
+
+    def reload(self, version=None, make_current=True):
+        """Load a bundle (CURRENT by default) in full, then swap it in
+
+        Raises FileNotFoundError / FeatureSchemaError and keeps serving the
+        current version if the new bundle can't be opened or validated.
+        Returns False if that version is already serving.
+        """
+        with self._reload_lock:
+            version = version or current_version(self.root)
+            if version is not None and version not in list_versions(self.root):
+                raise FileNotFoundError(f"No model bundle {version} in {self.root}")
+            active = self.current
+            if active is not None and version is not None and version == active.version:
+                return False
+
+            started = time.perf_counter()
+            bundle = open_model_bundle(self.root, self.models_dir, version, self.mmap_mode)
+            if active is not None and bundle.version == active.version:
+                return False
+            # Load every forest before the swap so no request pays for a cold model
+            bundle.load_all()
+
+            if make_current and version is not None:
+                set_current_version(version, self.root)
+            self._swap(serving_models(bundle, self.models_dir))
+            print(f"🔄 Serving model bundle {bundle.version} (loaded in {time.perf_counter() - started:.2f}s)")
+            return True
+
+    def rollback(self):
+        """Swap the previously served version back in and point CURRENT at it"""
+        with self._reload_lock:
+            if self.previous is None:
+                raise LookupError("No previous model version to roll back to")
+
+            restored = self.previous
+            if restored.version in list_versions(self.root):
+                set_current_version(restored.version, self.root)
+            self._swap(restored)
+            print(f"↩️ Rolled back to model bundle {restored.version}")
+            return restored.version
+
+    def _swap(self, serving):
+        self.previous, self.current = self.current, serving
+        self.reloaded_at = time.time()
+        if self.on_swap is not None:
+            self.on_swap(self.previous, serving)
+
+    def watch(self, interval):
+        """Poll CURRENT every `interval` seconds and reload when it names a new version"""
+        if self._watcher is not None:
+            return self._watcher
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), name="model-watcher", daemon=True)
+        self._watcher.start()
+        return self._watcher
+
+    def _watch(self, interval):
+        while not self._stop_watching.wait(interval):
+            version = current_version(self.root)
+            active = self.current
+            if version is None or version == self._failed_version or (active is not None and version == active.version):
+                continue
+            try:
+                self.reload(version, make_current=False)
+            except Exception as e:
+                # A half-written or mismatched bundle must not take the API down; keep the current one
+                self._failed_version = version
+                print(f"⚠️ Model reload of {version} failed, still serving {active.version if active else None}: {e}")
+
+    def stop_watching(self):
+        self._stop_watching.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def info(self):
+        active = self.current
+        return {
+            'current': active.bundle.info() if active else None,
+            'previous': self.previous.version if self.previous else None,
+            'available': list_versions(self.root),
+            'reloaded_at': datetime.fromtimestamp(self.reloaded_at).isoformat() if self.reloaded_at else None,
+            'watching': self._watcher is not None,
+        }
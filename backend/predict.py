@@ -41,39 +41,33 @@ top_n = min(3, len(classes))
 for i in range(top_n):
     print(f"{classes[i]} — {round(probs[i]*100, 1)}%")
 
-import pandas as pd
 from datetime import datetime
-import os
+
+from prediction_logger import BufferedCSVLogger
 
 log_data = {
-    'timestamp': [datetime.now().isoformat()],
-    'grid': [grid],
-    'constructor': [constructor_name],
-    'circuit': [circuit_name],
-    'predicted_position': [round(position_pred)],
-    'predicted_podium': ['YES' if podium_pred == 1 else 'NO'],
-    'top_winner_1': [classes[0] if len(classes) > 0 else 'N/A'],
-    'top_winner_1_prob': [round(probs[0]*100, 1) if len(probs) > 0 else 0]
+    'timestamp': datetime.now().isoformat(),
+    'grid': grid,
+    'constructor': constructor_name,
+    'circuit': circuit_name,
+    'predicted_position': round(position_pred),
+    'predicted_podium': 'YES' if podium_pred == 1 else 'NO',
+    'top_winner_1': classes[0] if len(classes) > 0 else 'N/A',
+    'top_winner_1_prob': round(probs[0]*100, 1) if len(probs) > 0 else 0
 }
 
 # Optional: include runner-up if exists
 if len(classes) > 1:
-    log_data['top_winner_2'] = [classes[1]]
-    log_data['top_winner_2_prob'] = [round(probs[1]*100, 1)]
+    log_data['top_winner_2'] = classes[1]
+    log_data['top_winner_2_prob'] = round(probs[1]*100, 1)
 else:
-    log_data['top_winner_2'] = ['N/A']
-    log_data['top_winner_2_prob'] = [0]
-
-df_log = pd.DataFrame(log_data)
+    log_data['top_winner_2'] = 'N/A'
+    log_data['top_winner_2_prob'] = 0
 
-os.makedirs("logs", exist_ok=True)
-log_file = "logs/prediction_log.csv"
-
-# Append to file or create if it doesn’t exist
-if os.path.exists(log_file):
-    df_log.to_csv(log_file, mode='a', header=False, index=False)
-else:
-    df_log.to_csv(log_file, index=False)
+# Append to file or create if it doesn’t exist; close() flushes the background writer
+prediction_logger = BufferedCSVLogger("logs/prediction_log.csv", list(log_data.keys()), overflow='block')
+prediction_logger.log(log_data)
+prediction_logger.close()
 
 print("\n🗂️ Prediction saved to logs/prediction_log.csv")
 
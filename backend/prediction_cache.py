@@ -0,0 +1,105 @@
+import hashlib
+import json
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+def normalize_name(name):
+    """Normalize a driver/constructor/circuit name so equivalent spellings share a cache key"""
+    return " ".join(unicodedata.normalize('NFC', str(name)).split())
+
+def canonicalize_request(request):
+    """Return a copy of a PredictionRequest with normalized names and entries in grid order"""
+    entries = [
+        entry.model_copy(update={
+            'driver': normalize_name(entry.driver),
+            'constructor': normalize_name(entry.constructor)
+        })
+        for entry in request.entries
+    ]
+    entries.sort(key=lambda entry: (entry.grid, entry.driver, entry.constructor))
+
+    return request.model_copy(update={
+        'circuit': normalize_name(request.circuit),
+        'weather': normalize_name(request.weather),
+        'entries': entries
+    })
+
+def canonical_request_key(request, model_version):
+    """Stable hash of a canonical PredictionRequest plus the loaded model version"""
+    payload = {
+        'model_version': model_version,
+        'request': request.model_dump(mode='json')
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+def seed_from_key(key):
+    """Derive a deterministic RNG seed from a cache key"""
+    # 52 bits keeps the seed exactly representable as a JavaScript number
+    return int(key[:13], 16)
+
+class PredictionCache:
+    """Thread-safe LRU cache with per-entry time-to-live"""
+
+    def __init__(self, max_size=256, ttl=300.0):
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss or expired entry"""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = item
+            if self.ttl and time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entries beyond max_size"""
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (self.ttl or 0), value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        """Drop every cached entry (e.g. after models are reloaded)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Counters for monitoring the cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,180 @@
+import csv
+import os
+import queue
+import threading
+import time
+
+OVERFLOW_POLICIES = ('drop', 'block')
+
+_STOP = object()
+
+# Guards the lazy start of writer threads; replaced in forked children in case the fork happened mid-start
+_start_lock = threading.Lock()
+
+def _reset_start_lock():
+    global _start_lock
+    _start_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_start_lock)
+
+class BufferedCSVLogger:
+    """Append rows to a CSV file from a background thread, in batches"""
+
+    def __init__(self, path, fieldnames, max_queue=1000, batch_size=50, flush_interval=1.0,
+                 overflow='drop', block_timeout=1.0):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow}', expected one of {OVERFLOW_POLICIES}")
+
+        self.path = path
+        self.fieldnames = list(fieldnames)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+
+        self.queued = 0
+        self.written = 0
+        self.dropped = 0
+
+        self.max_queue = max_queue
+        self._closed = False
+        self._pid = None
+        self._queue = None
+        self._thread = None
+
+    def _started(self):
+        """Whether this process has its own queue and writer thread"""
+        return self._pid == os.getpid()
+
+    def _start(self):
+        # Started on the first log() in each process: threads don't survive fork, and forked
+        # children that never log (simulation pools, loky workers) shouldn't run a writer
+        with _start_lock:
+            if self._started():
+                return
+            self.queued = self.written = 0
+            self._queue = queue.Queue(maxsize=self.max_queue)
+            self._thread = threading.Thread(target=self._run, name=f"csv-logger:{os.path.basename(self.path)}", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def log(self, row):
+        """Queue a row for writing; returns False if it was dropped"""
+        if self._closed:
+            self.dropped += 1
+            return False
+        if not self._started():
+            self._start()
+
+        try:
+            if self.overflow == 'block':
+                self._queue.put(row, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+        self.queued += 1
+        return True
+
+    def flush(self, timeout=5.0):
+        """Block until every row queued so far has been written"""
+        if self._closed or not self._started():
+            return True
+
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Write any pending rows and stop the writer thread; returns how many queued rows were lost"""
+        if self._closed or not self._started():
+            self._closed = True
+            return 0
+
+        self._closed = True
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+        # Rows still queued when the writer gave up, or whose batch failed to write
+        lost = self.queued - self.written
+        if lost:
+            print(f"⚠️ Prediction log closed with {lost} unwritten rows ({self.path})")
+        return lost
+
+    def stats(self):
+        """Counters for monitoring the logger"""
+        return {
+            'queued': self._queue.qsize() if self._started() else 0,
+            'written': self.written,
+            'dropped': self.dropped
+        }
+
+    def _run(self):
+        pending = []
+        deadline = None
+
+        while True:
+            timeout = self.flush_interval if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._write(pending)
+                return
+
+            if isinstance(item, threading.Event):
+                self._write(pending)
+                pending, deadline = [], None
+                item.set()
+                continue
+
+            if item is not None:
+                pending.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            if pending and (len(pending) >= self.batch_size or time.monotonic() >= deadline):
+                self._write(pending)
+                pending, deadline = [], None
+
+    def _write(self, rows):
+        if not rows:
+            return
+
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            write_header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            with open(self.path, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=self.fieldnames, extrasaction='ignore')
+                if write_header:
+                    writer.writeheader()
+                writer.writerows(rows)
+
+            self.written += len(rows)
+        except Exception as e:
+            print(f"Logging error: {e}")
+
+def logger_from_env(path, fieldnames, prefix='PREDICTION_LOG'):
+    """Create a BufferedCSVLogger configured from environment variables"""
+    return BufferedCSVLogger(
+        path,
+        fieldnames,
+        max_queue=int(os.environ.get(f"{prefix}_QUEUE_SIZE", 1000)),
+        batch_size=int(os.environ.get(f"{prefix}_BATCH_SIZE", 50)),
+        flush_interval=float(os.environ.get(f"{prefix}_FLUSH_INTERVAL", 1.0)),
+        overflow=os.environ.get(f"{prefix}_OVERFLOW", 'drop'),
+    )
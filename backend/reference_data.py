@@ -0,0 +1,342 @@
+# Static F1 reference data shared by the API and the training pipeline.
+# Every table is built once at import time and exposed as a read-only mapping of
+# compact NamedTuple records, so request handlers and feature builders only do lookups.
+from types import MappingProxyType
+from typing import NamedTuple, Tuple
+
+class TemperatureRange(NamedTuple):
+    low: int
+    high: int
+
+class DriverProfile(NamedTuple):
+    aggression: float
+    risk_tolerance: float
+    adaptability: float
+
+class TeamStrategy(NamedTuple):
+    aggression: float
+    risk_tolerance: float
+    innovation: float
+
+class CircuitStrategyFactors(NamedTuple):
+    overtaking_difficulty: float
+    tire_wear: float
+    strategy_importance: float
+
+class StrategyOptions(NamedTuple):
+    conservative: Tuple[str, ...]
+    aggressive: Tuple[str, ...]
+    alternative: Tuple[str, ...]
+
+class DriverPerformance(NamedTuple):
+    experience: int
+    form: float
+    quali_gap: float
+    win_factor: float
+
+class ConstructorPerformance(NamedTuple):
+    standing: int
+    efficiency: float
+    pace_factor: float
+
+class CircuitFeatures(NamedTuple):
+    type: str
+    drs_zones: int
+    lap_length: float
+
+def _frozen(mapping):
+    """Wrap a dict in a read-only view"""
+    return MappingProxyType(dict(mapping))
+
+# Ambient temperature ranges (°C) based on circuit locations and seasons
+TEMPERATURE_RANGES = _frozen({
+    'Bahrain International Circuit': TemperatureRange(25, 35),
+    'Jeddah Corniche Circuit': TemperatureRange(28, 38),
+    'Albert Park Circuit': TemperatureRange(18, 28),
+    'Suzuka Circuit': TemperatureRange(15, 25),
+    'Shanghai International Circuit': TemperatureRange(12, 22),
+    'Miami International Autodrome': TemperatureRange(26, 35),
+    'Imola': TemperatureRange(16, 26),
+    'Monaco Circuit': TemperatureRange(18, 28),
+    'Circuit de Barcelona-Catalunya': TemperatureRange(16, 26),
+    'Circuit Gilles Villeneuve': TemperatureRange(12, 22),
+    'Red Bull Ring': TemperatureRange(14, 24),
+    'Silverstone Circuit': TemperatureRange(12, 22),
+    'Hungaroring': TemperatureRange(18, 30),
+    'Circuit de Spa-Francorchamps': TemperatureRange(10, 20),
+    'Circuit Zandvoort': TemperatureRange(12, 22),
+    'Monza Circuit': TemperatureRange(16, 26),
+    'Marina Bay Street Circuit': TemperatureRange(26, 32),
+    'Baku City Circuit': TemperatureRange(20, 30),
+    'Circuit of the Americas': TemperatureRange(18, 28),
+    'Autódromo Hermanos Rodríguez': TemperatureRange(16, 24),
+    'Interlagos': TemperatureRange(18, 28),
+    'Las Vegas Strip Circuit': TemperatureRange(10, 25),
+    'Losail International Circuit': TemperatureRange(22, 32),
+    'Yas Marina Circuit': TemperatureRange(24, 32)
+})
+
+# Driver personality profiles based on real F1 characteristics
+DRIVER_PROFILES = _frozen({
+    # Aggressive risk-takers
+    'Max Verstappen': DriverProfile(0.9, 0.85, 0.9),
+    'Charles Leclerc': DriverProfile(0.85, 0.8, 0.8),
+    'Lando Norris': DriverProfile(0.75, 0.7, 0.85),
+    'Pierre Gasly': DriverProfile(0.8, 0.75, 0.8),
+
+    # Strategic and calculated
+    'Lewis Hamilton': DriverProfile(0.7, 0.6, 0.95),
+    'Fernando Alonso': DriverProfile(0.75, 0.8, 0.95),
+    'George Russell': DriverProfile(0.6, 0.5, 0.8),
+    'Oscar Piastri': DriverProfile(0.65, 0.6, 0.8),
+
+    # Conservative but opportunistic
+    'Carlos Sainz': DriverProfile(0.7, 0.65, 0.75),
+    'Alex Albon': DriverProfile(0.6, 0.55, 0.7),
+    'Nico Hülkenberg': DriverProfile(0.65, 0.6, 0.8),
+    'Esteban Ocon': DriverProfile(0.6, 0.55, 0.7),
+
+    # Inexperienced but eager
+    'Kimi Antonelli': DriverProfile(0.8, 0.9, 0.6),
+    'Oliver Bearman': DriverProfile(0.75, 0.8, 0.65),
+    'Franco Colapinto': DriverProfile(0.7, 0.75, 0.6),
+    'Gabriel Bortoleto': DriverProfile(0.7, 0.8, 0.6),
+    'Isack Hadjar': DriverProfile(0.75, 0.8, 0.6),
+    'Liam Lawson': DriverProfile(0.8, 0.75, 0.65),
+
+    # Steady and consistent
+    'Lance Stroll': DriverProfile(0.5, 0.4, 0.6),
+    'Yuki Tsunoda': DriverProfile(0.7, 0.7, 0.65),
+})
+DEFAULT_DRIVER_PROFILE = DriverProfile(0.6, 0.6, 0.6)
+
+# Team strategy philosophies based on real F1 team approaches
+TEAM_STRATEGIES = _frozen({
+    'Red Bull Racing': TeamStrategy(0.85, 0.8, 0.9),
+    'Ferrari': TeamStrategy(0.8, 0.75, 0.7),
+    'McLaren': TeamStrategy(0.7, 0.65, 0.85),
+    'Mercedes': TeamStrategy(0.6, 0.5, 0.8),
+    'Aston Martin': TeamStrategy(0.7, 0.6, 0.8),
+    'Alpine': TeamStrategy(0.75, 0.7, 0.7),
+    'Williams': TeamStrategy(0.6, 0.8, 0.6),
+    'Haas': TeamStrategy(0.65, 0.75, 0.5),
+    'RB': TeamStrategy(0.75, 0.7, 0.75),
+    'Kick Sauber': TeamStrategy(0.7, 0.8, 0.6),
+})
+DEFAULT_TEAM_STRATEGY = TeamStrategy(0.6, 0.6, 0.6)
+
+# Circuit characteristics affecting strategy
+CIRCUIT_STRATEGY_FACTORS = _frozen({
+    # Overtaking difficulty affects strategy aggression
+    'Monaco Circuit': CircuitStrategyFactors(0.95, 0.3, 0.9),
+    'Hungaroring': CircuitStrategyFactors(0.85, 0.4, 0.85),
+    'Marina Bay Street Circuit': CircuitStrategyFactors(0.8, 0.5, 0.8),
+
+    # High tire wear circuits
+    'Circuit de Spa-Francorchamps': CircuitStrategyFactors(0.3, 0.8, 0.7),
+    'Silverstone Circuit': CircuitStrategyFactors(0.4, 0.75, 0.7),
+    'Circuit de Barcelona-Catalunya': CircuitStrategyFactors(0.7, 0.6, 0.8),
+
+    # Power circuits with DRS effectiveness
+    'Monza Circuit': CircuitStrategyFactors(0.2, 0.4, 0.5),
+    'Baku City Circuit': CircuitStrategyFactors(0.3, 0.5, 0.6),
+
+    # Balanced circuits
+    'Circuit Gilles Villeneuve': CircuitStrategyFactors(0.5, 0.6, 0.6),
+    'Circuit of the Americas': CircuitStrategyFactors(0.4, 0.7, 0.65),
+})
+DEFAULT_CIRCUIT_STRATEGY_FACTORS = CircuitStrategyFactors(0.5, 0.6, 0.6)
+
+# Tire strategy options per race condition
+WET_STRATEGIES = StrategyOptions(
+    conservative=(
+        "Full Wet → Intermediate → Medium",
+        "Intermediate → Medium",
+        "Full Wet → Intermediate"
+    ),
+    aggressive=(
+        "Intermediate → Soft (risky dry gamble)",
+        "Full Wet → Medium (early switch)",
+        "Intermediate → Full Wet → Soft"
+    ),
+    alternative=(
+        "Start on Intermediates (if others on Full Wet)",
+        "Full Wet → Hard (long stint strategy)",
+        "Intermediate → Hard → Soft"
+    )
+)
+
+MIXED_STRATEGIES = StrategyOptions(
+    conservative=(
+        "Intermediate → Medium → Hard",
+        "Intermediate → Hard",
+        "Medium → Hard (if track dries quickly)"
+    ),
+    aggressive=(
+        "Intermediate → Soft → Medium",
+        "Soft → Intermediate → Soft (double switch)",
+        "Medium → Soft (aggressive dry switch)"
+    ),
+    alternative=(
+        "Hard → Intermediate (reverse strategy)",
+        "Intermediate → Soft → Hard",
+        "Start on Mediums (dry gamble)"
+    )
+)
+
+HIGH_DEG_STRATEGIES = StrategyOptions(
+    conservative=(
+        "Medium → Hard",
+        "Hard → Medium",
+        "Medium → Medium"
+    ),
+    aggressive=(
+        "Soft → Medium → Hard",
+        "Soft → Hard",
+        "Medium → Soft (undercut attempt)"
+    ),
+    alternative=(
+        "Hard → Soft (reverse strategy)",
+        "Soft → Medium → Medium",
+        "Medium → Hard → Soft"
+    )
+)
+
+NORMAL_STRATEGIES = StrategyOptions(
+    conservative=(
+        "Medium → Hard",
+        "Soft → Medium",
+        "Hard → Medium"
+    ),
+    aggressive=(
+        "Soft → Soft (double stint on softs)",
+        "Soft → Hard (long second stint)",
+        "Medium → Soft (late attack)"
+    ),
+    alternative=(
+        "Hard → Soft (opposite to field)",
+        "Soft → Medium → Soft",
+        "Medium → Medium"
+    )
+)
+
+FERRARI_MASTER_PLAN = "Hard → Hard (Ferrari master plan 🤔)"
+
+# Drivers who find extra pace when it rains
+WET_SPECIALISTS = frozenset({'Lewis Hamilton', 'Max Verstappen', 'Fernando Alonso'})
+
+# Updated driver performance data for 2025 season
+DRIVER_PERFORMANCE = _frozen({
+    # Top Tier - Championship contenders
+    'Max Verstappen': DriverPerformance(10, 1.5, -0.4, 1.4),
+    'Lewis Hamilton': DriverPerformance(18, 3.2, -0.1, 1.3),
+    'Charles Leclerc': DriverPerformance(7, 2.8, -0.2, 1.25),
+    'Lando Norris': DriverPerformance(6, 2.1, -0.25, 1.2),
+
+    # Second Tier - Regular podium contenders
+    'George Russell': DriverPerformance(4, 4.1, 0.0, 1.15),
+    'Fernando Alonso': DriverPerformance(23, 5.3, 0.1, 1.2),
+    'Oscar Piastri': DriverPerformance(2, 3.4, -0.1, 1.1),
+    'Carlos Sainz': DriverPerformance(10, 4.8, 0.2, 1.1),
+
+    # Midfield - Occasional points
+    'Pierre Gasly': DriverPerformance(7, 7.2, 0.3, 1.0),
+    'Alex Albon': DriverPerformance(5, 8.5, 0.25, 0.95),
+    'Nico Hülkenberg': DriverPerformance(15, 9.2, 0.15, 0.95),
+    'Esteban Ocon': DriverPerformance(8, 8.7, 0.3, 0.9),
+
+    # Lower midfield
+    'Lance Stroll': DriverPerformance(8, 11.8, 0.4, 0.85),
+    'Yuki Tsunoda': DriverPerformance(4, 10.1, 0.35, 0.9),
+
+    # Rookies and backmarkers
+    'Kimi Antonelli': DriverPerformance(1, 12.5, 0.6, 0.8),
+    'Oliver Bearman': DriverPerformance(1, 14.2, 0.7, 0.8),
+    'Franco Colapinto': DriverPerformance(1, 15.1, 0.8, 0.75),
+    'Gabriel Bortoleto': DriverPerformance(1, 16.3, 0.9, 0.7),
+    'Isack Hadjar': DriverPerformance(1, 15.8, 0.85, 0.75),
+    'Liam Lawson': DriverPerformance(2, 13.9, 0.55, 0.85)
+})
+DEFAULT_DRIVER_PERFORMANCE = DriverPerformance(3, 15.0, 0.8, 0.7)
+
+# 2025 season constructor competitiveness
+CONSTRUCTOR_PERFORMANCE = _frozen({
+    'McLaren': ConstructorPerformance(1, 0.98, 1.0),
+    'Ferrari': ConstructorPerformance(2, 0.95, 0.98),
+    'Red Bull Racing': ConstructorPerformance(3, 0.93, 0.96),
+    'Mercedes': ConstructorPerformance(4, 0.90, 0.94),
+    'Aston Martin': ConstructorPerformance(5, 0.85, 0.88),
+    'Alpine': ConstructorPerformance(6, 0.82, 0.85),
+    'Williams': ConstructorPerformance(9, 0.78, 0.82),
+    'Haas': ConstructorPerformance(7, 0.80, 0.83),
+    'RB': ConstructorPerformance(8, 0.79, 0.84),
+    'Kick Sauber': ConstructorPerformance(10, 0.75, 0.80)
+})
+DEFAULT_CONSTRUCTOR_PERFORMANCE = ConstructorPerformance(10, 0.75, 0.80)
+
+# Base win probability (%) from constructor competitiveness
+BASE_WIN_PROBABILITY = _frozen({
+    'McLaren': 25, 'Ferrari': 22, 'Red Bull Racing': 20, 'Mercedes': 18,
+    'Aston Martin': 8, 'Alpine': 4, 'Williams': 2, 'Haas': 1,
+    'RB': 1.5, 'Kick Sauber': 0.5
+})
+DEFAULT_BASE_WIN_PROBABILITY = 1.0
+
+# Circuit-specific characteristics
+CIRCUIT_FEATURES = _frozen({
+    'Monaco Circuit': CircuitFeatures('Street', 1, 3.337),
+    'Marina Bay Street Circuit': CircuitFeatures('Street', 3, 5.063),
+    'Baku City Circuit': CircuitFeatures('Street', 2, 6.003),
+    'Jeddah Corniche Circuit': CircuitFeatures('Street', 3, 6.174),
+    'Las Vegas Strip Circuit': CircuitFeatures('Street', 2, 6.201),
+    'Monza Circuit': CircuitFeatures('Power', 2, 5.793),
+    'Silverstone Circuit': CircuitFeatures('Balanced', 2, 5.891),
+    'Hungaroring': CircuitFeatures('Twisty', 1, 4.381),
+    'Circuit de Spa-Francorchamps': CircuitFeatures('Power', 2, 7.004)
+})
+DEFAULT_CIRCUIT_FEATURES = CircuitFeatures('Balanced', 2, 5.0)
+
+# F1 points for each classified finishing position
+POINTS_SYSTEM = _frozen({
+    1: 25, 2: 18, 3: 15, 4: 12, 5: 10,
+    6: 8, 7: 6, 8: 4, 9: 2, 10: 1
+})
+
+# Career length (seasons) used by the training pipeline, including 2025
+DRIVER_EXPERIENCE = _frozen({
+    # Veterans
+    'Lewis Hamilton': 19,           # 2007–2025
+    'Fernando Alonso': 21,          # 2001–2018, 2021–2025 (break: 2019–2020)
+    'Nico Hülkenberg': 13,          # 2010–2019, 2023–2025 (break: 2020–2022)
+    'Nico Hulkenberg': 13,          # Alternative spelling
+
+    # Current stars
+    'Max Verstappen': 11,           # 2015–2025
+    'Charles Leclerc': 7,           # 2018–2025
+    'Lando Norris': 7,              # 2019–2025
+    'George Russell': 6,            # 2019–2025
+    'Pierre Gasly': 8,              # 2017–2025
+    'Esteban Ocon': 8,              # 2016, 2017–2018, 2020–2025 (missed 2019)
+    'Lance Stroll': 8,              # 2017–2025
+    'Yuki Tsunoda': 5,              # 2021–2025
+    'Alex Albon': 5,                # 2019–2020, 2022–2025 (missed 2021)
+    'Alexander Albon': 5,           # Alternative name
+    'Carlos Sainz': 11,             # 2015–2025
+    'Oscar Piastri': 3,             # 2023–2025
+
+    # 2025 rookies and newer drivers
+    'Kimi Antonelli': 1,            # Debuted 2025
+    'Oliver Bearman': 1,            # Partial 2024 debut, full season 2025
+    'Jack Doohan': 1,               # Debuted 2025
+    'Franco Colapinto': 1,          # Partial 2024, full 2025
+    'Gabriel Bortoleto': 1,         # Debuted 2025
+    'Isack Hadjar': 1,              # Debuted 2025
+    'Liam Lawson': 2,               # Partial 2023, full 2025 (missed 2024)
+
+    # Historical drivers - add some common ones
+    'Sebastian Vettel': 15,
+    'Daniel Ricciardo': 13,
+    'Valtteri Bottas': 11,
+    'Sergio Pérez': 14,
+    'Sergio Perez': 14,
+})
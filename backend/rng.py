@@ -0,0 +1,25 @@
+import numpy as np
+
+def make_rng(seed=None):
+    """Create a numpy Generator; an existing Generator is passed through unchanged"""
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+def spawn_seeds(seed, n):
+    """Derive n independent, picklable seed sequences for worker processes"""
+    if isinstance(seed, np.random.SeedSequence):
+        return seed.spawn(n)
+    return np.random.SeedSequence(seed).spawn(n)
+
+def spawn_rngs(seed, n):
+    """Derive n independent Generators from one seed"""
+    return [np.random.default_rng(child) for child in spawn_seeds(seed, n)]
+
+def choice(rng, options):
+    """Pick one element of a sequence, preserving its Python type"""
+    return options[int(rng.integers(len(options)))]
+
+def randint(rng, low, high):
+    """Random integer in [low, high] inclusive, like random.randint"""
+    return int(rng.integers(low, high + 1))
@@ -0,0 +1,144 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from rng import spawn_seeds
+from simulator import points_by_position, simulate_finishing_orders, wet_specialist_bonus
+
+DEFAULT_SEASONS_PER_SHARD = 50000
+
+# Shard workers are started from a clean server process: the API process runs threads
+# (event loop, inference pool, log writer) and forking it could copy a held lock
+POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+def title_shares(totals):
+    """Titles won per column over the simulated seasons (rows); a shared first place is split evenly"""
+    leaders = totals == totals.max(axis=1, keepdims=True)
+    return (leaders / leaders.sum(axis=1, keepdims=True)).sum(axis=0)
+
+def simulate_season_shard(rounds, starting_points, team_index, n_teams, starting_team_points,
+                          n_seasons, seed, chunk_size=10000):
+    """Simulate n_seasons full remaining calendars and return summed histograms
+
+    rounds: list of (support, spread, weather, wet_bonus) per remaining race
+    team_index: constructor index of every driver
+    starting_team_points: current constructor standings, which already include
+    the drivers' starting_points, so only points scored in the simulated races
+    are added to them
+    """
+    rng = np.random.default_rng(seed)
+    starting_points = np.asarray(starting_points, dtype=np.float64)
+    starting_team_points = np.asarray(starting_team_points, dtype=np.float64)
+    n_drivers = len(starting_points)
+
+    race_points = points_by_position(n_drivers)
+    driver_titles = np.zeros(n_drivers)
+    team_titles = np.zeros(n_teams)
+    driver_position_histogram = np.zeros((n_drivers, n_drivers), dtype=np.int64)
+    driver_points_sum = np.zeros(n_drivers)
+    team_points_sum = np.zeros(n_teams)
+
+    # Driver -> constructor membership so team totals are one matrix product
+    membership = np.zeros((n_drivers, n_teams))
+    membership[np.arange(n_drivers), team_index] = 1.0
+    position_columns = np.arange(n_drivers)
+
+    for start in range(0, n_seasons, chunk_size):
+        n = min(chunk_size, n_seasons - start)
+        totals = np.repeat(starting_points[None, :], n, axis=0)
+
+        for support, spread, weather, wet_bonus in rounds:
+            order = simulate_finishing_orders(support, spread, weather, n, rng, wet_bonus)
+            earned = np.empty((n, n_drivers))
+            np.put_along_axis(earned, order, race_points[None, :], axis=1)
+            totals += earned
+
+        team_totals = (totals - starting_points) @ membership + starting_team_points
+
+        driver_titles += title_shares(totals)
+        team_titles += title_shares(team_totals)
+        driver_points_sum += totals.sum(axis=0)
+        team_points_sum += team_totals.sum(axis=0)
+
+        standings = np.argsort(-totals, axis=1, kind='stable')
+        driver_position_histogram += np.bincount(
+            (standings * n_drivers + position_columns).ravel(),
+            minlength=n_drivers * n_drivers
+        ).reshape(n_drivers, n_drivers)
+
+    return {
+        'n_seasons': n_seasons,
+        'driver_titles': driver_titles,
+        'team_titles': team_titles,
+        'driver_position_histogram': driver_position_histogram,
+        'driver_points_sum': driver_points_sum,
+        'team_points_sum': team_points_sum,
+    }
+
+def merge_shards(results):
+    """Sum the histograms and counters of several shards"""
+    merged = None
+    for result in results:
+        if merged is None:
+            merged = {key: np.copy(value) if isinstance(value, np.ndarray) else value for key, value in result.items()}
+            continue
+        for key, value in result.items():
+            merged[key] = merged[key] + value
+    return merged
+
+def prepare_rounds(round_inputs, wet_specialists):
+    """Attach the wet specialist bonus to each (support, spread, weather) round"""
+    rounds = []
+    for support, spread, weather in round_inputs:
+        support = np.asarray(support, dtype=np.float64)
+        rounds.append((support, spread, weather, wet_specialist_bonus(weather, wet_specialists, support.shape[0])))
+    return rounds
+
+def iter_season_projection(round_inputs, starting_points, team_index, n_teams, starting_team_points,
+                           n_seasons, seed=None, workers=None, seasons_per_shard=DEFAULT_SEASONS_PER_SHARD,
+                           wet_specialists=None):
+    """Run a sharded season projection, yielding progress dicts and finally the merged result
+
+    Each shard gets an independent RNG stream and shards are merged in order,
+    so the merged result only depends on the seed and shard size, never on the
+    number of workers or which shard finishes first.
+    """
+    rounds = prepare_rounds(round_inputs, wet_specialists)
+    n_shards = max(1, -(-n_seasons // seasons_per_shard))
+    shard_sizes = [min(seasons_per_shard, n_seasons - i * seasons_per_shard) for i in range(n_shards)]
+    seeds = spawn_seeds(seed, n_shards)
+    workers = workers or os.cpu_count() or 1
+
+    shard_args = [
+        (rounds, starting_points, team_index, n_teams, starting_team_points, size, shard_seed)
+        for size, shard_seed in zip(shard_sizes, seeds)
+    ]
+
+    results = [None] * n_shards
+    completed_seasons = 0
+    if workers == 1 or n_shards == 1:
+        for i, args in enumerate(shard_args):
+            results[i] = simulate_season_shard(*args)
+            completed_seasons += results[i]['n_seasons']
+            yield {'type': 'progress', 'completed_shards': i + 1, 'total_shards': n_shards,
+                   'completed_seasons': completed_seasons, 'total_seasons': n_seasons}
+    else:
+        context = multiprocessing.get_context(POOL_START_METHOD)
+        with ProcessPoolExecutor(max_workers=min(workers, n_shards), mp_context=context) as executor:
+            futures = {executor.submit(simulate_season_shard, *args): i for i, args in enumerate(shard_args)}
+            for completed, future in enumerate(as_completed(futures), 1):
+                results[futures[future]] = future.result()
+                completed_seasons += results[futures[future]]['n_seasons']
+                yield {'type': 'progress', 'completed_shards': completed, 'total_shards': n_shards,
+                       'completed_seasons': completed_seasons, 'total_seasons': n_seasons}
+
+    # Float sums depend on addition order, so shards are merged in submission order
+    yield {'type': 'result', 'result': merge_shards(results)}
+
+def project_season(*args, **kwargs):
+    """Run a season projection to completion and return the merged result"""
+    for event in iter_season_projection(*args, **kwargs):
+        if event['type'] == 'result':
+            return event['result']
@@ -0,0 +1,155 @@
+"""Production server: load the model bundle once, then prefork uvicorn workers that share it
+
+    python serve.py --workers 4 --port 8000
+
+The parent imports the app and loads every model before forking, so workers
+inherit the forests instead of each unpickling its own copy. Memory-mapped
+tree arrays are shared through the page cache and everything else is shared
+copy-on-write. The parent restarts workers that die; SIGHUP makes every
+worker reload the CURRENT bundle (with its feature store) and
+form_state.json, SIGTERM/SIGINT shut
+them down gracefully. /api/form/update, /api/models/reload and
+/api/models/rollback only run in the worker that got the request, so that
+worker sends the parent a SIGHUP afterwards and every worker follows.
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+import uvicorn
+
+RESTART_BACKOFF = 1.0   # seconds between restarts of a worker that keeps dying
+
+def load_app():
+    """Import the API and load every model so workers inherit them ready to serve"""
+    import app as api
+
+    serving = api.model_registry.current
+    if serving is not None:
+        started = time.perf_counter()
+        serving.bundle.load_all()
+        print(f"✅ Model bundle {serving.version} loaded in the parent in {time.perf_counter() - started:.2f}s")
+
+    # Move everything loaded so far out of the collector's generations so
+    # collections in the workers don't write to (and un-share) those pages
+    gc.collect()
+    gc.freeze()
+    return api
+
+def bind_socket(host, port, backlog):
+    sock = socket.socket(socket.AF_INET6 if ':' in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    # Accepted connections inherit this; without it small responses wait ~40ms on delayed ACKs
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+def run_worker(api, sock, args):
+    """Serve on the shared listening socket until uvicorn shuts down, then exit the child"""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    # Reload off the event loop; requests keep being served by the current bundle meanwhile
+    signal.signal(signal.SIGHUP, lambda *_: start_sync(api))
+    # Endpoints that change form or models ask the parent to SIGHUP every worker
+    api.sync_workers = lambda: os.kill(os.getppid(), signal.SIGHUP)
+    # A restarted worker forks the parent's startup state; catch up with changes made since
+    start_sync(api)
+
+    config = uvicorn.Config(api.app, log_level=args.log_level, access_log=args.access_log,
+                            timeout_keep_alive=args.keep_alive)
+    status = 0
+    try:
+        uvicorn.Server(config).run(sockets=[sock])
+    except Exception as e:
+        print(f"❌ Worker {os.getpid()} crashed: {e}")
+        status = 1
+    finally:
+        sys.stdout.flush()
+        os._exit(status)
+
+def start_sync(api):
+    threading.Thread(target=sync_worker, args=(api,), daemon=True).start()
+
+def sync_worker(api):
+    try:
+        api.sync_shared_state()
+    except Exception as e:
+        print(f"⚠️ Worker {os.getpid()} reload failed: {e}")
+
+def serve(args):
+    if not hasattr(os, 'fork'):
+        sys.exit("serve.py needs os.fork(); on this platform run: uvicorn app:app --workers N")
+
+    sock = bind_socket(args.host, args.port, args.backlog)
+    api = load_app()
+
+    workers = {}
+    stopping = False
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            run_worker(api, sock, args)
+        workers[pid] = time.monotonic()
+
+    def forward(signum, frame):
+        nonlocal stopping
+        if signum in (signal.SIGTERM, signal.SIGINT):
+            stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM if signum == signal.SIGINT else signum)
+            except ProcessLookupError:
+                pass
+
+    for _ in range(args.workers):
+        spawn()
+    print(f"🏎️  Serving on http://{args.host}:{args.port} with {args.workers} workers (parent {os.getpid()})")
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    signal.signal(signal.SIGHUP, forward)
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        started = workers.pop(pid, None)
+        if started is None or stopping:
+            continue
+
+        print(f"⚠️ Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}, restarting")
+        if time.monotonic() - started < RESTART_BACKOFF:
+            time.sleep(RESTART_BACKOFF)
+        if not stopping:
+            spawn()
+
+    sock.close()
+    print("👋 All workers stopped")
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the F1 predictor API with preforked workers")
+    parser.add_argument("--host", default=os.environ.get("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1)),
+                        help="worker processes (default: $WEB_CONCURRENCY or the CPU count)")
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--keep-alive", type=int, default=5, help="seconds to keep idle connections open")
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--access-log", action=argparse.BooleanOptionalAction, default=True)
+    args = parser.parse_args()
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    serve(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import numpy as np
+
+from reference_data import POINTS_SYSTEM
+from rng import make_rng
+
+# Race-to-race randomness, in finishing positions, by weather (rain makes races less predictable)
+WEATHER_NOISE_STD = {'Dry': 1.0, 'Mixed': 2.0, 'Wet': 3.0}
+
+# Positions gained by wet weather specialists when it rains
+WET_SPECIALIST_BONUS = 1.0
+
+# Safety car laps per race follow the same Poisson(3) used for training features
+SAFETY_CAR_MEAN_LAPS = 3
+SAFETY_CAR_SHUFFLE_PER_LAP = 0.4  # extra position spread per safety car lap (bunched field)
+
+# Pit stop time loss, matching the avg_pit_time range used for training features
+PIT_TIME_RANGE = (2.0, 4.5)
+PIT_LOSS_POSITIONS_PER_SECOND = 0.8
+
+DEFAULT_POSITION_STD = 3.0
+
+def points_by_position(n_drivers):
+    """F1 points for positions 1..n_drivers as an array"""
+    return np.array([POINTS_SYSTEM.get(position, 0) for position in range(1, n_drivers + 1)], dtype=np.float64)
+
+def model_position_distribution(model, X, fallback_positions, default_std=DEFAULT_POSITION_STD):
+    """Per-driver predicted position distribution as (support, spread)
+
+    For a random forest every tree's prediction is one sample of the driver's
+    finishing position, so support has one column per tree. Models that predict
+    a distribution over positions give quantiles of it instead. Other models
+    give a single column with a gaussian spread around it.
+    """
+    fallback = np.asarray(fallback_positions, dtype=np.float64)[:, None]
+
+    try:
+        estimators = getattr(model, 'estimators_', None)
+        if isinstance(estimators, list) and estimators:
+            support = np.column_stack([tree.predict(X) for tree in estimators])
+            return support, 0.0
+        if hasattr(model, 'position_samples'):
+            return model.position_samples(X), 0.0
+        return np.asarray(model.predict(X), dtype=np.float64)[:, None], default_std
+    except Exception:
+        return fallback, default_std
+
+def wet_specialist_bonus(weather, wet_specialists, n_drivers):
+    """Per-driver position bonus applied in the rain"""
+    if weather == 'Wet' and wet_specialists is not None:
+        return np.asarray(wet_specialists, dtype=np.float64) * WET_SPECIALIST_BONUS
+    return np.zeros(n_drivers)
+
+def simulate_finishing_orders(support, spread, weather, n, rng, wet_bonus=None):
+    """Simulate n races at once; returns order[i, j] = driver finishing in position j+1 of race i"""
+    n_drivers, n_support = support.shape
+
+    # Model pace: draw each driver's position from their predicted distribution
+    if n_support > 1:
+        score = support[np.arange(n_drivers), rng.integers(n_support, size=(n, n_drivers))]
+    else:
+        score = np.repeat(support[:, 0][None, :], n, axis=0)
+
+    # Weather, safety car and model spread combine into one gaussian per driver per race
+    weather_std = WEATHER_NOISE_STD.get(weather, WEATHER_NOISE_STD['Dry'])
+    safety_car_laps = rng.poisson(SAFETY_CAR_MEAN_LAPS, size=(n, 1))
+    race_std = np.sqrt(weather_std ** 2 + spread ** 2 + (SAFETY_CAR_SHUFFLE_PER_LAP * safety_car_laps) ** 2)
+    score += rng.standard_normal((n, n_drivers)) * race_std
+
+    # Strategy: time lost in the pits relative to an average stop
+    pit_mean = sum(PIT_TIME_RANGE) / 2
+    score += (rng.uniform(*PIT_TIME_RANGE, size=(n, n_drivers)) - pit_mean) * PIT_LOSS_POSITIONS_PER_SECOND
+    if wet_bonus is not None:
+        score -= wet_bonus
+
+    return np.argsort(score, axis=1)
+
+def simulate_race(support, spread=0.0, weather='Dry', n_simulations=10000, rng=None,
+                  wet_specialists=None, chunk_size=25000):
+    """Run n_simulations races at once and aggregate finishing position counts
+
+    support: (n_drivers, k) array of position samples per driver
+    Returns a dict of per-driver arrays (histogram counts and derived probabilities).
+    """
+    rng = make_rng(rng)
+    support = np.asarray(support, dtype=np.float64)
+    n_drivers = support.shape[0]
+
+    histogram = np.zeros((n_drivers, n_drivers), dtype=np.int64)
+    if n_drivers == 0 or n_simulations <= 0:
+        return summarize_histogram(histogram, 0)
+
+    position_columns = np.arange(n_drivers)
+    wet_bonus = wet_specialist_bonus(weather, wet_specialists, n_drivers)
+
+    for start in range(0, n_simulations, chunk_size):
+        n = min(chunk_size, n_simulations - start)
+        order = simulate_finishing_orders(support, spread, weather, n, rng, wet_bonus)
+        histogram += np.bincount(
+            (order * n_drivers + position_columns).ravel(),
+            minlength=n_drivers * n_drivers
+        ).reshape(n_drivers, n_drivers)
+
+    return summarize_histogram(histogram, n_simulations)
+
+def summarize_histogram(histogram, n_simulations):
+    """Turn (driver x position) counts into probabilities and expected points"""
+    n_drivers = histogram.shape[0]
+    probabilities = histogram / n_simulations if n_simulations else np.zeros_like(histogram, dtype=np.float64)
+    positions = np.arange(1, n_drivers + 1)
+
+    return {
+        'histogram': histogram,
+        'position_probabilities': probabilities,
+        'win_probability': probabilities[:, 0] if n_drivers else np.zeros(0),
+        'podium_probability': probabilities[:, :3].sum(axis=1),
+        'points_probability': probabilities[:, :10].sum(axis=1),
+        'expected_position': probabilities @ positions,
+        'expected_points': probabilities @ points_by_position(n_drivers),
+    }
@@ -0,0 +1,175 @@
+import argparse
+import os
+import shutil
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    HAS_PYARROW = True
+except ImportError:
+    pa = None
+    ds = None
+    HAS_PYARROW = False
+
+RESULTS_CSV = "data/f1_multi_year_results.csv"
+RESULTS_DATASET = "data/results_parquet"
+
+# Columns that repeat a small set of strings are stored dictionary-encoded
+CATEGORICAL_COLUMNS = ['race_name', 'circuit', 'driver', 'constructor', 'status', 'weather', 'tire_strategy']
+
+def results_schema():
+    """Explicit Arrow schema for the race results dataset"""
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ('season', pa.int16()),
+        ('round', pa.int16()),
+        ('race_name', dictionary),
+        ('circuit', dictionary),
+        ('date', pa.date32()),
+        ('driver', dictionary),
+        ('constructor', dictionary),
+        ('grid', pa.int16()),
+        ('position', pa.int16()),
+        ('points', pa.float32()),
+        ('status', dictionary),
+        ('weather', dictionary),
+        ('tire_strategy', dictionary),
+        ('gap_to_leader', pa.string()),
+        ('fastest_lap_time', pa.string()),
+    ])
+
+def _require_pyarrow():
+    if not HAS_PYARROW:
+        raise ImportError("pyarrow is required for columnar storage: pip install pyarrow")
+
+def columnar_available(path=RESULTS_DATASET):
+    """True when pyarrow is installed and a converted dataset exists"""
+    return HAS_PYARROW and os.path.isdir(path)
+
+def clean_results_frame(df):
+    """Coerce CSV columns to the schema's types, dropping rows that cannot be parsed"""
+    df = df.copy()
+    for col in ['season', 'round', 'grid', 'position']:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    df['points'] = pd.to_numeric(df['points'], errors='coerce')
+    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+
+    # Stray header rows and unparseable records have no season/round/date
+    df = df.dropna(subset=['season', 'round', 'date'])
+
+    for col in ['season', 'round', 'grid', 'position']:
+        df[col] = df[col].astype('Int16')
+    df['date'] = df['date'].dt.date
+    for col in CATEGORICAL_COLUMNS + ['gap_to_leader', 'fastest_lap_time']:
+        df[col] = df[col].astype('string')
+
+    return df
+
+def _write_table(df, path, existing_data_behavior):
+    schema = results_schema()
+    table = pa.Table.from_pandas(df[schema.names], preserve_index=False)
+    table = table.cast(schema)
+
+    ds.write_dataset(
+        table,
+        path,
+        format='parquet',
+        partitioning=ds.partitioning(pa.schema([('season', pa.int16())]), flavor='hive'),
+        existing_data_behavior=existing_data_behavior
+    )
+    return table.num_rows
+
+def write_results(df, path=RESULTS_DATASET, overwrite=True):
+    """Write results as a Parquet dataset partitioned by season"""
+    _require_pyarrow()
+    if overwrite and os.path.isdir(path):
+        shutil.rmtree(path)
+    return _write_table(clean_results_frame(df), path, 'overwrite_or_ignore')
+
+def append_results(df, path=RESULTS_DATASET):
+    """Add rows to the dataset, rewriting only the season partitions they fall in"""
+    _require_pyarrow()
+    new = clean_results_frame(df)
+    seasons = sorted(int(season) for season in new['season'].unique())
+    if not seasons:
+        return 0
+
+    appended = len(new)
+    if os.path.isdir(path):
+        existing = load_results(path, filter=ds.field('season').isin(seasons))
+        new = pd.concat([clean_results_frame(existing), new], ignore_index=True)
+
+    # Partitions being written are replaced as a whole; other seasons are left untouched
+    _write_table(new, path, 'delete_matching')
+    return appended
+
+def dataset_is_current(path=RESULTS_DATASET, csv_path=RESULTS_CSV):
+    """False when the CSV was written after the dataset, e.g. by an ingest that couldn't update it"""
+    if not os.path.exists(csv_path):
+        return True
+    newest = max(
+        (os.path.getmtime(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names),
+        default=0.0
+    )
+    return newest >= os.path.getmtime(csv_path)
+
+def _dataset(path):
+    schema = results_schema()
+    return ds.dataset(
+        path,
+        format='parquet',
+        schema=schema,
+        partitioning=ds.partitioning(pa.schema([('season', pa.int16())]), flavor='hive')
+    )
+
+def load_results(path=RESULTS_DATASET, columns=None, min_season=None, max_season=None, filter=None):
+    """Load results into pandas, reading only the requested columns and seasons
+
+    Season bounds prune whole partitions; other predicates can be passed as a
+    pyarrow.dataset expression. Dictionary columns come back as categoricals.
+    """
+    _require_pyarrow()
+    dataset = _dataset(path)
+
+    expression = filter
+    if min_season is not None:
+        bound = ds.field('season') >= min_season
+        expression = bound if expression is None else expression & bound
+    if max_season is not None:
+        bound = ds.field('season') <= max_season
+        expression = bound if expression is None else expression & bound
+
+    table = dataset.to_table(columns=columns, filter=expression)
+    df = table.to_pandas(date_as_object=False)
+    if 'date' in df.columns:
+        df['date'] = pd.to_datetime(df['date'])
+    return df
+
+def convert_csv_to_parquet(csv_path=RESULTS_CSV, path=RESULTS_DATASET):
+    """One-off converter from the results CSV to the partitioned Parquet dataset"""
+    df = pd.read_csv(csv_path, dtype=str)
+    rows = write_results(df, path)
+    print(f"✅ Converted {rows} results from {csv_path} to {path}")
+    return rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Columnar storage for the F1 results dataset")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    convert = subparsers.add_parser("convert", help="convert the results CSV to a Parquet dataset")
+    convert.add_argument("--csv", default=RESULTS_CSV)
+    convert.add_argument("--out", default=RESULTS_DATASET)
+
+    info = subparsers.add_parser("info", help="summarize a Parquet dataset")
+    info.add_argument("--path", default=RESULTS_DATASET)
+
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        convert_csv_to_parquet(args.csv, args.out)
+    else:
+        df = load_results(args.path, columns=['season', 'driver'])
+        print(f"📊 {len(df)} results, seasons {df['season'].min()}-{df['season'].max()}, {df['driver'].nunique()} drivers")
+        print(f"💾 {df.memory_usage(deep=True).sum() / 1e6:.2f} MB in memory for the season and driver columns")
@@ -0,0 +1,86 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+from feature_schema import FeatureSchema
+from feature_store import FeatureStore
+from model_bundle import FEATURE_STORE_SUBDIR, save_bundle
+from model_registry import ModelRegistry
+
+def make_store(drivers, experience):
+    """Driver-only store where every driver has the given experience and form 5"""
+    table = np.column_stack([np.full(len(drivers), float(experience)), np.full(len(drivers), 5.0)])
+    return FeatureStore({'driver': table}, {'driver': ['driver_experience', 'recent_form']}, {'driver': drivers})
+
+def make_bundle_parts():
+    """A one-tree position model with encoders and scaler that validate against the feature schema"""
+    schema = FeatureSchema()
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.random((20, len(schema))), columns=list(schema.features))
+    model = RandomForestRegressor(n_estimators=1, random_state=0).fit(X, rng.random(20))
+    label_encoders = {column: LabelEncoder().fit(['a', 'b']) for column in schema.categorical_columns}
+    scaler = StandardScaler().fit(X[list(schema.scaled)])
+    return {'position': model}, label_encoders, scaler, schema
+
+@pytest.fixture
+def models_dir(tmp_path):
+    return str(tmp_path / 'models')
+
+def publish(models_dir, experience, **kwargs):
+    models, label_encoders, scaler, schema = make_bundle_parts()
+    path = save_bundle(models, label_encoders, scaler, schema, root=os.path.join(models_dir, 'bundles'),
+                       metadata={'experience': experience}, **kwargs)
+    return os.path.basename(path)
+
+def test_round_trip_memory_maps_tables(tmp_path):
+    make_store(['Driver A', 'Driver B'], 3).save(str(tmp_path))
+
+    store = FeatureStore.load(str(tmp_path))
+    assert isinstance(store._tables['driver'], np.memmap)
+    assert store.row('driver', 'Driver B') == {'driver_experience': 3.0, 'recent_form': 5.0}
+    assert store.row('driver', 'Nobody') is None
+    np.testing.assert_array_equal(store.rows('driver', ['Nobody', 'Driver A'], default=-1), [[-1, -1], [3, 5]])
+
+def test_saving_over_a_mapped_store_leaves_readers_on_the_old_tables(tmp_path):
+    make_store([f"Driver {i}" for i in range(1000)], 3).save(str(tmp_path))
+    mapped = FeatureStore.load(str(tmp_path))
+
+    # A smaller table written in place would cut the mapping short (SIGBUS) and shift every row
+    make_store(['Driver 999'], 7).save(str(tmp_path))
+
+    assert mapped.row('driver', 'Driver 999') == {'driver_experience': 3.0, 'recent_form': 5.0}
+    assert FeatureStore.load(str(tmp_path)).row('driver', 'Driver 999') == {'driver_experience': 7.0, 'recent_form': 5.0}
+    assert sorted(os.listdir(tmp_path)) == ['driver.npy', 'index.json']
+
+def test_reload_and_rollback_swap_the_feature_store_with_the_bundle(models_dir):
+    first = publish(models_dir, 1, feature_store=make_store(['Driver A'], 1))
+    swaps = []
+    registry = ModelRegistry(root=os.path.join(models_dir, 'bundles'), models_dir=models_dir,
+                             on_swap=lambda previous, current: swaps.append((previous.version, current.version)))
+    serving = registry.open()
+    assert serving.version == first
+    assert serving.feature_store.row('driver', 'Driver A')['driver_experience'] == 1.0
+
+    second = publish(models_dir, 2, feature_store=make_store(['Driver A', 'Driver B'], 2))
+    assert registry.reload()
+    assert registry.current.version == second
+    assert registry.current.feature_store.row('driver', 'Driver B')['driver_experience'] == 2.0
+    # Requests still holding the old version keep reading its own tables
+    assert serving.feature_store.row('driver', 'Driver A')['driver_experience'] == 1.0
+    assert serving.feature_store.row('driver', 'Driver B') is None
+
+    assert registry.rollback() == first
+    assert registry.current.feature_store.row('driver', 'Driver A')['driver_experience'] == 1.0
+    assert registry.info()['current']['version'] == first
+    assert swaps == [(first, second), (second, first)]
+
+def test_bundles_without_a_store_use_the_shared_directory(models_dir):
+    publish(models_dir, 1)
+    make_store(['Driver A'], 4).save(os.path.join(models_dir, FEATURE_STORE_SUBDIR))
+
+    serving = ModelRegistry(root=os.path.join(models_dir, 'bundles'), models_dir=models_dir).open()
+    assert serving.feature_store.row('driver', 'Driver A')['driver_experience'] == 4.0
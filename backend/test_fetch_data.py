@@ -0,0 +1,208 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+
+import fetch_data
+import storage
+from fetch_data import (
+    fetch_season, get_multiple_seasons_results, load_season_cache, make_session, races_to_dataframe,
+)
+
+def make_race(season, rnd, n_drivers):
+    return {
+        'season': str(season),
+        'round': str(rnd),
+        'raceName': f"Race {rnd}",
+        'date': f"{season}-05-{rnd:02d}",
+        'Circuit': {'circuitName': f"Circuit {rnd}"},
+        'Results': [
+            {
+                'position': str(position),
+                'grid': str(position),
+                'points': str(max(0, 11 - position)),
+                'status': 'Finished',
+                'Driver': {'givenName': 'Driver', 'familyName': str(position)},
+                'Constructor': {'name': f"Team {(position + 1) // 2}"},
+            }
+            for position in range(1, n_drivers + 1)
+        ]
+    }
+
+class StandInErgast:
+    """Serves /<year>/results.json like Ergast: paged over result rows, with validators and scripted failures"""
+
+    def __init__(self, seasons):
+        self.seasons = seasons
+        self.versions = {year: 1 for year in seasons}
+        self.failures = {}
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def etag(self, year):
+        return f'"{year}-v{self.versions[year]}"'
+
+    def last_modified(self, year):
+        return f"Mon, {self.versions[year]:02d} Jan 2024 00:00:00 GMT"
+
+    def respond(self, path, query, headers):
+        year = int(path.strip('/').split('/')[0])
+        with self.lock:
+            self.requests.append({'year': year, 'offset': int(query.get('offset', ['0'])[0]), 'headers': headers})
+            scripted = self.failures.get(year)
+            if scripted:
+                return (scripted.pop(0) if isinstance(scripted, list) else scripted), {}, None
+
+        if year not in self.seasons:
+            return 404, {}, None
+
+        validators = {'ETag': self.etag(year), 'Last-Modified': self.last_modified(year)}
+        if headers.get('If-None-Match') == self.etag(year):
+            return 304, validators, None
+
+        limit = int(query.get('limit', ['30'])[0])
+        offset = int(query.get('offset', ['0'])[0])
+        rows = [(race, result) for race in self.seasons[year] for result in race['Results']]
+        races = []
+        for race, result in rows[offset:offset + limit]:
+            if not races or races[-1]['round'] != race['round']:
+                races.append(dict(race, Results=[]))
+            races[-1]['Results'].append(result)
+
+        body = {'MRData': {'limit': str(limit), 'offset': str(offset), 'total': str(len(rows)),
+                           'RaceTable': {'season': str(year), 'Races': races}}}
+        return 200, validators, body
+
+    def requests_for(self, year):
+        return [request for request in self.requests if request['year'] == year]
+
+@pytest.fixture
+def ergast():
+    api = StandInErgast({
+        2001: [make_race(2001, 1, 4), make_race(2001, 2, 3)],
+        2002: [make_race(2002, 1, 3)],
+        2003: [make_race(2003, 1, 2), make_race(2003, 2, 2)],
+    })
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            status, headers, body = api.respond(url.path, parse_qs(url.query), dict(self.headers))
+            payload = json.dumps(body).encode() if body is not None else b""
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    api.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield api
+    server.shutdown()
+    server.server_close()
+
+def test_fetch_season_merges_offset_pages(ergast, tmp_path):
+    races, changed = fetch_season(make_session(), 2001, str(tmp_path), page_size=3, base_url=ergast.base_url)
+
+    assert changed
+    # 7 result rows in pages of 3; round 1 is split across the first two pages
+    assert [request['offset'] for request in ergast.requests_for(2001)] == [0, 3, 6]
+    assert [race['round'] for race in races] == ['1', '2']
+    assert [len(race['Results']) for race in races] == [4, 3]
+    assert [result['position'] for result in races[0]['Results']] == ['1', '2', '3', '4']
+
+    cached = load_season_cache(str(tmp_path), 2001)
+    assert cached['complete'] and cached['total'] == 7
+    assert cached['etag'] == ergast.etag(2001)
+    assert cached['last_modified'] == ergast.last_modified(2001)
+    assert cached['races'] == races
+
+def test_fetch_season_revalidates_with_304(ergast, tmp_path):
+    session = make_session()
+    first, _ = fetch_season(session, 2001, str(tmp_path), page_size=3, base_url=ergast.base_url)
+    ergast.requests.clear()
+
+    races, changed = fetch_season(session, 2001, str(tmp_path), page_size=3, base_url=ergast.base_url)
+    assert not changed and races == first
+    [request] = ergast.requests
+    assert request['headers']['If-None-Match'] == ergast.etag(2001)
+    assert request['headers']['If-Modified-Since'] == ergast.last_modified(2001)
+
+    # A corrected season gets a new ETag and is downloaded again
+    ergast.seasons[2001][1]['Results'][0]['status'] = 'Disqualified'
+    ergast.versions[2001] += 1
+    ergast.requests.clear()
+    races, changed = fetch_season(session, 2001, str(tmp_path), page_size=3, base_url=ergast.base_url)
+    assert changed and len(ergast.requests) == 3
+    assert races[1]['Results'][0]['status'] == 'Disqualified'
+    assert load_season_cache(str(tmp_path), 2001)['etag'] == ergast.etag(2001)
+
+def test_server_errors_are_retried(ergast, tmp_path):
+    ergast.failures[2002] = [503]
+
+    races = get_multiple_seasons_results(2002, 2002, str(tmp_path), max_workers=1, base_url=ergast.base_url)
+
+    assert len(ergast.requests_for(2002)) == 2
+    assert [(race['season'], race['round']) for race in races] == [('2002', '1')]
+    assert load_season_cache(str(tmp_path), 2002)['complete']
+
+def test_partial_failure_keeps_fetched_seasons_and_resumes(ergast, tmp_path, monkeypatch):
+    monkeypatch.setattr(fetch_data, 'ERGAST_PAGE_SIZE', 3)
+    ergast.failures[2002] = 404
+
+    with pytest.raises(RuntimeError, match=r"\[2002\]"):
+        get_multiple_seasons_results(2001, 2003, str(tmp_path), max_workers=3, base_url=ergast.base_url)
+    assert sorted(os.listdir(tmp_path)) == ['2001.json', '2003.json']
+
+    # The rerun only downloads the season that failed
+    del ergast.failures[2002]
+    ergast.requests.clear()
+    races = get_multiple_seasons_results(2001, 2003, str(tmp_path), max_workers=3, base_url=ergast.base_url)
+    assert {request['year'] for request in ergast.requests} == {2002}
+    assert sorted(os.listdir(tmp_path)) == ['2001.json', '2002.json', '2003.json']
+
+    df = races_to_dataframe(races, 42)
+    assert len(df) == 4 + 3 + 3 + 2 + 2
+    assert list(df.drop_duplicates(['season', 'round'])[['season', 'round']].itertuples(index=False, name=None)) == [
+        ('2001', '1'), ('2001', '2'), ('2002', '1'), ('2003', '1'), ('2003', '2')
+    ]
+    assert df.groupby(['season', 'round']).size().tolist() == [4, 3, 3, 2, 2]
+    assert df.loc[(df['season'] == '2001') & (df['round'] == '1'), 'position'].tolist() == [1, 2, 3, 4]
+    assert df.loc[0, 'driver'] == 'Driver 1' and df.loc[0, 'constructor'] == 'Team 1'
+
+def test_refresh_revalidates_cached_seasons(ergast, tmp_path):
+    get_multiple_seasons_results(2001, 2003, str(tmp_path), max_workers=3, base_url=ergast.base_url)
+    ergast.requests.clear()
+
+    get_multiple_seasons_results(2001, 2003, str(tmp_path), max_workers=3, base_url=ergast.base_url)
+    assert ergast.requests == []
+
+    get_multiple_seasons_results(2001, 2003, str(tmp_path), max_workers=3, refresh=True, base_url=ergast.base_url)
+    assert sorted(request['year'] for request in ergast.requests) == [2001, 2002, 2003]
+    assert all('If-None-Match' in request['headers'] for request in ergast.requests)
+
+def test_ingest_appends_to_csv_and_parquet_dataset(ergast, tmp_path):
+    pytest.importorskip('pyarrow')
+    data_file, manifest, dataset = (str(tmp_path / name) for name in ('results.csv', 'manifest.json', 'results_parquet'))
+    first_race = races_to_dataframe([ergast.seasons[2001][0]], 42)
+    first_race.to_csv(data_file, index=False)
+    storage.write_results(first_race, dataset)
+
+    appended = fetch_data.ingest_new_rounds(data_file, manifest, str(tmp_path / 'cache'), through_season=2003,
+                                            base_url=ergast.base_url, dataset_path=dataset)
+
+    assert appended == 3 + 3 + 2 + 2
+    csv_rounds = pd.read_csv(data_file).groupby(['season', 'round']).size()
+    stored = storage.load_results(dataset, columns=['season', 'round', 'driver'])
+    assert stored.groupby(['season', 'round']).size().tolist() == csv_rounds.tolist() == [4, 3, 3, 2, 2]
+    assert storage.dataset_is_current(dataset, data_file)
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestClassifier, RandomForestRegressor
+from sklearn.preprocessing import LabelEncoder
+
+from encoding import CategoryIndex, build_encoding_index, index_categories
+from incremental import grow_model, races_after, refit_model
+
+FEATURES = ['grid', 'recent_form']
+
+def make_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.random((n, len(FEATURES)))
+
+def fit(model, X, y):
+    return model.fit(pd.DataFrame(X, columns=FEATURES), y)
+
+def test_races_after_marks_rows_of_later_races():
+    keys = pd.DataFrame({'season': [2024, 2024, 2025, 2025], 'round': [24, 24, 1, 2],
+                         'race_name': ['Abu Dhabi', 'Abu Dhabi', 'Bahrain', 'Saudi']})
+
+    assert races_after(keys, [2024, 24, 'Abu Dhabi']).tolist() == [False, False, True, True]
+    assert not races_after(keys, ('2025', '2', 'Saudi')).any()
+    with pytest.raises(LookupError):
+        races_after(keys, [2025, 3, 'Australia'])
+
+def test_grow_forest_adds_trees_per_new_race():
+    X = make_rows(60)
+    model = fit(RandomForestRegressor(n_estimators=5, random_state=0), X, X[:, 0])
+    old_trees = list(model.estimators_)
+
+    added = grow_model(model, make_rows(30, seed=1), np.ones(30), FEATURES, n_new_races=2, trees_per_race=3)
+
+    assert added == "+6 trees (5 → 11)"
+    assert len(model.estimators_) == 11 and model.estimators_[:5] == old_trees
+    assert not model.warm_start
+
+def test_grow_boosting_adds_stages():
+    X = make_rows(60)
+    model = fit(GradientBoostingRegressor(n_estimators=4, random_state=0), X, X[:, 0])
+
+    assert grow_model(model, X, X[:, 0], FEATURES, n_new_races=1, stages_per_race=2) == "+2 stages (4 → 6)"
+    assert model.n_estimators_ == 6
+
+def test_classifier_grows_when_the_window_has_its_classes():
+    X = make_rows(60)
+    y = np.arange(60) % 2
+    model = fit(RandomForestClassifier(n_estimators=5, random_state=0), X, y)
+
+    assert grow_model(model, X[:20], y[:20], FEATURES, n_new_races=1, trees_per_race=2) is not None
+    assert len(model.estimators_) == 7
+
+@pytest.mark.parametrize('window_y', [
+    np.r_[np.zeros(19), 2],     # a class the model never saw, e.g. a first-time podium code
+    np.zeros(20),               # only one of the model's classes
+])
+def test_classifier_with_different_window_classes_is_refit(window_y):
+    X = make_rows(60)
+    y = np.arange(60) % 2
+    model = fit(RandomForestClassifier(n_estimators=5, random_state=0), X, y)
+
+    assert grow_model(model, X[:20], window_y, FEATURES, n_new_races=1) is None
+    assert len(model.estimators_) == 5 and not model.warm_start
+
+    all_y = np.r_[y, window_y]
+    refit = refit_model(model, np.r_[X, X[:20]], all_y, FEATURES)
+    assert refit is not model
+    assert refit.classes_.tolist() == np.unique(all_y).tolist()
+    assert list(refit.feature_names_in_) == FEATURES
+
+def test_category_index_appends_new_values_after_existing_codes():
+    encoder = LabelEncoder().fit(['Ferrari', 'McLaren', 'Williams'])
+    index = build_encoding_index({'constructor': encoder})['constructor']
+
+    assert index.extend(['McLaren', 'Cadillac', 'Audi', 'Audi']) == 2
+    assert index.classes == ('Ferrari', 'McLaren', 'Williams', 'Audi', 'Cadillac')
+    assert index.encode_column(['Williams', 'Audi', 'Cadillac', 'Unknown']).tolist() == [2, 3, 4, 0]
+    # The fitted encoder is untouched and still sorted
+    assert encoder.classes_.tolist() == ['Ferrari', 'McLaren', 'Williams']
+
+    # Saved categories replace the encoder's classes when the bundle is loaded again
+    reloaded = build_encoding_index({'constructor': encoder}, categories=index_categories({'constructor': index}))
+    assert reloaded['constructor'].classes == index.classes
+    assert reloaded['constructor'].encode('Cadillac') == 4
+
+def test_category_index_rejects_unknowns_when_strict():
+    index = CategoryIndex(['Dry', 'Wet'], unknown='error')
+    with pytest.raises(KeyError):
+        index.encode('Snow')
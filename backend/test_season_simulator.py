@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from season_simulator import project_season, simulate_season_shard, title_shares
+
+# Two teams of two drivers; the team standings already include the drivers' points
+STARTING_POINTS = np.array([300.0, 366.0, 120.0, 80.0])
+TEAM_INDEX = np.array([0, 0, 1, 1])
+STARTING_TEAM_POINTS = np.array([666.0, 200.0])
+
+def make_rounds(n_rounds, seed=0):
+    rng = np.random.default_rng(seed)
+    support = np.sort(rng.random((len(STARTING_POINTS), 5)) * 10, axis=1)
+    return [(support, 1.5, 'Dry')] * n_rounds
+
+def projection(n_rounds, **kwargs):
+    kwargs = {'n_seasons': 2000, 'seed': 3, 'workers': 1, **kwargs}
+    return project_season(make_rounds(n_rounds), STARTING_POINTS, TEAM_INDEX, len(STARTING_TEAM_POINTS),
+                          STARTING_TEAM_POINTS, **kwargs)
+
+def test_no_races_left_keeps_the_standings():
+    result = projection(0)
+
+    np.testing.assert_array_equal(result['team_points_sum'] / result['n_seasons'], STARTING_TEAM_POINTS)
+    np.testing.assert_array_equal(result['driver_points_sum'] / result['n_seasons'], STARTING_POINTS)
+    np.testing.assert_array_equal(result['team_titles'], [result['n_seasons'], 0])
+
+def test_team_totals_add_only_points_scored_in_the_simulation():
+    result = projection(3)
+
+    driver_gain = result['driver_points_sum'] / result['n_seasons'] - STARTING_POINTS
+    team_gain = result['team_points_sum'] / result['n_seasons'] - STARTING_TEAM_POINTS
+    np.testing.assert_allclose(team_gain, [driver_gain[:2].sum(), driver_gain[2:].sum()])
+    # Three races can't earn more than 3 * (25 + 18) points per team
+    assert (team_gain <= 3 * 43).all()
+
+def test_shard_team_totals_match_driver_totals():
+    rounds = [(support, spread, weather, np.zeros(len(STARTING_POINTS))) for support, spread, weather in make_rounds(2)]
+    shard = simulate_season_shard(rounds, STARTING_POINTS, TEAM_INDEX, 2, STARTING_TEAM_POINTS, 500, seed=1, chunk_size=128)
+
+    earned = shard['driver_points_sum'] - 500 * STARTING_POINTS
+    np.testing.assert_allclose(shard['team_points_sum'] - 500 * STARTING_TEAM_POINTS, [earned[:2].sum(), earned[2:].sum()])
+
+def test_title_shares_split_ties():
+    totals = np.array([[10.0, 10.0, 5.0], [3.0, 8.0, 1.0]])
+    np.testing.assert_array_equal(title_shares(totals), [0.5, 1.5, 0.0])
+
+@pytest.mark.parametrize('workers', [2, 3])
+def test_same_seed_gives_identical_results_with_any_worker_count(workers):
+    serial = projection(2, n_seasons=4000, seasons_per_shard=500)
+    pooled = projection(2, n_seasons=4000, seasons_per_shard=500, workers=workers)
+
+    for key, value in serial.items():
+        np.testing.assert_array_equal(pooled[key], value)
@@ -1,183 +1,143 @@
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor, GradientBoostingRegressor
-from sklearn.metrics import accuracy_score, mean_squared_error, classification_report, mean_absolute_error
 from sklearn.preprocessing import LabelEncoder, StandardScaler
 import numpy as np
+import argparse
 import os
-import joblib
-import random
+import time
 from datetime import datetime
+from typing import NamedTuple
+
+from reference_data import TEMPERATURE_RANGES, DRIVER_EXPERIENCE
+from rng import make_rng
+from form import DEFAULT_FORM, RACE_KEYS, FormState, race_codes, rolling_form
+from feature_store import materialize_features
+from feature_schema import FeatureSchema
+from model_bundle import MODEL_NAMES, save_bundle, load_bundle
+from training_jobs import run_training_jobs
+from model_backends import backend_jobs, select_models
+from tuning import TUNED_PARAMS_FILE, load_tuned_params
+from incremental import (TREES_PER_RACE, STAGES_PER_RACE, WINDOW_RACES, MODEL_TARGETS,
+                         grow_model, races_after, refit_model)
+from encoding import build_encoding_index, index_categories
+from inference import build_feature_matrix, scale_feature_matrix
+from storage import RESULTS_CSV, RESULTS_DATASET, CATEGORICAL_COLUMNS, columnar_available, dataset_is_current, load_results
 
 # Create output folder for models
 os.makedirs("models", exist_ok=True)
 os.makedirs("logs", exist_ok=True)
 
-def enhance_weather_features(df):
+DEFAULT_TEMPERATURE_RANGE = (15, 25)
+
+STREET_CIRCUITS = ['Monaco Circuit', 'Marina Bay Street Circuit', 'Baku City Circuit', 'Jeddah Corniche Circuit']
+
+# Simulated tire strategies by condition: wet, mixed, dry street circuit, dry permanent circuit
+TIRE_STRATEGY_OPTIONS = (
+    ("Full Wet → Intermediate → Medium", "Intermediate → Full Wet", "Full Wet → Medium", "Intermediate → Soft"),
+    ("Intermediate → Medium → Soft", "Soft → Intermediate → Hard", "Medium → Intermediate → Soft"),
+    ("Medium → Hard", "Soft → Medium → Hard", "Hard → Medium", "Soft → Hard"),
+    ("Soft → Medium", "Medium → Hard", "Soft → Hard", "Medium → Medium"),
+)
+
+def enhance_weather_features(df, rng=None):
     """Add more sophisticated weather-related features"""
+    rng = make_rng(rng)
     
-    # Temperature ranges based on circuit locations and seasons
-    def get_temperature(circuit, date=None):
-        temp_map = {
-            'Bahrain International Circuit': random.randint(25, 35),
-            'Jeddah Corniche Circuit': random.randint(28, 38),
-            'Albert Park Circuit': random.randint(18, 28),
-            'Suzuka Circuit': random.randint(15, 25),
-            'Shanghai International Circuit': random.randint(12, 22),
-            'Miami International Autodrome': random.randint(26, 35),
-            'Imola': random.randint(16, 26),
-            'Monaco Circuit': random.randint(18, 28),
-            'Circuit de Barcelona-Catalunya': random.randint(16, 26),
-            'Circuit Gilles Villeneuve': random.randint(12, 22),
-            'Red Bull Ring': random.randint(14, 24),
-            'Silverstone Circuit': random.randint(12, 22),
-            'Hungaroring': random.randint(18, 30),
-            'Circuit de Spa-Francorchamps': random.randint(10, 20),
-            'Circuit Zandvoort': random.randint(12, 22),
-            'Monza Circuit': random.randint(16, 26),
-            'Marina Bay Street Circuit': random.randint(26, 32),
-            'Baku City Circuit': random.randint(20, 30),
-            'Circuit of the Americas': random.randint(18, 28),
-            'Autódromo Hermanos Rodríguez': random.randint(16, 24),
-            'Interlagos': random.randint(18, 28),
-            'Las Vegas Strip Circuit': random.randint(10, 25),
-            'Losail International Circuit': random.randint(22, 32),
-            'Yas Marina Circuit': random.randint(24, 32)
-        }
-        return temp_map.get(circuit, random.randint(15, 25))
+    # Temperature ranges based on circuit locations, as per-circuit bounds sampled in one draw
+    circuit_codes, circuits = pd.factorize(df['circuit'])
+    bounds = np.array([TEMPERATURE_RANGES.get(circuit, DEFAULT_TEMPERATURE_RANGE) for circuit in circuits],
+                      dtype=np.int64).reshape(-1, 2)
+    low, high = bounds[circuit_codes, 0], bounds[circuit_codes, 1]
     
     # Add enhanced weather features
-    df['temperature'] = df['circuit'].apply(get_temperature)
+    df['temperature'] = rng.integers(low, high + 1)
     df['humidity'] = np.where(df['weather'] == 'Wet', 
-                              np.random.uniform(80, 95, len(df)),
+                              rng.uniform(80, 95, len(df)),
                               np.where(df['weather'] == 'Mixed',
-                                      np.random.uniform(60, 85, len(df)),
-                                      np.random.uniform(30, 70, len(df))))
+                                      rng.uniform(60, 85, len(df)),
+                                      rng.uniform(30, 70, len(df))))
     
     df['wind_speed'] = np.where(df['weather'] == 'Wet',
-                               np.random.uniform(10, 20, len(df)),
+                               rng.uniform(10, 20, len(df)),
                                np.where(df['weather'] == 'Mixed',
-                                       np.random.uniform(5, 15, len(df)),
-                                       np.random.uniform(0, 10, len(df))))
+                                       rng.uniform(5, 15, len(df)),
+                                       rng.uniform(0, 10, len(df))))
     
-    df['track_temp'] = df['temperature'] + np.random.uniform(5, 25, len(df))
+    df['track_temp'] = df['temperature'] + rng.uniform(5, 25, len(df))
     
     return df
 
-def enhance_tire_strategy(df):
+def enhance_tire_strategy(df, rng=None):
     """Generate realistic tire strategies"""
-    
-    def get_strategy(weather, circuit):
-        street_circuits = ['Monaco Circuit', 'Marina Bay Street Circuit', 'Baku City Circuit', 'Jeddah Corniche Circuit']
-        
-        if weather == "Wet":
-            return random.choice([
-                "Full Wet → Intermediate → Medium",
-                "Intermediate → Full Wet",
-                "Full Wet → Medium",
-                "Intermediate → Soft"
-            ])
-        elif weather == "Mixed":
-            return random.choice([
-                "Intermediate → Medium → Soft",
-                "Soft → Intermediate → Hard",
-                "Medium → Intermediate → Soft"
-            ])
-        else:  # Dry conditions
-            if circuit in street_circuits:
-                return random.choice([
-                    "Medium → Hard",
-                    "Soft → Medium → Hard",
-                    "Hard → Medium",
-                    "Soft → Hard"
-                ])
-            else:
-                return random.choice([
-                    "Soft → Medium",
-                    "Medium → Hard",
-                    "Soft → Hard",
-                    "Medium → Medium"
-                ])
+    rng = make_rng(rng)
     
     # Only add tire strategy if it doesn't exist
     if 'tire_strategy' not in df.columns:
-        df['tire_strategy'] = df.apply(lambda row: get_strategy(row['weather'], row['circuit']), axis=1)
+        # Each row picks uniformly from its condition's option list; the lists are laid out
+        # end to end so the choice is a single integer code into all the strategies
+        strategies = np.array([strategy for options in TIRE_STRATEGY_OPTIONS for strategy in options], dtype=object)
+        sizes = np.array([len(options) for options in TIRE_STRATEGY_OPTIONS])
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        
+        street = df['circuit'].isin(STREET_CIRCUITS).to_numpy()
+        condition = np.select(
+            [df['weather'].to_numpy() == 'Wet', df['weather'].to_numpy() == 'Mixed', street],
+            [0, 1, 2],
+            default=3
+        )
+        codes = offsets[condition] + rng.integers(0, sizes[condition])
+        df['tire_strategy'] = strategies[codes]
     
     return df
 
-def add_driver_performance_features(df):
+# Columns the point-in-time experience and form features are computed from
+HISTORY_COLUMNS = ['season', 'round', 'race_name', 'date', 'driver', 'constructor', 'position']
+
+def history_features(df, history=None):
+    """Driver experience and driver/constructor form of every row, from earlier races only
+    
+    history holds results before df (the rows a bundle was trained on); only
+    the earlier rows of df's drivers and constructors are read from it.
+    """
+    context = df[HISTORY_COLUMNS]
+    if history is not None:
+        earlier = history[history['driver'].isin(df['driver']) | history['constructor'].isin(df['constructor'])]
+        context = pd.concat([earlier[HISTORY_COLUMNS], context], ignore_index=True)
+    
+    # Experience as of each row: seasons driven up to and including that one, so earlier
+    # races never see how long the career went on to last
+    seasons = pd.to_numeric(context['season'], errors='coerce')
+    seasons_so_far = seasons.groupby(context['driver']).rank(method='dense')
+    
+    # Drivers the 2025 mapping credits with seasons the dataset is missing are shifted up to match it
+    seasons_driven = seasons.groupby(context['driver']).nunique()
+    known = pd.Series(dict(DRIVER_EXPERIENCE)).reindex(seasons_driven.index)
+    shift = (known - seasons_driven).clip(lower=0).fillna(0)
+    
+    features = pd.DataFrame({
+        'driver_experience': (seasons_so_far + context['driver'].map(shift)).clip(lower=1),
+        # Recent form: average position over the previous races only, so the target never leaks in
+        'recent_form': rolling_form(context, 'driver').fillna(DEFAULT_FORM),
+        'constructor_form': rolling_form(context, 'constructor').fillna(DEFAULT_FORM),
+    })
+    # df's rows come last in the context
+    return features.iloc[len(context) - len(df):].set_axis(df.index)
+
+def add_driver_performance_features(df, rng=None, history=None):
     """Add realistic driver performance metrics with 2025 updates"""
+    rng = make_rng(rng)
     
-    # Updated driver experience mapping including 2025 season
-    driver_experience = {
-        # Veterans
-        'Lewis Hamilton': 19,           # 2007–2025
-        'Fernando Alonso': 21,          # 2001–2018, 2021–2025 (break: 2019–2020)
-        'Nico Hülkenberg': 13,          # 2010–2019, 2023–2025 (break: 2020–2022)
-        'Nico Hulkenberg': 13,          # Alternative spelling
-        
-        # Current stars
-        'Max Verstappen': 11,           # 2015–2025
-        'Charles Leclerc': 7,           # 2018–2025
-        'Lando Norris': 7,              # 2019–2025
-        'George Russell': 6,            # 2019–2025
-        'Pierre Gasly': 8,              # 2017–2025
-        'Esteban Ocon': 8,              # 2016, 2017–2018, 2020–2025 (missed 2019)
-        'Lance Stroll': 8,              # 2017–2025
-        'Yuki Tsunoda': 5,              # 2021–2025
-        'Alex Albon': 5,                # 2019–2020, 2022–2025 (missed 2021)
-        'Alexander Albon': 5,           # Alternative name
-        'Carlos Sainz': 11,             # 2015–2025
-        'Oscar Piastri': 3,             # 2023–2025
-        
-        # 2025 rookies and newer drivers
-        'Kimi Antonelli': 1,            # Debuted 2025
-        'Oliver Bearman': 1,            # Partial 2024 debut, full season 2025
-        'Jack Doohan': 1,               # Debuted 2025
-        'Franco Colapinto': 1,          # Partial 2024, full 2025
-        'Gabriel Bortoleto': 1,         # Debuted 2025
-        'Isack Hadjar': 1,              # Debuted 2025
-        'Liam Lawson': 2,               # Partial 2023, full 2025 (missed 2024)
-        
-        # Historical drivers - add some common ones
-        'Sebastian Vettel': 15,
-        'Daniel Ricciardo': 13,
-        'Valtteri Bottas': 11,
-        'Sergio Pérez': 14,
-        'Sergio Perez': 14,
-    }
-    
-    # Add experience for drivers not in the mapping
-    for driver in df['driver'].unique():
-        if driver not in driver_experience:
-            # Estimate based on first appearance in dataset
-            driver_seasons = df[df['driver'] == driver]['season'].unique()
-            estimated_experience = len(driver_seasons)
-            driver_experience[driver] = max(1, estimated_experience)
-    
-    df['driver_experience'] = df['driver'].map(driver_experience)
-    
-    # Calculate recent form (average position in last few races)
-    def calculate_recent_form(group):
-        # Sort by date and take last 5 races
-        recent_races = group.sort_values('date').tail(5)
-        avg_position = recent_races['position'].mean()
-        return avg_position
-    
-    # Group by driver and calculate recent form
-    recent_form = df.groupby('driver').apply(calculate_recent_form)
-    df['recent_form'] = df['driver'].map(recent_form)
-    
-    # Fill any missing values
-    df['recent_form'] = df['recent_form'].fillna(15.0)
+    features = history_features(df, history)
+    for col in features.columns:
+        df[col] = features[col]
     
     # Qualifying gap to teammate (simulated but realistic)
-    df['quali_gap_to_teammate'] = np.random.uniform(-1.5, 1.5, len(df))
+    df['quali_gap_to_teammate'] = rng.uniform(-1.5, 1.5, len(df))
     
     return df
 
-def add_constructor_features(df):
+def add_constructor_features(df, rng=None):
     """Add constructor performance features with 2025 updates"""
+    rng = make_rng(rng)
     
     # Updated constructor standings based on 2025 season performance
     constructor_standings = {
@@ -207,13 +167,14 @@ def add_constructor_features(df):
     # Fix the fillna issue - generate individual random values for missing entries
     missing_mask = df['budget_efficiency'].isna()
     if missing_mask.any():
-        random_values = np.random.uniform(0.7, 1.0, missing_mask.sum())
+        random_values = rng.uniform(0.7, 1.0, missing_mask.sum())
         df.loc[missing_mask, 'budget_efficiency'] = random_values
     
     return df
 
-def add_circuit_features(df):
+def add_circuit_features(df, rng=None):
     """Add circuit characteristics"""
+    rng = make_rng(rng)
     
     circuit_types = {
         'Monaco Circuit': 'Street',
@@ -254,26 +215,44 @@ def add_circuit_features(df):
     df['lap_length'] = df['circuit'].map(lap_length_map)
     missing_lap_length = df['lap_length'].isna()
     if missing_lap_length.any():
-        random_lap_values = np.random.uniform(3.0, 7.0, missing_lap_length.sum())
+        random_lap_values = rng.uniform(3.0, 7.0, missing_lap_length.sum())
         df.loc[missing_lap_length, 'lap_length'] = random_lap_values
     
-    df['safety_car_laps'] = np.random.poisson(3, len(df))
-    df['avg_pit_time'] = np.random.uniform(2.0, 4.5, len(df))
+    df['safety_car_laps'] = rng.poisson(3, len(df))
+    df['avg_pit_time'] = rng.uniform(2.0, 4.5, len(df))
     
     return df
 
-def load_and_enhance_data():
-    """Load and enhance F1 data"""
+TRAINING_COLUMNS = ['season', 'round', 'race_name', 'circuit', 'date', 'driver', 'constructor',
+                    'grid', 'position', 'points', 'weather', 'tire_strategy']
+
+def load_results_data(rng=None, min_season=None):
+    """Load, clean and sort the race results, optionally from min_season on"""
+    rng = make_rng(rng)
     
-    # Try to load existing data
-    data_files = ["data/f1_multi_year_results.csv", "data/f1_2023_results.csv"]
+    # Prefer the columnar dataset (see storage.py), reading only the columns training uses
     df = None
+    if columnar_available(RESULTS_DATASET) and not dataset_is_current(RESULTS_DATASET, RESULTS_CSV):
+        print(f"⚠️ {RESULTS_CSV} is newer than {RESULTS_DATASET}, loading the CSV instead (python storage.py convert to refresh)")
+    elif columnar_available(RESULTS_DATASET):
+        print(f"📊 Loading data from {RESULTS_DATASET}")
+        df = load_results(RESULTS_DATASET, columns=TRAINING_COLUMNS, min_season=min_season)
+        # Feature engineering maps and fills these columns with values outside their categories
+        for col in CATEGORICAL_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype(object)
+    
+    # Fall back to the CSV files
+    data_files = ["data/f1_multi_year_results.csv", "data/f1_2023_results.csv"]
     
     for file in data_files:
+        if df is not None:
+            break
         if os.path.exists(file):
             print(f"📊 Loading data from {file}")
             df = pd.read_csv(file)
-            break
+            if min_season is not None:
+                df = df[pd.to_numeric(df['season'], errors='coerce') >= min_season]
     
     if df is None:
         print("❌ No data file found. Please ensure f1_multi_year_results.csv exists in the data folder")
@@ -308,7 +287,7 @@ def load_and_enhance_data():
         for circuit in wet_circuits:
             circuit_mask = df['circuit'] == circuit
             if circuit_mask.sum() > 0:
-                df.loc[circuit_mask, 'weather'] = np.random.choice(['Wet', 'Mixed', 'Dry'], 
+                df.loc[circuit_mask, 'weather'] = rng.choice(['Wet', 'Mixed', 'Dry'], 
                                                                    size=circuit_mask.sum(),
                                                                    p=[0.3, 0.3, 0.4])
     
@@ -317,162 +296,202 @@ def load_and_enhance_data():
     df = df.dropna(subset=['date'])  # Remove rows with invalid dates
     df = df.sort_values(['date', 'round', 'position']).reset_index(drop=True)
     
-    # Add enhanced features
+    return df
+
+def enhance_results(df, rng=None, history=None):
+    """Add the enhanced features to loaded results
+    
+    history holds already enhanced results from before df, so only df's rows
+    are feature-engineered (see update_enhanced_models).
+    """
+    rng = make_rng(rng)
+    
     print("🔧 Adding enhanced features...")
-    df = enhance_weather_features(df)
-    df = enhance_tire_strategy(df)
-    df = add_driver_performance_features(df)
-    df = add_constructor_features(df)
-    df = add_circuit_features(df)
+    df = enhance_weather_features(df, rng)
+    df = enhance_tire_strategy(df, rng)
+    df = add_driver_performance_features(df, rng, history)
+    df = add_constructor_features(df, rng)
+    df = add_circuit_features(df, rng)
     
     print(f"✅ Enhanced dataset with {len(df.columns)} features")
     print(f"📊 Final dataset: {len(df)} race results")
     
     return df
 
-def train_enhanced_models():
-    """Train enhanced ML models with 2025 data"""
+def load_and_enhance_data(rng=None):
+    """Load and enhance F1 data"""
+    rng = make_rng(rng)
     
-    print("🚀 Starting Enhanced F1 ML Training (Including 2025 Season)...")
-    print("=" * 70)
+    df = load_results_data(rng)
+    if df is None:
+        return None
     
-    # Load and prepare data
-    df = load_and_enhance_data()
+    return enhance_results(df, rng)
+
+class TrainingData(NamedTuple):
+    """The enhanced results and the scaled feature matrix every model is fit on"""
+    df: pd.DataFrame
+    schema: FeatureSchema
+    label_encoders: dict
+    scaler: StandardScaler
+    X: np.ndarray
+    targets: dict
+    encoding_index: dict = None
+
+def prepare_training_data(rng=None):
+    """Load and enhance the results, encode and scale the features and build the targets"""
+    df = load_and_enhance_data(rng)
     if df is None:
         return None
     
+    return build_training_data(df)
+
+def build_training_data(df, encoding_index=None, scaler=None):
+    """Encode and scale the features of enhanced results and build the targets
+
+    With an existing bundle's encoding index and scaler nothing is refit: the
+    category indexes only gain codes for unseen values (appended, see
+    encoding.CategoryIndex) and the scaler is unchanged, so the saved models
+    still read the matrix the same way.
+    """
     # Create target variables
     df['podium'] = (df['position'] <= 3).astype(int)
     df['points_scored'] = (df['position'] <= 10).astype(int)
     df['winner'] = (df['position'] == 1).astype(int)
     
+    # The feature schema fixes the model inputs and their order for training and serving
+    schema = FeatureSchema()
+    
     # Encode categorical variables
     label_encoders = {}
-    categorical_cols = ['driver', 'constructor', 'circuit', 'weather', 'tire_strategy', 'circuit_type']
     
     print("🔄 Encoding categorical variables...")
-    for col in categorical_cols:
-        le = LabelEncoder()
-        df[col + '_encoded'] = le.fit_transform(df[col].astype(str))
-        label_encoders[col] = le
-        print(f"   • {col}: {len(le.classes_)} unique values")
-    
-    # Define feature set
-    enhanced_features = [
-        'grid', 'constructor_encoded', 'circuit_encoded', 'driver_encoded', 
-        'weather_encoded', 'tire_strategy_encoded', 'temperature', 'humidity',
-        'wind_speed', 'track_temp', 'driver_experience', 'recent_form',
-        'quali_gap_to_teammate', 'constructor_standing', 'budget_efficiency',
-        'circuit_type_encoded', 'drs_zones', 'lap_length', 'safety_car_laps',
-        'avg_pit_time'
-    ]
-    
-    X = df[enhanced_features]
+    for col in schema.categorical_columns:
+        values = df[col].astype(str)
+        if encoding_index is not None:
+            added = encoding_index[col].extend(values)
+            df[col + '_encoded'] = encoding_index[col].encode_column(values)
+            print(f"   • {col}: {len(encoding_index[col])} unique values ({added} new)")
+        else:
+            le = LabelEncoder()
+            df[col + '_encoded'] = le.fit_transform(values)
+            label_encoders[col] = le
+            print(f"   • {col}: {len(le.classes_)} unique values")
     
-    # Scale numerical features
-    numerical_features = [
-        'temperature', 'humidity', 'wind_speed', 'track_temp', 
-        'driver_experience', 'recent_form', 'quali_gap_to_teammate',
-        'budget_efficiency', 'lap_length', 'avg_pit_time'
-    ]
+    X = schema.frame(df)
     
-    scaler = StandardScaler()
+    # Scale numerical features
     X_scaled = X.copy()
-    X_scaled[numerical_features] = scaler.fit_transform(X[numerical_features])
-    
-    models = {}
-    
-    print("\n🎯 Training Models...")
-    
-    # 1. Position Prediction (Regression)
-    print("   📍 Training Position Prediction Model...")
-    y_pos = df['position']
-    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y_pos, test_size=0.2, random_state=42)
-    
-    # Try both RandomForest and GradientBoosting
-    models_to_try = {
-        'RandomForest': RandomForestRegressor(n_estimators=200, max_depth=15, random_state=42, n_jobs=-1),
-        'GradientBoosting': GradientBoostingRegressor(n_estimators=200, max_depth=8, random_state=42)
+    if scaler is None:
+        scaler = StandardScaler()
+        X_scaled[list(schema.scaled)] = scaler.fit_transform(X[list(schema.scaled)])
+    else:
+        X_scaled[list(schema.scaled)] = scaler.transform(X[list(schema.scaled)])
+    
+    # Every target is fit on the same scaled matrix and the same train/test split
+    targets = {
+        'position': df['position'].to_numpy(),
+        'podium': df['podium'].to_numpy(),
+        'points_scored': df['points_scored'].to_numpy(),
+        'winner': df['winner'].to_numpy()
     }
     
-    best_model = None
-    best_score = float('inf')
-    
-    for name, model in models_to_try.items():
-        model.fit(X_train, y_train)
-        y_pred = model.predict(X_test)
-        rmse = np.sqrt(mean_squared_error(y_test, y_pred))
-        mae = mean_absolute_error(y_test, y_pred)
-        print(f"      {name} - RMSE: {rmse:.3f}, MAE: {mae:.3f}")
-        
-        if rmse < best_score:
-            best_score = rmse
-            best_model = model
-    
-    models['position'] = best_model
-    print(f"      ✅ Best Position Model: RMSE {best_score:.3f}")
-    
-    # 2. Podium Prediction
-    print("   🥉 Training Podium Prediction Model...")
-    y_podium = df['podium']
-    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y_podium, test_size=0.2, random_state=42)
-    
-    clf_podium = RandomForestClassifier(n_estimators=200, max_depth=15, random_state=42, n_jobs=-1)
-    clf_podium.fit(X_train, y_train)
-    y_pred = clf_podium.predict(X_test)
-    
-    accuracy = accuracy_score(y_test, y_pred)
-    print(f"      ✅ Podium Accuracy: {accuracy:.3f}")
-    models['podium'] = clf_podium
+    return TrainingData(df, schema, label_encoders, scaler, X_scaled.to_numpy(dtype=np.float64), targets, encoding_index)
+
+def save_training_outputs(df, models, label_encoders, scaler, schema, metadata, categories=None):
+    """Save the bundle, form state and feature store for the races in df"""
+    # Form after the last race in the data, updated race by race by the API; written before the
+    # bundle so a server that picks up the new bundle also finds the form it was trained with
+    form_state = FormState.from_results(df)
+    form_state.save("models/form_state.json")
+    
+    # Per-entity features served by the API instead of recomputing them per request
+    feature_store = materialize_features(df, form_state)
+    
+    # Save models, encoders, scaler and schema together as one versioned bundle;
+    # last_race tells an incremental update which races the models have seen
+    print("\n💾 Saving Models...")
+    schema.validate(models, scaler, label_encoders, list(schema.features))
+    # The enhanced frame goes in the bundle so an incremental update only feature-engineers new races;
+    # the feature store goes in it so a retrain never rewrites tables a running server has mapped
+    bundle_path = save_bundle(models, label_encoders, scaler, schema, categories=categories, training_frame=df,
+                              feature_store=feature_store, metadata={
+        'dataset_size': len(df),
+        'seasons_covered': f"{df['season'].min()}-{df['season'].max()}",
+        'last_race': list(form_state.last_race) if form_state.last_race else None,
+        **metadata
+    })
+    print(f"   ✅ Saved model bundle {os.path.relpath(bundle_path)} ({len(schema)} features, schema {schema.fingerprint})")
+    print(f"   ✅ Saved its feature store ({', '.join(f'{len(names)} {kind}s' for kind, names in feature_store.names.items())})")
+    print("   ✅ Saved models/form_state.json")
+    return bundle_path
+
+def train_enhanced_models(seed=42, workers=None, backend=None):
+    """Train enhanced ML models with 2025 data"""
     
-    # 3. Points Scoring Prediction
-    print("   🏁 Training Points Prediction Model...")
-    y_points = df['points_scored']
-    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y_points, test_size=0.2, random_state=42)
+    # One seeded generator drives every simulated feature so runs are reproducible
+    rng = make_rng(seed)
     
-    clf_points = RandomForestClassifier(n_estimators=200, max_depth=15, random_state=42, n_jobs=-1)
-    clf_points.fit(X_train, y_train)
-    y_pred = clf_points.predict(X_test)
+    print("🚀 Starting Enhanced F1 ML Training (Including 2025 Season)...")
+    print("=" * 70)
     
-    accuracy = accuracy_score(y_test, y_pred)
-    print(f"      ✅ Points Accuracy: {accuracy:.3f}")
-    models['points'] = clf_points
+    # Load and prepare data
+    data = prepare_training_data(rng)
+    if data is None:
+        return None
+    df, schema, label_encoders, scaler = data.df, data.schema, data.label_encoders, data.scaler
+    enhanced_features = list(schema.features)
     
-    # 4. Winner Prediction (if enough data)
+    # The backend picks the estimators (default: $MODEL_BACKEND or 'forest', see model_backends.py),
+    # with position hyperparameters from `python tuning.py --save` when they exist
     winners_df = df[df['winner'] == 1]
-    print(f"   🏆 Training Winner Prediction Model ({len(winners_df)} winners)...")
-    
-    if len(winners_df) > 50:
-        y_winner = df['winner']
-        X_train, X_test, y_train, y_test = train_test_split(X_scaled, y_winner, test_size=0.2, random_state=42)
-        
-        clf_winner = RandomForestClassifier(n_estimators=200, max_depth=15, random_state=42, 
-                                          class_weight='balanced', n_jobs=-1)
-        clf_winner.fit(X_train, y_train)
-        y_pred = clf_winner.predict(X_test)
-        
-        accuracy = accuracy_score(y_test, y_pred)
-        print(f"      ✅ Winner Accuracy: {accuracy:.3f}")
-        models['winner'] = clf_winner
-    else:
-        print("      ⚠️ Insufficient winner data, skipping winner model")
-        models['winner'] = None
-    
-    # Save models
-    print("\n💾 Saving Models...")
-    for name, model in models.items():
-        if model is not None:
-            filename = f"models/{name}_enhanced_model.pkl"
-            joblib.dump(model, filename)
-            print(f"   ✅ Saved {filename}")
+    tuned = load_tuned_params()
+    backend, jobs = backend_jobs(backend, winner=len(winners_df) > 50, tuned=tuned)
+    print(f"\n🎯 Training Models ({backend} backend)...")
+    if tuned:
+        print(f"   🎛️ Tuned position parameters for {', '.join(sorted(tuned))} from {os.path.relpath(TUNED_PARAMS_FILE)}")
+    
+    # Independent fits run concurrently in worker processes sharing one memory-mapped matrix,
+    # at most `workers` at once (default: $TRAINING_WORKERS or one per CPU)
+    workers = workers or int(os.environ.get("TRAINING_WORKERS", 0)) or None
+    results, wall_time = run_training_jobs(jobs, data.X, data.targets, enhanced_features, workers)
+    models = select_models(jobs, results)
+    
+    # 1. Position Prediction (Regression); every position job competes and the best RMSE is kept
+    print("   📍 Position Prediction Model...")
+    position_results = [results[job.name] for job in jobs if (job.slot or job.name) == 'position']
+    for result in position_results:
+        print(f"      {type(result.model).__name__} - RMSE: {result.metrics['rmse']:.3f}, MAE: {result.metrics['mae']:.3f}")
+    best_score = min(result.metrics['rmse'] for result in position_results)
+    position_metrics = next(result.metrics for result in position_results if result.model is models['position'])
+    print(f"      ✅ Best Position Model: RMSE {best_score:.3f}")
     
-    joblib.dump(label_encoders, "models/enhanced_label_encoders.pkl")
-    joblib.dump(scaler, "models/feature_scaler.pkl")
-    joblib.dump(enhanced_features, "models/feature_names.pkl")
+    # 2-4. Podium, points and winner, from their own classifiers or from the position model
+    trained = {job.slot or job.name: results[job.name] for job in jobs}
+    for slot, label, icon in (('podium', 'Podium', '🥉'), ('points', 'Points', '🏁'), ('winner', 'Winner', '🏆')):
+        print(f"   {icon} {label} Prediction Model" + (f" ({len(winners_df)} winners)..." if slot == 'winner' else "..."))
+        if slot in trained:
+            print(f"      ✅ {label} Accuracy: {trained[slot].metrics['accuracy']:.3f}")
+        elif f"{slot}_accuracy" in position_metrics:
+            print(f"      ✅ {label} Accuracy: {position_metrics[f'{slot}_accuracy']:.3f} (from the position model)")
+        elif slot == 'winner':
+            print("      ⚠️ Insufficient winner data, skipping winner model")
+    
+    print("\n⏱️ Fit times:")
+    for result in sorted(results.values(), key=lambda result: result.wall_time, reverse=True):
+        print(f"   • {result.name}: {result.wall_time:.1f}s ({result.n_jobs} core{'s' if result.n_jobs > 1 else ''})")
+    print(f"   Total {wall_time:.1f}s wall for {sum(result.wall_time for result in results.values()):.1f}s of fits")
+    
+    save_training_outputs(df, models, label_encoders, scaler, schema, {
+        'position_rmse': round(float(best_score), 4),
+        'model_backend': backend,
+        'seed': seed,
+        'incremental_updates': 0
+    })
     
     # Feature importance analysis
-    print("\n📊 Feature Importance Analysis:")
-    if models['position']:
+    if getattr(models['position'], 'feature_importances_', None) is not None:
+        print("\n📊 Feature Importance Analysis:")
         feature_importance = pd.DataFrame({
             'feature': enhanced_features,
             'importance': models['position'].feature_importances_
@@ -527,14 +546,123 @@ def train_enhanced_models():
     
     return models, label_encoders, scaler, enhanced_features
 
+def update_enhanced_models(seed=42, trees_per_race=TREES_PER_RACE, stages_per_race=STAGES_PER_RACE, window_races=WINDOW_RACES):
+    """Add the races since the current bundle was trained to its models instead of retraining from scratch
+    
+    Only the new races are loaded and feature-engineered; the rows the models
+    were trained on come from the enhanced frame saved in the bundle, so their
+    simulated features keep the values the trees were fit on. Forests gain
+    trees_per_race trees and boosting models stages_per_race stages per new
+    race, fit on the new races plus the window_races before them, so the cost
+    follows the new data rather than the 75 seasons of history. Models that
+    can't be warm-started are refit. Returns None when there is no bundle to
+    update (or it can't be updated), so the caller can do a full rebuild.
+    """
+    started = time.perf_counter()
+    
+    print("🔄 Incremental F1 ML Training...")
+    print("=" * 70)
+    
+    try:
+        bundle = load_bundle(mmap_mode=None).load_all()
+    except FileNotFoundError as e:
+        print(f"⚠️ No model bundle to update ({e})")
+        return None
+    metadata = bundle.manifest.get('metadata', {})
+    if not metadata.get('last_race'):
+        print(f"⚠️ Bundle {bundle.version} doesn't record its last race")
+        return None
+    if bundle.schema.fingerprint != FeatureSchema().fingerprint:
+        print(f"⚠️ Bundle {bundle.version} was trained with a different feature schema")
+        return None
+    history = bundle.training_frame()
+    if history is None:
+        print(f"⚠️ Bundle {bundle.version} was saved without its training frame")
+        return None
+    last_race = metadata['last_race']
+    print(f"📦 Updating bundle {bundle.version} (last race: {' '.join(str(part) for part in last_race)}, {len(history)} rows)")
+    
+    # Seasons before the last trained race are already in the bundle's frame
+    results = load_results_data(min_season=int(last_race[0]))
+    if results is None:
+        return None
+    try:
+        new_rows = races_after(results[RACE_KEYS], last_race)
+    except LookupError as e:
+        print(f"⚠️ {e}")
+        return None
+    
+    models = {name: bundle.models.get(name) for name in MODEL_NAMES}
+    features = list(bundle.schema.features)
+    if not new_rows.any():
+        print(f"\n✅ Bundle {bundle.version} already includes every race in the dataset")
+        return models, bundle.label_encoders, bundle.scaler, features
+    
+    # Seeded from the last trained race, so the same update always draws the same simulated features
+    rng = make_rng([seed, int(last_race[0]), int(last_race[1])])
+    new_results = enhance_results(results[new_rows].reset_index(drop=True), rng, history)
+    df = pd.concat([history, new_results], ignore_index=True)
+    
+    # The bundle's encoders are kept as they are; new values are appended to a copy of its category indexes
+    label_encoders = bundle.label_encoders
+    encoding_index = build_encoding_index(label_encoders, categories=bundle.categories)
+    data = build_training_data(df, encoding_index, bundle.scaler)
+    df, schema = data.df, data.schema
+    
+    new_rows = np.arange(len(df)) >= len(history)
+    races = race_codes(df)
+    new_races = np.unique(races[new_rows])
+    
+    # How the current models do on races they haven't seen, before they learn from them
+    y_new = data.targets['position'][new_rows]
+    rmse_before = float(np.sqrt(np.mean((models['position'].predict(data.X[new_rows]) - y_new) ** 2)))
+    print(f"\n🆕 {len(new_races)} new race{'s' if len(new_races) > 1 else ''} ({new_rows.sum()} results), "
+          f"position RMSE before update: {rmse_before:.3f}")
+    
+    window = races > new_races.min() - 1 - window_races
+    print(f"\n🎯 Updating Models (new races + {window_races} before them, {window.sum()} rows)...")
+    for name, model in models.items():
+        if model is None:
+            continue
+        fit_started = time.perf_counter()
+        y = data.targets[MODEL_TARGETS[name]]
+        added = grow_model(model, data.X[window], y[window], features, len(new_races), trees_per_race, stages_per_race)
+        if added is None:
+            models[name] = refit_model(model, data.X, y, features)
+            added = f"refit on all {len(y)} rows"
+        print(f"   • {name} ({type(model).__name__}): {added} in {time.perf_counter() - fit_started:.1f}s")
+    
+    save_training_outputs(df, models, label_encoders, bundle.scaler, schema, {
+        **{key: metadata[key] for key in ('model_backend', 'seed') if key in metadata},
+        'position_rmse_before_update': round(rmse_before, 4),
+        'incremental_from': bundle.version,
+        'incremental_updates': metadata.get('incremental_updates', 0) + 1
+    }, categories=index_categories(encoding_index))
+    
+    print(f"\n⏱️ Incremental update finished in {time.perf_counter() - started:.1f}s")
+    print("=" * 70)
+    return models, label_encoders, bundle.scaler, features
+
 if __name__ == "__main__":
-    # Set random seeds for reproducibility
-    np.random.seed(42)
-    random.seed(42)
+    parser = argparse.ArgumentParser(description="Train the enhanced F1 models")
+    parser.add_argument("--incremental", action="store_true",
+                        help="add the races since the current bundle to its models instead of retraining")
+    parser.add_argument("--full", action="store_true", help="force a full rebuild, even with --incremental")
+    parser.add_argument("--trees-per-race", type=int, default=TREES_PER_RACE)
+    parser.add_argument("--stages-per-race", type=int, default=STAGES_PER_RACE)
+    parser.add_argument("--window-races", type=int, default=WINDOW_RACES)
+    args = parser.parse_args()
     
     try:
-        # Run the enhanced training
-        results = train_enhanced_models()
+        # Run the enhanced training, incrementally when asked and possible
+        results = None
+        if args.incremental and not args.full:
+            results = update_enhanced_models(seed=42, trees_per_race=args.trees_per_race,
+                                             stages_per_race=args.stages_per_race, window_races=args.window_races)
+            if results is None:
+                print("↪️ Falling back to a full rebuild\n")
+        if results is None:
+            results = train_enhanced_models(seed=42)
         
         if results:
             models, label_encoders, scaler, features = results
@@ -542,35 +670,32 @@ if __name__ == "__main__":
             # Test prediction functionality
             print("\n🧪 Testing Prediction Functionality...")
             
-            # Create a sample prediction
-            sample_features = [
-                1,  # grid
-                0,  # constructor_encoded
-                0,  # circuit_encoded  
-                0,  # driver_encoded
-                0,  # weather_encoded
-                0,  # tire_strategy_encoded
-                25, # temperature
-                45, # humidity
-                5,  # wind_speed
-                40, # track_temp
-                10, # driver_experience
-                3,  # recent_form
-                -0.2, # quali_gap
-                1,  # constructor_standing
-                0.95, # budget_efficiency
-                0,  # circuit_type_encoded
-                2,  # drs_zones
-                5.5, # lap_length
-                2,  # safety_car_laps
-                3.2  # avg_pit_time
-            ]
+            # Create a sample prediction, assembled and scaled through the saved feature schema
+            bundle = load_bundle()
+            schema = bundle.schema
+            encoding_index = build_encoding_index(bundle.label_encoders, categories=bundle.categories)
+            sample_row = {
+                'grid': 1,
+                'temperature': 25,
+                'humidity': 45,
+                'wind_speed': 5,
+                'track_temp': 40,
+                'driver_experience': 10,
+                'recent_form': 3,
+                'quali_gap_to_teammate': -0.2,
+                'constructor_standing': 1,
+                'budget_efficiency': 0.95,
+                'drs_zones': 2,
+                'lap_length': 5.5,
+                'safety_car_laps': 2,
+                'avg_pit_time': 3.2,
+                'constructor_form': 3
+            }
+            # Categorical inputs take each encoder's first class
+            for col in schema.categorical_columns:
+                sample_row[col] = encoding_index[col].classes[0]
             
-            # Scale the sample
-            sample_array = np.array(sample_features).reshape(1, -1)
-            numerical_indices = [6, 7, 8, 9, 10, 11, 12, 15, 17, 19]
-            sample_scaled = sample_array.copy()
-            sample_scaled[:, numerical_indices] = scaler.transform(sample_array[:, numerical_indices])
+            sample_scaled = scale_feature_matrix(build_feature_matrix([sample_row], schema, encoding_index), schema, scaler)
             
             # Test predictions
             if models['position']:
@@ -0,0 +1,114 @@
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.metrics import accuracy_score, mean_absolute_error, mean_squared_error
+from sklearn.model_selection import train_test_split
+
+TEST_SIZE = 0.2
+SPLIT_SEED = 42
+
+class TrainingJob(NamedTuple):
+    """One model fit: the estimator, the target column it learns and how it is scored"""
+    name: str
+    target: str
+    estimator: Any
+    task: str               # 'regression' or 'classification'
+    multicore: bool = True  # False for estimators that only ever use one core (e.g. GradientBoosting)
+    slot: Optional[str] = None  # bundle model this job competes for, if not its name
+
+class TrainingResult(NamedTuple):
+    name: str
+    model: Any
+    metrics: Dict[str, float]
+    wall_time: float
+    n_jobs: int
+
+def split_indices(n_rows, test_size=TEST_SIZE, random_state=SPLIT_SEED):
+    """Train/test row indices, the same split train_test_split gives any array of n_rows"""
+    return train_test_split(np.arange(n_rows), test_size=test_size, random_state=random_state)
+
+def shared_array(values, folder, name):
+    """Write an array to folder and reopen it read-only memory-mapped
+
+    Memory-mapped arrays are passed to joblib workers by file reference, so
+    the full matrix is not pickled to every worker. Each fit still copies the
+    rows it trains and tests on (see fit_job).
+    """
+    path = os.path.join(folder, f"{name}.npy")
+    np.save(path, np.ascontiguousarray(values))
+    return np.load(path, mmap_mode='r')
+
+def fit_job(job, X, targets, train_idx, test_idx, feature_names, n_jobs):
+    """Fit and score one job; runs in a worker process"""
+    started = time.perf_counter()
+    model = job.estimator
+    params = model.get_params()
+    if 'n_jobs' in params:
+        model.set_params(n_jobs=n_jobs)
+
+    # Fitting on named columns keeps feature_names_in_ for the schema checks at load time.
+    # Indexing copies the train/test rows out of the shared matrix once; the frames wrap
+    # those copies instead of making another (estimators may still convert, e.g. to float32)
+    X_train = pd.DataFrame(X[train_idx], columns=feature_names, copy=False)
+    X_test = pd.DataFrame(X[test_idx], columns=feature_names, copy=False)
+    y = targets[job.target]
+    model.fit(X_train, y[train_idx])
+    y_pred = model.predict(X_test)
+
+    if job.task == 'regression':
+        metrics = {
+            'rmse': float(np.sqrt(mean_squared_error(y[test_idx], y_pred))),
+            'mae': float(mean_absolute_error(y[test_idx], y_pred)),
+        }
+        # Position models that also answer podium/points/winner report those accuracies too
+        if hasattr(model, 'outcome_scores'):
+            metrics.update(model.outcome_scores(X_test, y[test_idx]))
+    else:
+        metrics = {'accuracy': float(accuracy_score(y[test_idx], y_pred))}
+
+    # Saved models keep the n_jobs they were configured with for serving
+    if 'n_jobs' in params:
+        model.set_params(n_jobs=params['n_jobs'])
+    return TrainingResult(job.name, model, metrics, time.perf_counter() - started, n_jobs)
+
+def run_training_jobs(jobs, X, targets, feature_names, workers=None, n_cpus=None):
+    """Fit independent models concurrently from one memory-mapped feature matrix
+
+    The matrix is written to disk once and workers open it by reference rather
+    than each receiving a pickled copy; every fit then copies its own train and
+    test rows. The train/test split is computed once for all jobs. Up to
+    `workers` fits run at once in separate processes and the machine's cores are divided
+    between them; single-core fits are started first so the slowest one
+    isn't left running alone at the end. Returns ({name: TrainingResult}, wall time).
+    """
+    started = time.perf_counter()
+    n_cpus = n_cpus or os.cpu_count() or 1
+    workers = max(1, min(len(jobs), workers or n_cpus))
+    n_jobs = max(1, n_cpus // workers)
+
+    train_idx, test_idx = split_indices(len(X))
+    ordered = sorted(jobs, key=lambda job: job.multicore)
+
+    if workers == 1:
+        # Nothing to overlap, so skip the worker processes and the shared copy
+        arrays = {name: np.asarray(values) for name, values in targets.items()}
+        results = [fit_job(job, np.asarray(X), arrays, train_idx, test_idx, feature_names, n_jobs) for job in ordered]
+    else:
+        folder = tempfile.mkdtemp(prefix="f1-training-")
+        try:
+            X_shared = shared_array(X, folder, 'X')
+            targets_shared = {name: shared_array(values, folder, f"y_{name}") for name, values in targets.items()}
+            results = Parallel(n_jobs=workers, backend='loky', max_nbytes=None)(
+                delayed(fit_job)(job, X_shared, targets_shared, train_idx, test_idx, feature_names, n_jobs)
+                for job in ordered
+            )
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+
+    return {result.name: result for result in results}, time.perf_counter() - started
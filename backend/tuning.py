@@ -0,0 +1,289 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.ensemble import GradientBoostingRegressor, HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.metrics import mean_squared_error
+
+from rng import make_rng
+from training_jobs import shared_array
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TUNING_CACHE_DIR = os.path.join(BASE_DIR, "models", "tuning_cache")
+TUNED_PARAMS_FILE = os.path.join(BASE_DIR, "models", "tuned_params.json")
+
+class SearchSpace(NamedTuple):
+    """An estimator family: its fixed settings, the values to sample and the parameter halving grows"""
+    estimator: Any
+    fixed: Dict[str, Any]
+    choices: Dict[str, List[Any]]
+    resource: str
+    min_resource: int
+    max_resource: int
+
+SEARCH_SPACES = {
+    'rf': SearchSpace(RandomForestRegressor, {'n_jobs': 1}, {
+        'max_depth': [8, 12, 15, 20, None],
+        'min_samples_leaf': [1, 2, 5, 10, 20],
+        'max_features': [0.3, 0.5, 0.7, 1.0],
+    }, 'n_estimators', 25, 400),
+    'gb': SearchSpace(GradientBoostingRegressor, {}, {
+        'max_depth': [3, 5, 8],
+        'learning_rate': [0.03, 0.05, 0.1, 0.2],
+        'subsample': [0.7, 1.0],
+        'min_samples_leaf': [1, 10, 30],
+    }, 'n_estimators', 25, 400),
+    'hist': SearchSpace(HistGradientBoostingRegressor, {'early_stopping': False}, {
+        'learning_rate': [0.03, 0.05, 0.1, 0.2],
+        'max_leaf_nodes': [7, 15, 31, 63],
+        'min_samples_leaf': [10, 20, 50, 100],
+        'l2_regularization': [0.0, 0.1, 1.0],
+    }, 'max_iter', 50, 800),
+}
+
+class Trial(NamedTuple):
+    family: str
+    params: Dict[str, Any]
+    resource: int
+    rmse: float                 # mean over the folds
+    fold_rmse: List[float]
+    fit_time: float             # summed over the folds, including cached ones
+    cached: int                 # folds read from the cache
+
+def season_folds(seasons, n_folds=4, seasons_per_fold=3):
+    """Expanding-window folds that validate on whole seasons
+
+    Each fold trains on every season before its block of `seasons_per_fold`
+    validation seasons, so no fold learns from races after the ones it is
+    scored on. The last block ends with the latest season.
+    """
+    seasons = np.asarray(seasons)
+    unique = np.unique(seasons)
+    if len(unique) < n_folds * seasons_per_fold + 1:
+        raise ValueError(f"Need more than {n_folds * seasons_per_fold} seasons for {n_folds} folds, have {len(unique)}")
+
+    folds = []
+    for k in range(n_folds, 0, -1):
+        block = unique[len(unique) - k * seasons_per_fold:len(unique) - (k - 1) * seasons_per_fold]
+        train_idx = np.flatnonzero(seasons < block[0])
+        val_idx = np.flatnonzero(np.isin(seasons, block))
+        folds.append((train_idx, val_idx))
+    return folds
+
+def data_hash(X, y, folds):
+    """Fingerprint of the matrix, target and folds; cached scores are only reused for identical data"""
+    digest = hashlib.sha1()
+    for array in (np.ascontiguousarray(X), np.ascontiguousarray(y)):
+        digest.update(str(array.shape).encode())
+        digest.update(array.tobytes())
+    for train_idx, val_idx in folds:
+        digest.update(np.asarray(train_idx, dtype=np.int64).tobytes())
+        digest.update(np.asarray(val_idx, dtype=np.int64).tobytes())
+    return digest.hexdigest()[:16]
+
+def sample_candidates(family, n, rng):
+    """Up to n distinct random configurations from a family's choices"""
+    space = SEARCH_SPACES[family]
+    candidates, seen = [], set()
+    for _ in range(n * 20):
+        params = {name: values[int(rng.integers(len(values)))] for name, values in space.choices.items()}
+        key = json.dumps(params, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            candidates.append(params)
+            if len(candidates) == n:
+                break
+    return candidates
+
+class TrialCache:
+    """One JSON file per (data, family, params, resource, fold) score, so re-runs skip finished fits"""
+
+    def __init__(self, folder=TUNING_CACHE_DIR):
+        self.folder = folder
+
+    def key(self, data_key, family, params, resource, fold):
+        payload = json.dumps([data_key, family, params, resource, fold], sort_keys=True)
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def get(self, key):
+        try:
+            with open(os.path.join(self.folder, f"{key}.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key, record):
+        os.makedirs(self.folder, exist_ok=True)
+        tmp_path = os.path.join(self.folder, f".{key}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f)
+        os.replace(tmp_path, os.path.join(self.folder, f"{key}.json"))
+
+def fit_fold(family, params, resource, X, y, train_idx, val_idx, random_state):
+    """Fit one configuration on one fold and score it on the held-out seasons; runs in a worker process"""
+    space = SEARCH_SPACES[family]
+    started = time.perf_counter()
+    model = space.estimator(**space.fixed, **params, **{space.resource: resource}, random_state=random_state)
+    model.fit(X[train_idx], y[train_idx])
+    rmse = float(np.sqrt(mean_squared_error(y[val_idx], model.predict(X[val_idx]))))
+    return {'rmse': rmse, 'fit_time': time.perf_counter() - started}
+
+def successive_halving(X, y, folds, families=('rf', 'hist'), n_candidates=27, eta=3, budget=None,
+                       workers=None, cache=None, seed=42, log=print):
+    """Successive-halving random search over each family's hyperparameters
+
+    Every rung scores the surviving configurations on all folds with `eta`
+    times more trees than the last and keeps the best 1/eta of them. Fits
+    run in parallel worker processes on a shared memory-mapped matrix.
+    Once `budget` seconds have passed no new fits are started and the search
+    stops. More trees can overfit a boosting model, so the best trial of any
+    rung wins. Returns (best Trial per family, every Trial).
+    """
+    started = time.monotonic()
+    deadline = started + budget if budget else None
+    rng = make_rng(seed)
+    cache = cache or TrialCache()
+    workers = max(1, workers or os.cpu_count() or 1)
+    data_key = data_hash(X, y, folds)
+    log(f"🎛️ Tuning on {len(X)} rows, {len(folds)} season folds (data {data_key}), {workers} workers"
+        + (f", {budget:.0f}s budget" if budget else ""))
+
+    folder = tempfile.mkdtemp(prefix="f1-tuning-")
+    best, trials = {}, []
+    try:
+        X_shared, y_shared = shared_array(X, folder, 'X'), shared_array(y, folder, 'y')
+        with Parallel(n_jobs=workers, backend='loky', max_nbytes=None) as parallel:
+            for family in families:
+                space = SEARCH_SPACES[family]
+                candidates = sample_candidates(family, n_candidates, rng)
+                n_rungs = int(math.floor(math.log(space.max_resource / space.min_resource, eta))) + 1
+                for rung in range(n_rungs):
+                    resource = min(space.max_resource, space.min_resource * eta ** rung)
+                    rung_trials = _run_rung(parallel, family, candidates, resource, X_shared, y_shared, folds,
+                                            data_key, cache, workers, deadline, seed)
+                    trials.extend(rung_trials)
+                    if not rung_trials:
+                        break
+                    rung_trials.sort(key=lambda trial: trial.rmse)
+                    if family not in best or rung_trials[0].rmse < best[family].rmse:
+                        best[family] = rung_trials[0]
+                    log(f"   {family:5s} rung {rung}: {len(rung_trials):3d} configs x {space.resource}={resource:<4d} "
+                        f"best RMSE {rung_trials[0].rmse:.3f} "
+                        f"({sum(trial.cached for trial in rung_trials)} of {len(rung_trials) * len(folds)} fits cached, "
+                        f"{time.monotonic() - started:.0f}s)")
+                    if len(rung_trials) < len(candidates):
+                        log(f"   ⏱️ Budget reached during {family} rung {rung}")
+                        break
+                    candidates = [trial.params for trial in rung_trials[:max(1, len(rung_trials) // eta)]]
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    return best, trials
+
+def _run_rung(parallel, family, candidates, resource, X, y, folds, data_key, cache, workers, deadline, seed):
+    """Score candidates on every fold, reading finished folds from the cache; stops starting fits after the deadline"""
+    keys = {(i, k): cache.key(data_key, family, params, resource, k) for i, params in enumerate(candidates) for k in range(len(folds))}
+    records = {task: cache.get(key) for task, key in keys.items()}
+    pending = [task for task, record in records.items() if record is None]
+
+    # Whole waves of `workers` fits, so the deadline is checked between them
+    for start in range(0, len(pending), workers):
+        if deadline is not None and time.monotonic() > deadline:
+            break
+        wave = pending[start:start + workers]
+        results = parallel(
+            delayed(fit_fold)(family, candidates[i], resource, X, y, folds[k][0], folds[k][1], seed)
+            for i, k in wave
+        )
+        for task, record in zip(wave, results):
+            records[task] = record
+            cache.put(keys[task], record)
+
+    trials = []
+    for i, params in enumerate(candidates):
+        fold_records = [records[(i, k)] for k in range(len(folds))]
+        if any(record is None for record in fold_records):
+            continue
+        trials.append(Trial(
+            family=family,
+            params=params,
+            resource=resource,
+            rmse=float(np.mean([record['rmse'] for record in fold_records])),
+            fold_rmse=[record['rmse'] for record in fold_records],
+            fit_time=float(sum(record['fit_time'] for record in fold_records)),
+            cached=sum(1 for k in range(len(folds)) if (i, k) not in pending),
+        ))
+    return trials
+
+def tuned_params(trial):
+    """Estimator parameters for a Trial, including its tree count"""
+    space = SEARCH_SPACES[trial.family]
+    return {**trial.params, space.resource: trial.resource}
+
+def save_tuned_params(best, data_key, path=TUNED_PARAMS_FILE):
+    """Write the best parameters per estimator class for train_enhanced_model.py to pick up"""
+    tuned = {
+        'created_at': datetime.now().isoformat(),
+        'data': data_key,
+        'estimators': {
+            SEARCH_SPACES[family].estimator.__name__: {'params': tuned_params(trial), 'rmse': round(trial.rmse, 4)}
+            for family, trial in best.items()
+        }
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(tuned, f, indent=2)
+    return tuned
+
+def load_tuned_params(path=TUNED_PARAMS_FILE):
+    """{estimator class name: params} saved by `python tuning.py --save`, or None"""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return {name: entry['params'] for name, entry in json.load(f)['estimators'].items()}
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune the position model's hyperparameters on season folds")
+    parser.add_argument("--families", default="rf,hist", help=f"estimator families to search ({','.join(SEARCH_SPACES)})")
+    parser.add_argument("--candidates", type=int, default=27, help="random configurations per family")
+    parser.add_argument("--eta", type=int, default=3, help="keep 1/eta of the configurations per rung")
+    parser.add_argument("--folds", type=int, default=4)
+    parser.add_argument("--seasons-per-fold", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=None, help="wall-clock seconds for the whole search")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save", action="store_true", help=f"write the best parameters to {os.path.relpath(TUNED_PARAMS_FILE)}")
+    args = parser.parse_args()
+
+    from train_enhanced_model import prepare_training_data
+
+    data = prepare_training_data(make_rng(args.seed))
+    if data is None:
+        return
+    y = data.targets['position'].astype(np.float64)
+    folds = season_folds(data.df['season'].to_numpy(), args.folds, args.seasons_per_fold)
+
+    started = time.monotonic()
+    best, trials = successive_halving(data.X, y, folds, args.families.split(","), args.candidates, args.eta,
+                                      args.budget, args.workers, seed=args.seed)
+
+    print(f"\n🏁 Search finished in {time.monotonic() - started:.0f}s ({len(trials)} trials)")
+    for family, trial in sorted(best.items(), key=lambda item: item[1].rmse):
+        folds_text = ", ".join(f"{rmse:.3f}" for rmse in trial.fold_rmse)
+        print(f"   {family:5s} RMSE {trial.rmse:.3f} [{folds_text}] {tuned_params(trial)}")
+
+    if args.save and best:
+        save_tuned_params(best, data_hash(data.X, y, folds))
+        print(f"   ✅ Saved {os.path.relpath(TUNED_PARAMS_FILE)}")
+
+if __name__ == "__main__":
+    main()